@@ -0,0 +1 @@
+# Benchmarks do compilador de circuitos
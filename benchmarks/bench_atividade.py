@@ -0,0 +1,66 @@
+# =======================
+# BENCHMARK: ATIVIDADE DE CHAVEAMENTO
+# =======================
+#
+# Uso: python benchmarks/bench_atividade.py [vetores]
+#
+# Estima a probabilidade de sinal e a atividade de chaveamento de todas as
+# nets de circuitos sintéticos com vetores aleatórios (1 milhão por
+# padrão), em blocos bit-paralelos, e compara com a alternativa de chamar
+# simular_circuito uma vez por vetor (com a entrada redefinida e os valores
+# lidos de volta), medida em 2000 vetores e extrapolada.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_somador, gerar_multiplicador, gerar_dag_aleatorio  # noqa: E402
+from src.atividade import estimar_atividade  # noqa: E402
+from src.falhas import blocos_aleatorios  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import obter_compilado, simular_circuito  # noqa: E402
+
+CASOS = [
+    ("somador_64", lambda: gerar_somador(64, hierarquico=False)),
+    ("multiplicador_8", lambda: gerar_multiplicador(8)),
+    ("dag_2000", lambda: gerar_dag_aleatorio(2000)),
+]
+VETORES_LACO = 2000
+
+
+def laco_simulador(circ, compilado, vetores):
+    """Segundos por vetor do laço ingênuo: simular_circuito e leitura das nets a cada vetor"""
+    rng = random.Random(0)
+    entradas = [circ.entradas[nome] for nome in compilado.nomes_entradas]
+    uns = [0] * compilado.num_nets
+    inicio = time.perf_counter()
+    for _ in range(vetores):
+        circ.reset_simulacao()
+        for entrada in entradas:
+            entrada.valor = rng.getrandbits(1)
+        simular_circuito(verbose=False, circ=circ)
+        for net, valor in enumerate(circ.valores_nets):
+            uns[net] += valor
+    return (time.perf_counter() - inicio) / vetores
+
+
+def main():
+    vetores = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"{'caso':<18} {'portas':>7} {'vetores':>9} {'bit-paralelo':>13} {'vetores/s':>11} "
+          f"{'laço (estimado)':>16} {'speedup':>8}")
+    for nome, gerar in CASOS:
+        circ = analisar(gerar(), verbose=False)
+        compilado = obter_compilado(circ)
+        inicio = time.perf_counter()
+        estimar_atividade(compilado, blocos_aleatorios(compilado, vetores))
+        duracao = time.perf_counter() - inicio
+        laco = laco_simulador(circ, compilado, VETORES_LACO) * vetores
+        print(f"{nome:<18} {len(compilado.nomes_portas):>7} {vetores:>9} {duracao:>12.2f}s "
+              f"{vetores / duracao:>11.0f} {laco:>15.1f}s {laco / duracao:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# =======================
+# BENCHMARK: AVALIADOR GERADO
+# =======================
+#
+# Uso: python benchmarks/bench_codegen.py [portas]
+#
+# Compara, em um DAG aleatório, o simulador interpretado (avaliar_compilado
+# e avaliar_palavras) com o avaliador Python gerado por src/codegen.py, para
+# um vetor por vez e para blocos de 4096 vetores. Mostra também o custo de
+# gerar e compilar o código, com e sem o bytecode no cache.
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import montar_dag_aleatorio  # noqa: E402
+from src import codegen  # noqa: E402
+from src.bitparalelo import avaliar_palavras  # noqa: E402
+from src.compiler import compilar_circuito  # noqa: E402
+from src.simulator import avaliar_compilado  # noqa: E402
+
+
+def cronometrar(funcao, repeticoes):
+    """Tempo médio de uma chamada, em segundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    compilado = compilar_circuito(montar_dag_aleatorio(num_portas))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.environ["COMPILADOR_CIRCUITOS_CACHE"] = pasta
+        inicio = time.perf_counter()
+        codigo = codegen.gerar_codigo(compilado)
+        geracao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        modulo = codegen.carregar_modulo(codigo)
+        compilacao = time.perf_counter() - inicio
+        codegen._AVALIADORES.clear()
+        inicio = time.perf_counter()
+        codegen.carregar_modulo(codigo)
+        do_cache = time.perf_counter() - inicio
+
+    rng = random.Random(0)
+    vetor = [rng.getrandbits(1) for _ in range(compilado.num_entradas)]
+    mascara = (1 << 4096) - 1
+    palavras = [rng.getrandbits(4096) for _ in range(compilado.num_entradas)]
+    avaliar = modulo["avaliar"]
+
+    escalar_interpretado = cronometrar(lambda: avaliar_compilado(compilado, vetor), 10)
+    escalar_gerado = cronometrar(lambda: avaliar(vetor, 1), 10)
+    bloco_interpretado = cronometrar(lambda: avaliar_palavras(compilado, palavras, mascara), 5)
+    bloco_gerado = cronometrar(lambda: avaliar(palavras, mascara), 5)
+
+    print(f"{num_portas} portas: código gerado em {geracao:.2f}s, compilado em {compilacao:.2f}s "
+          f"({do_cache:.2f}s com o bytecode no cache)")
+    print(f"  1 vetor:      interpretado {escalar_interpretado * 1e3:8.2f} ms | "
+          f"gerado {escalar_gerado * 1e3:8.2f} ms ({escalar_interpretado / escalar_gerado:.0f}x)")
+    print(f"  4096 vetores: interpretado {bloco_interpretado * 1e3:8.2f} ms | "
+          f"gerado {bloco_gerado * 1e3:8.2f} ms ({bloco_interpretado / bloco_gerado:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
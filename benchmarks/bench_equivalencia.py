@@ -0,0 +1,50 @@
+# =======================
+# BENCHMARK: EQUIVALÊNCIA COM BDDs
+# =======================
+#
+# Uso: python benchmarks/bench_equivalencia.py
+#
+# Verifica a equivalência entre o somador descrito com módulos e o mesmo
+# somador escrito porta a porta (2 * bits + 1 entradas, impossível de
+# comparar por tabela verdade), e entre o somador e uma cópia com uma porta
+# trocada, que deve produzir um contraexemplo.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_somador  # noqa: E402
+from src.equivalencia import verificar_equivalencia  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+
+
+def compilar(fonte):
+    return obter_compilado(analisar(fonte, verbose=False))
+
+
+def com_defeito(fonte):
+    """Troca a última linha da tabela da porta do meio do circuito (1 1 -> 0 vira 1 1 -> 1)"""
+    posicao = fonte.index("1 1 -> 0", len(fonte) // 2)
+    return fonte[:posicao] + "1 1 -> 1" + fonte[posicao + len("1 1 -> 0"):]
+
+
+def main():
+    print(f"{'bits':>6} {'entradas':>9} | {'equivalentes':>22} | {'com defeito':>22}")
+    for bits in (16, 64, 256, 1024):
+        hierarquico = compilar(gerar_somador(bits, True))
+        plano = gerar_somador(bits, False)
+        colunas = []
+        for outro in (compilar(plano), compilar(com_defeito(plano))):
+            inicio = time.perf_counter()
+            resultado = verificar_equivalencia(hierarquico, outro)
+            duracao = time.perf_counter() - inicio
+            veredito = "sim" if resultado["equivalentes"] else "não"
+            colunas.append(f"{veredito:>3} {resultado['nos']:>9} nós {duracao:>5.2f}s")
+        print(f"{bits:>6} {hierarquico.num_entradas:>9} | {colunas[0]} | {colunas[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# =======================
+# BENCHMARK: SIMULAÇÃO EM LOTE
+# =======================
+#
+# Uso: python benchmarks/bench_estimulos.py [vetores] [portas]
+#
+# Gera um arquivo binário de estímulos aleatórios e mede a vazão do
+# pipeline de leitura -> simulação bit-paralela -> escrita.
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_dag_aleatorio  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import parser  # noqa: E402
+from src.models import circuito  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+from src.estimulos import escrever_vetores, simular_arquivo_estimulos  # noqa: E402
+
+
+def main():
+    num_vetores = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    num_portas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    circuito.limpar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(gerar_dag_aleatorio(num_portas, num_entradas=32), lexer=lexer)
+    compilado = obter_compilado()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as pasta:
+        estimulos = os.path.join(pasta, "estimulos.bin")
+        saidas = os.path.join(pasta, "saidas.bin")
+        vetores = (format(rng.getrandbits(32), "032b") for _ in range(num_vetores))
+        escrever_vetores(estimulos, compilado.nomes_entradas, vetores)
+
+        inicio = time.perf_counter()
+        quantidade = simular_arquivo_estimulos(compilado, estimulos, saidas)
+        duracao = time.perf_counter() - inicio
+
+    print(f"{quantidade} vetores x {num_portas} portas em {duracao:.2f}s "
+          f"({quantidade / duracao:,.0f} vetores/s)")
+
+
+if __name__ == "__main__":
+    main()
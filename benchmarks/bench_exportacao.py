@@ -0,0 +1,64 @@
+# =======================
+# BENCHMARK: EXPORTAÇÃO
+# =======================
+#
+# Uso: python benchmarks/bench_exportacao.py [entradas] [portas]
+#
+# Grava a tabela verdade de um DAG aleatório (por padrão 22 entradas, ou seja,
+# 4 milhões de linhas) nos formatos de linha (.csv, .bin) e no formato
+# compactado por coluna (.tvb), e mede o tempo, o tamanho e o pico de memória
+# do processo. Mede também a leitura aleatória do .tvb via mmap.
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import montar_dag_aleatorio  # noqa: E402
+from src.bitparalelo import vetores_tabela_verdade  # noqa: E402
+from src.compiler import compilar_circuito  # noqa: E402
+from src.estimulos import escrever_vetores  # noqa: E402
+from src.exportadores import escrever_tabela_compactada, TabelaCompactada  # noqa: E402
+
+
+def pico_memoria_mib():
+    """Pico de memória residente do processo até agora (Linux: KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    num_entradas = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    num_portas = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    compilado = compilar_circuito(montar_dag_aleatorio(num_portas, num_entradas=num_entradas))
+    nomes = compilado.nomes_entradas + compilado.nomes_saidas
+    print(f"{num_entradas} entradas ({1 << num_entradas} linhas), {num_portas} portas, "
+          f"{len(compilado.nomes_saidas)} saídas")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for extensao in (".tvb", ".bin", ".csv"):
+            arquivo = os.path.join(pasta, "tabela" + extensao)
+            inicio = time.perf_counter()
+            if extensao == ".tvb":
+                escrever_tabela_compactada(compilado, arquivo)
+            else:
+                escrever_vetores(arquivo, nomes, vetores_tabela_verdade(compilado))
+            duracao = time.perf_counter() - inicio
+            print(f"  {extensao:>5}: {duracao:6.2f}s {os.path.getsize(arquivo) / 2 ** 20:8.1f} MiB "
+                  f"(pico do processo: {pico_memoria_mib():.0f} MiB)")
+
+        rng = random.Random(0)
+        linhas = [rng.randrange(1 << num_entradas) for _ in range(100000)]
+        with TabelaCompactada(os.path.join(pasta, "tabela.tvb")) as tabela:
+            inicio = time.perf_counter()
+            for linha in linhas:
+                tabela.valor(0, linha)
+            duracao = time.perf_counter() - inicio
+        print(f"  leitura do .tvb via mmap: {len(linhas) / duracao:,.0f} consultas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# =======================
+# BENCHMARK: SIMULAÇÃO DE FALHAS
+# =======================
+#
+# Uso: python benchmarks/bench_falhas.py [vetores]
+#
+# Simula todas as falhas stuck-at de circuitos sintéticos com vetores
+# aleatórios (10 mil por padrão) e mostra o tempo, a cobertura e o número
+# de simulações de falha feitas. A simulação ingênua (o circuito inteiro,
+# um vetor e uma falha por vez) custaria falhas x vetores x portas
+# avaliações de porta; a coluna "ingênua" mostra essa conta.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_somador, gerar_multiplicador, gerar_dag_aleatorio  # noqa: E402
+from src.estatisticas import coletar_estatisticas  # noqa: E402
+from src.falhas import simular_falhas, blocos_aleatorios  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+
+CASOS = [
+    ("somador_256", lambda: gerar_somador(256, hierarquico=False)),
+    ("multiplicador_8", lambda: gerar_multiplicador(8)),
+    ("multiplicador_16", lambda: gerar_multiplicador(16)),
+    ("dag_2000", lambda: gerar_dag_aleatorio(2000)),
+]
+
+
+def main():
+    vetores = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"{'caso':<18} {'portas':>7} {'falhas':>7} {'classes':>8} {'cobertura':>10} "
+          f"{'vetores':>8} {'simulações':>11} {'ingênua':>10} {'tempo':>8}")
+    for nome, gerar in CASOS:
+        compilado = obter_compilado(analisar(gerar(), verbose=False))
+        with coletar_estatisticas() as estatisticas:
+            inicio = time.perf_counter()
+            resultado = simular_falhas(compilado, blocos_aleatorios(compilado, vetores))
+            duracao = time.perf_counter() - inicio
+        portas = len(compilado.nomes_portas)
+        ingenua = len(resultado["falhas"]) * vetores * portas
+        print(f"{nome:<18} {portas:>7} {len(resultado['falhas']):>7} {resultado['classes']:>8} "
+              f"{resultado['cobertura']:>10.2%} {resultado['vetores']:>8} "
+              f"{estatisticas.contadores.get('falhas_simuladas', 0):>11} {ingenua:>10.1e} {duracao:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
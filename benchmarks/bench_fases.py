@@ -0,0 +1,181 @@
+# =======================
+# BENCHMARK: FASES DO PIPELINE
+# =======================
+#
+# Uso: python benchmarks/bench_fases.py [resultado.json] [anterior.json]
+#
+# Gera circuitos sintéticos em tamanho realista (somadores ripple-carry,
+# multiplicador em matriz, DAGs aleatórios com fan-in e profundidade
+# controlados e portas largas) e mede separadamente cada fase: análise
+# léxica, análise sintática (que inclui a léxica), validação, compilação,
+# simulação de um vetor, simulação em lote de VETORES_LOTE vetores e
+# relatórios (resumo textual e HTML, em um diretório temporário).
+#
+# Os tempos são o melhor de REPETICOES execuções; numa passada extra, com
+# tracemalloc, é medido o pico de memória alocada em cada fase. O resultado
+# é gravado em JSON (por padrão bench_fases.json); com um JSON anterior, as
+# fases que ficaram mais de TOLERANCIA vezes mais lentas são apontadas e o
+# script termina com código 1.
+
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import (  # noqa: E402
+    gerar_somador, gerar_multiplicador, gerar_dag_aleatorio, gerar_portas_largas)
+from src import __version__  # noqa: E402
+from src.bitparalelo import avaliar_palavras  # noqa: E402
+from src.compiler import compilar_circuito  # noqa: E402
+from src.generators import gerar_resumo_textual, gerar_html_circuito  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import validar_circuito, simular_circuito  # noqa: E402
+
+REPETICOES = 5
+VETORES_LOTE = 4096
+TOLERANCIA = 1.3  # Razão de tempo acima da qual uma fase conta como regressão
+MINIMO_COMPARADO = 0.005  # Fases mais rápidas do que isto (s) variam demais para comparar
+
+CASOS = [
+    ("somador_256", lambda: gerar_somador(256, hierarquico=False)),
+    ("somador_256_hierarquico", lambda: gerar_somador(256)),
+    ("multiplicador_16", lambda: gerar_multiplicador(16)),
+    ("dag_2000", lambda: gerar_dag_aleatorio(2000)),
+    ("dag_2000_fanin4_prof50", lambda: gerar_dag_aleatorio(2000, fan_in=4, profundidade=50)),
+    ("portas_largas_16x10", lambda: gerar_portas_largas(16, 10)),
+]
+
+FASES = ["lexica", "sintatica", "validacao", "compilacao", "simulacao", "lote", "relatorios"]
+
+
+def _pipeline(fonte, pasta):
+    """Retorna (estado, fases): as funções de cada fase, em ordem, e o estado que compartilham"""
+    estado = {}
+
+    def lexica():
+        analisador = lexer.clone()
+        analisador.lineno = 1
+        analisador.verbose = False
+        analisador.input(fonte)
+        estado["tokens"] = sum(1 for _ in analisador)
+
+    def sintatica():
+        estado["circ"] = analisar(fonte, verbose=False)
+
+    def validacao():
+        estado["erros"] = validar_circuito(estado["circ"])
+
+    def compilacao():
+        compilado = compilar_circuito(estado["circ"])
+        compilado.erros = estado["erros"]
+        estado["circ"].compilado = compilado
+
+    def simulacao():
+        simular_circuito(verbose=False, circ=estado["circ"])
+
+    def lote():
+        compilado = estado["circ"].compilado
+        rng = random.Random(0)
+        palavras = [rng.getrandbits(VETORES_LOTE) for _ in compilado.nomes_entradas]
+        avaliar_palavras(compilado, palavras, (1 << VETORES_LOTE) - 1)
+
+    def relatorios():
+        diretorio_original = os.getcwd()
+        os.chdir(pasta)
+        try:
+            gerar_resumo_textual(estado["circ"])
+            gerar_html_circuito(estado["circ"])
+        finally:
+            os.chdir(diretorio_original)
+
+    return estado, [lexica, sintatica, validacao, compilacao, simulacao, lote, relatorios]
+
+
+def medir_caso(fonte):
+    """Tempos (melhor de REPETICOES), pico de memória por fase e tamanho do circuito"""
+    tempos = {fase: float("inf") for fase in FASES}
+    memoria = {}
+    with tempfile.TemporaryDirectory() as pasta, contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPETICOES):
+            estado, fases = _pipeline(fonte, pasta)
+            for fase in fases:
+                inicio = time.perf_counter()
+                fase()
+                tempos[fase.__name__] = min(tempos[fase.__name__], time.perf_counter() - inicio)
+
+        tracemalloc.start()
+        for fase in _pipeline(fonte, pasta)[1]:
+            tracemalloc.reset_peak()
+            antes = tracemalloc.get_traced_memory()[0]
+            fase()
+            memoria[fase.__name__] = round((tracemalloc.get_traced_memory()[1] - antes) / 1024)
+        tracemalloc.stop()
+
+    circ = estado["circ"]
+    tamanho = {"bytes_fonte": len(fonte), "tokens": estado["tokens"], "entradas": len(circ.entradas),
+               "portas": len(circ.portas), "saidas": len(circ.saidas), "conexoes": len(circ.conexoes)}
+    return {"tamanho": tamanho, "tempos_s": {fase: round(tempos[fase], 6) for fase in FASES},
+            "pico_memoria_kib": memoria}
+
+
+def comparar(resultado, anterior):
+    """Imprime as fases mais lentas do que no resultado anterior; retorna o número de regressões"""
+    casos_anteriores = {caso["nome"]: caso for caso in anterior["casos"]}
+    regressoes = 0
+    print(f"\nComparação com a versão {anterior['versao']} ({anterior['data']}):")
+    for caso in resultado["casos"]:
+        antes = casos_anteriores.get(caso["nome"])
+        if antes is None:
+            continue
+        for fase in FASES:
+            atual, previo = caso["tempos_s"][fase], antes["tempos_s"].get(fase)
+            if not previo or max(atual, previo) < MINIMO_COMPARADO:
+                continue
+            razao = atual / previo
+            if razao > TOLERANCIA:
+                regressoes += 1
+                print(f"  REGRESSÃO {caso['nome']}/{fase}: {previo:.4f}s -> {atual:.4f}s ({razao:.2f}x)")
+            elif razao < 1 / TOLERANCIA:
+                print(f"  melhora    {caso['nome']}/{fase}: {previo:.4f}s -> {atual:.4f}s ({razao:.2f}x)")
+    if not regressoes:
+        print("  nenhuma regressão")
+    return regressoes
+
+
+def main():
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else "bench_fases.json"
+    arquivo_anterior = sys.argv[2] if len(sys.argv) > 2 else None
+
+    resultado = {"versao": __version__, "python": platform.python_version(),
+                 "plataforma": platform.platform(), "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "repeticoes": REPETICOES, "casos": []}
+    print(f"{'caso':<26} {'portas':>7} " + " ".join(f"{fase:>10}" for fase in FASES) + f" {'pico KiB':>9}")
+    for nome, gerar in CASOS:
+        medicao = medir_caso(gerar())
+        resultado["casos"].append({"nome": nome, **medicao})
+        tempos = " ".join(f"{medicao['tempos_s'][fase]:>9.4f}s" for fase in FASES)
+        pico = max(medicao["pico_memoria_kib"].values())
+        print(f"{nome:<26} {medicao['tamanho']['portas']:>7} {tempos} {pico:>9}")
+
+    with open(arquivo, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em {arquivo}")
+
+    if arquivo_anterior:
+        with open(arquivo_anterior, encoding="utf-8") as f:
+            anterior = json.load(f)
+        if comparar(resultado, anterior):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# =======================
+# BENCHMARK: SUBCIRCUITOS
+# =======================
+#
+# Uso: python benchmarks/bench_hierarquia.py
+#
+# Compara um somador descrito com módulos (Somador1, Somador2, Somador4, ...)
+# com o mesmo somador escrito porta a porta: tamanho do fonte, tempo de
+# análise (incluindo o achatamento das instâncias) e memória de pico.
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_somador  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+
+
+def medir(fonte):
+    """Retorna (segundos, pico de memória em bytes, portas) da análise + compilação"""
+    inicio = time.perf_counter()
+    compilado = obter_compilado(analisar(fonte, verbose=False))
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()  # Segunda passada só para a memória: o rastreamento deixa tudo mais lento
+    obter_compilado(analisar(fonte, verbose=False))
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico, len(compilado.nomes_portas)
+
+
+def main():
+    print(f"{'bits':>6} {'portas':>7} | {'fonte plano':>12} {'análise':>9} {'pico':>9} | "
+          f"{'fonte hier.':>12} {'análise':>9} {'pico':>9}")
+    for bits in (16, 64, 256, 1024):
+        colunas = []
+        for hierarquico in (False, True):
+            fonte = gerar_somador(bits, hierarquico)
+            duracao, pico, portas = medir(fonte)
+            colunas.append(f"{len(fonte) / 1024:>9.0f} KiB {duracao:>8.3f}s {pico / 2 ** 20:>5.1f} MiB")
+        print(f"{bits:>6} {portas:>7} | {colunas[0]} | {colunas[1]}")
+
+
+if __name__ == "__main__":
+    main()
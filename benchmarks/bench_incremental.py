@@ -0,0 +1,57 @@
+# =======================
+# BENCHMARK: RE-SIMULAÇÃO INCREMENTAL
+# =======================
+#
+# Uso: python benchmarks/bench_incremental.py [portas] [alternancias]
+#
+# Alterna uma entrada por vez e compara a simulação completa com
+# definir_entrada, que re-avalia apenas o cone de fan-out afetado.
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_dag_aleatorio  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import parser  # noqa: E402
+from src.models import circuito  # noqa: E402
+from src.simulator import simular_circuito, obter_compilado  # noqa: E402
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+    alternancias = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    circuito.limpar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(gerar_dag_aleatorio(num_portas, num_entradas=64), lexer=lexer)
+    nomes = obter_compilado().nomes_entradas
+    simular_circuito(verbose=False)
+
+    rng = random.Random(5)
+    sequencia = [(rng.choice(nomes), rng.randint(0, 1)) for _ in range(alternancias)]
+
+    inicio = time.perf_counter()
+    for nome, valor in sequencia:
+        circuito.entradas[nome].valor = valor
+        simular_circuito(verbose=False)
+    t_completa = (time.perf_counter() - inicio) / alternancias
+
+    inicio = time.perf_counter()
+    for nome, valor in sequencia:
+        circuito.definir_entrada(nome, valor)
+    t_incremental = (time.perf_counter() - inicio) / alternancias
+
+    print(f"{num_portas} portas, {alternancias} alternâncias de entrada")
+    print(f"  simulação completa: {t_completa * 1000:8.3f} ms/alternância")
+    print(f"  definir_entrada:    {t_incremental * 1000:8.3f} ms/alternância "
+          f"({t_completa / t_incremental:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
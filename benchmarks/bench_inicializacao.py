@@ -0,0 +1,55 @@
+# =======================
+# BENCHMARK: TEMPO DE INICIALIZAÇÃO
+# =======================
+#
+# Uso: python benchmarks/bench_inicializacao.py [repeticoes]
+#
+# Mede o tempo de parede de processos novos de main.py: a ajuda, um circuito
+# pequeno compilado do zero (--no-cache) e o mesmo circuito vindo do cache.
+# Meta: menos de 100 ms para a ajuda e para um circuito pequeno.
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+META_MS = 100
+
+
+def medir(argumentos, repeticoes, cwd, env):
+    """Mediana do tempo de parede (ms) de `python argumentos`"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable] + argumentos, cwd=cwd, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    main_py = os.path.join(RAIZ, "main.py")
+    exemplo = os.path.join(RAIZ, "exemplos", "circuito_and.txt")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        env = dict(os.environ, COMPILADOR_CIRCUITOS_CACHE=os.path.join(pasta, "cache"))
+        casos = [
+            ("python -c pass", ["-c", "pass"]),
+            ("--help", [main_py, "--help"]),
+            ("circuito_and --no-cache", [main_py, exemplo, "--no-open", "--no-cache"]),
+            ("circuito_and (cache)", [main_py, exemplo, "--no-open"]),
+        ]
+        medir(casos[-1][1], 1, pasta, env)  # Preenche o cache
+
+        print(f"Mediana de {repeticoes} execuções (meta: < {META_MS} ms)")
+        for nome, argumentos in casos:
+            ms = medir(argumentos, repeticoes, pasta, env)
+            print(f"  {nome:26s} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# =======================
+# BENCHMARK: MEMÓRIA POR PORTA
+# =======================
+#
+# Uso: python benchmarks/bench_memoria.py [portas]
+#
+# Monta um netlist aleatório (100 mil portas por padrão) e mede com
+# tracemalloc os bytes por porta da estrutura analisada, do netlist
+# compilado e do estado de simulação, com e sem o compartilhamento das
+# tabelas verdade. A segunda simulação reaproveita os buffers da primeira.
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import montar_dag_aleatorio  # noqa: E402
+from src.simulator import obter_compilado, simular_circuito  # noqa: E402
+
+
+def medir(num_portas, internar):
+    """Retorna os bytes por porta de cada fase"""
+    gc.collect()
+    tracemalloc.start()
+    circ = montar_dag_aleatorio(num_portas, internar=internar)
+    estrutura = tracemalloc.get_traced_memory()[0]
+    obter_compilado(circ)
+    compilado = tracemalloc.get_traced_memory()[0]
+    simular_circuito(verbose=False, circ=circ)
+    simulacao = tracemalloc.get_traced_memory()[0]
+    simular_circuito(verbose=False, circ=circ)
+    segunda = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return [estrutura / num_portas, (compilado - estrutura) / num_portas,
+            (simulacao - compilado) / num_portas, (segunda - simulacao) / num_portas]
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f"{num_portas} portas (bytes por porta)")
+    print(f"{'tabelas':>12} {'estrutura':>10} {'compilado':>10} {'simulação':>10} {'2ª simul.':>10} {'total':>8}")
+    for internar in (False, True):
+        bytes_por_porta = medir(num_portas, internar)
+        rotulo = "internadas" if internar else "por porta"
+        colunas = " ".join(f"{b:>10.0f}" for b in bytes_por_porta)
+        print(f"{rotulo:>12} {colunas} {sum(bytes_por_porta[:3]):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# =======================
+# BENCHMARK: MINIMIZAÇÃO LÓGICA
+# =======================
+#
+# Uso: python benchmarks/bench_minimizacao.py
+#
+# Mede o tempo de minimização de tabelas de 4 a 14 entradas: funções
+# aleatórias (o pior caso, com muitos produtos), um comparador A > B e uma
+# porta de paridade. Até LIMITE_EXATO entradas é usado Quine–McCluskey;
+# acima, a expansão heurística.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.minimizacao import minimizar_funcao, LIMITE_EXATO  # noqa: E402
+
+
+def aleatoria(n, rng):
+    return rng.getrandbits(1 << n)
+
+
+def comparador(n, rng):
+    """A > B, com A nas primeiras n/2 variáveis e B nas demais"""
+    meio = n // 2
+    funcao = 0
+    for linha in range(1 << n):
+        if (linha >> (n - meio)) > (linha & ((1 << (n - meio)) - 1)):
+            funcao |= 1 << linha
+    return funcao
+
+
+def paridade(n, rng):
+    return sum(1 << linha for linha in range(1 << n) if bin(linha).count("1") % 2)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'entradas':>8} {'método':>10} | {'aleatória':>18} | {'comparador':>18} | {'paridade':>18}")
+    for n in (4, 6, 8, 10, 12, 14):
+        colunas = []
+        for gerar in (aleatoria, comparador, paridade):
+            funcao = gerar(n, rng)
+            inicio = time.perf_counter()
+            cubos = minimizar_funcao(funcao, n)
+            colunas.append(f"{len(cubos):>6} prod. {time.perf_counter() - inicio:>6.3f}s")
+        metodo = "exato" if n <= LIMITE_EXATO else "heurístico"
+        print(f"{n:>8} {metodo:>10} | {' | '.join(colunas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# =======================
+# BENCHMARK: OTIMIZAÇÃO DO NETLIST
+# =======================
+#
+# Uso: python benchmarks/bench_otimizacao.py [portas] [vetores]
+#
+# Monta um DAG aleatório (por padrão 100 mil portas), mede o tempo da
+# otimização e a vazão da simulação de vetores aleatórios com e sem o
+# netlist otimizado. As portas "mortas" do DAG (que não alcançam as saídas)
+# e as portas que se reduzem a constantes ou buffers são as que somem.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import montar_dag_aleatorio  # noqa: E402
+from src.compiler import compilar_circuito  # noqa: E402
+from src.estimulos import simular_bloco, agrupar_em_blocos, TAMANHO_BLOCO  # noqa: E402
+from src.otimizador import otimizar_compilado, resumo_otimizacao  # noqa: E402
+
+
+def medir_vazao(compilado, vetores):
+    """Retorna os vetores por segundo simulados em blocos e as saídas obtidas"""
+    inicio = time.perf_counter()
+    saidas = []
+    for bloco in agrupar_em_blocos(vetores, TAMANHO_BLOCO):
+        saidas.extend(simular_bloco(compilado, bloco))
+    return len(vetores) / (time.perf_counter() - inicio), saidas
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_vetores = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+
+    compilado = compilar_circuito(montar_dag_aleatorio(num_portas))
+    inicio = time.perf_counter()
+    otimizado, relatorio = otimizar_compilado(compilado)
+    duracao = time.perf_counter() - inicio
+
+    rng = random.Random(0)
+    vetores = ["".join(rng.choice("01") for _ in range(compilado.num_entradas))
+               for _ in range(num_vetores)]
+    original, saidas_original = medir_vazao(compilado, vetores)
+    reduzido, saidas_otimizado = medir_vazao(otimizado, vetores)
+
+    print(resumo_otimizacao(relatorio))
+    print(f"  otimização em {duracao:.2f}s")
+    print(f"  sem otimização: {original:>10.0f} vetores/s")
+    print(f"  otimizado:      {reduzido:>10.0f} vetores/s ({reduzido / original:.2f}x)")
+    if saidas_original != saidas_otimizado:
+        print("  ERRO: as saídas do netlist otimizado diferem do original")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# =======================
+# BENCHMARK: ESCALABILIDADE MULTI-NÚCLEO
+# =======================
+#
+# Uso: python benchmarks/bench_paralelo.py [entradas] [portas]
+#
+# Varredura exaustiva (2^entradas linhas) com 1, 2, 4, ... processos até o
+# número de núcleos da máquina. Cada fatia é independente, então o ganho deve
+# ser próximo de linear enquanto houver núcleos livres.
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_dag_aleatorio  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import parser  # noqa: E402
+from src.models import circuito  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+from src.paralelo import tabela_verdade_paralela  # noqa: E402
+
+
+def main():
+    num_entradas = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    num_portas = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    circuito.limpar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(gerar_dag_aleatorio(num_portas, num_entradas=num_entradas), lexer=lexer)
+    compilado = obter_compilado()
+
+    nucleos = os.cpu_count() or 1
+    jobs = 1
+    referencia = None
+    print(f"Varredura de 2^{num_entradas} linhas, {num_portas} portas, {nucleos} núcleos")
+    print(f"{'jobs':>5} {'tempo (s)':>10} {'speedup':>8}")
+    while True:
+        inicio = time.perf_counter()
+        for _ in tabela_verdade_paralela(compilado, jobs):
+            pass
+        duracao = time.perf_counter() - inicio
+        referencia = referencia or duracao
+        print(f"{jobs:>5} {duracao:>10.2f} {referencia / duracao:>8.2f}")
+        if jobs >= nucleos:
+            break
+        jobs = min(jobs * 2, nucleos)
+
+
+if __name__ == "__main__":
+    main()
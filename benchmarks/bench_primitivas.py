@@ -0,0 +1,63 @@
+# =======================
+# BENCHMARK: PORTAS PRIMITIVAS LARGAS
+# =======================
+#
+# Uso: python benchmarks/bench_primitivas.py [portas]
+#
+# Compara portas largas (AND, OR, XOR, ... de n entradas) escritas com a
+# tabela_verdade completa de 2^n linhas e declaradas como primitivas, sem
+# tabela: tamanho do código fonte, tempo de análise e compilação, memória
+# das tabelas compiladas e tempo de avaliação bit-paralela de 4096 vetores
+# aleatórios. Acima de 12 entradas só a versão primitiva é medida.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_portas_largas  # noqa: E402
+from src.bitparalelo import avaliar_palavras  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+
+LARGURAS = [8, 12, 16, 64, 1024]
+MAX_LARGURA_TABELA = 12
+VETORES = 4096
+
+
+def medir(fonte):
+    """(segundos de análise + compilação, bytes das tabelas, segundos por bloco avaliado)"""
+    inicio = time.perf_counter()
+    compilado = obter_compilado(analisar(fonte, verbose=False))
+    compilacao = time.perf_counter() - inicio
+    memoria = sum(sys.getsizeof(tabela) for tabela in {id(t): t for t in compilado.tabelas}.values())
+
+    rng = random.Random(0)
+    palavras = [rng.getrandbits(VETORES) for _ in range(compilado.num_entradas)]
+    mascara = (1 << VETORES) - 1
+    repeticoes = 20
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        avaliar_palavras(compilado, palavras, mascara)
+    return compilacao, memoria, (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    portas = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{portas} portas por circuito, {VETORES} vetores por bloco")
+    print(f"{'largura':>8} {'forma':<10} {'fonte':>12} {'compilação':>11} {'tabelas':>12} {'avaliação':>11}")
+    for largura in LARGURAS:
+        formas = [("primitiva", True)]
+        if largura <= MAX_LARGURA_TABELA:
+            formas.insert(0, ("tabela", False))
+        for forma, primitivas in formas:
+            fonte = gerar_portas_largas(portas, largura, primitivas=primitivas)
+            compilacao, memoria, avaliacao = medir(fonte)
+            print(f"{largura:>8} {forma:<10} {len(fonte):>10} B {compilacao:>10.3f}s "
+                  f"{memoria:>10} B {avaliacao * 1000:>9.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# =======================
+# BENCHMARK: RELATÓRIO HTML
+# =======================
+#
+# Uso: python benchmarks/bench_relatorio.py [portas] [entradas]
+#
+# Gera o relatório HTML de um circuito grande (por padrão 10 mil portas e
+# 20 entradas, ou seja, tabela verdade de 2^20 linhas em arquivos de blocos)
+# em um diretório temporário e mede o tempo e o tamanho dos arquivos.
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_dag_aleatorio  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import parser  # noqa: E402
+from src.models import circuito  # noqa: E402
+from src.simulator import simular_circuito  # noqa: E402
+from src.generators import gerar_html_circuito  # noqa: E402
+
+
+def tamanho_total(caminho):
+    """Soma o tamanho de um arquivo ou de todos os arquivos de um diretório"""
+    if os.path.isfile(caminho):
+        return os.path.getsize(caminho)
+    return sum(os.path.getsize(os.path.join(caminho, nome)) for nome in os.listdir(caminho))
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_entradas = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    circuito.limpar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(gerar_dag_aleatorio(num_portas, num_entradas=num_entradas), lexer=lexer)
+        simular_circuito(verbose=False)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        diretorio_original = os.getcwd()
+        os.chdir(pasta)
+        try:
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                arquivo = gerar_html_circuito()
+            duracao = time.perf_counter() - inicio
+            html = tamanho_total(arquivo)
+            blocos_tabela = os.path.splitext(arquivo)[0] + "_tabela"
+            blocos = tamanho_total(blocos_tabela) if os.path.isdir(blocos_tabela) else 0
+        finally:
+            os.chdir(diretorio_original)
+
+    print(f"{num_portas} portas, {num_entradas} entradas ({2 ** num_entradas} linhas)")
+    print(f"  relatório gerado em {duracao:.2f}s")
+    print(f"  HTML: {html / 1024:.0f} KiB | blocos da tabela: {blocos / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# =======================
+# BENCHMARK: LATÊNCIA DO SERVIDOR
+# =======================
+#
+# Uso: python benchmarks/bench_servidor.py [requisicoes]
+#
+# Compara o custo de uma simulação pequena feita por um processo novo
+# (python main.py circ.txt --estimulos ...) com o de uma requisição ao
+# servidor (main.py --servidor) já aquecido: a primeira compilação de uma
+# fonte, simulações repetidas enviando a fonte inteira e simulações
+# enviando só a chave do circuito no cache.
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from benchmarks.gerador_circuitos import gerar_somador  # noqa: E402
+from src.servidor import ClienteServidor  # noqa: E402
+
+
+def esperar_socket(caminho, processo, limite=10.0):
+    fim = time.monotonic() + limite
+    while not os.path.exists(caminho):
+        if processo.poll() is not None or time.monotonic() > fim:
+            raise RuntimeError("o servidor não iniciou")
+        time.sleep(0.01)
+
+
+def media_ms(funcao, quantidade):
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        funcao()
+    return (time.perf_counter() - inicio) * 1000 / quantidade
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fonte = gerar_somador(16, hierarquico=False)
+    vetores = ["01" * 16 + "1", "1" * 33, "0" * 33]
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "somador.txt")
+        with open(arquivo, "w", encoding="utf-8") as f:
+            f.write(fonte)
+        with open(os.path.join(pasta, "vetores.csv"), "w", encoding="utf-8") as f:
+            f.write(",".join([f"A{i}" for i in range(16)] + [f"B{i}" for i in range(16)] + ["Cin"]) + "\n")
+            f.writelines(",".join(vetor) + "\n" for vetor in vetores)
+        comando = [sys.executable, os.path.join(RAIZ, "main.py"), arquivo, "--no-cache",
+                   "--estimulos", "vetores.csv", "--saida-vetores", "saidas.csv"]
+        processo_novo = media_ms(lambda: subprocess.run(comando, cwd=pasta, stdout=subprocess.DEVNULL,
+                                                        check=True), 5)
+
+        caminho = os.path.join(pasta, "servidor.sock")
+        servidor = subprocess.Popen([sys.executable, os.path.join(RAIZ, "main.py"), "--servidor", caminho],
+                                    stdout=subprocess.DEVNULL)
+        try:
+            esperar_socket(caminho, servidor)
+            with ClienteServidor(caminho) as cliente:
+                inicio = time.perf_counter()
+                resposta = cliente.requisitar({"operacao": "compilar", "fonte": fonte})
+                primeira = (time.perf_counter() - inicio) * 1000
+                chave = resposta["chave"]
+                com_fonte = media_ms(lambda: cliente.requisitar(
+                    {"operacao": "simular", "fonte": fonte, "vetores": vetores}), quantidade)
+                com_chave = media_ms(lambda: cliente.requisitar(
+                    {"operacao": "simular", "chave": chave, "vetores": vetores}), quantidade)
+                ping = media_ms(lambda: cliente.requisitar({"operacao": "ping"}), quantidade)
+                cliente.requisitar({"operacao": "encerrar"})
+        finally:
+            servidor.wait(10)
+
+    print(f"Somador de 16 bits ({len(fonte)} bytes), {len(vetores)} vetores por simulação")
+    for rotulo, ms in (("processo novo", processo_novo), ("servidor, primeira compilação", primeira),
+                       ("servidor, simular (fonte)", com_fonte), ("servidor, simular (chave)", com_chave),
+                       ("servidor, ping", ping)):
+        print(f"  {rotulo + ':':<31} {ms:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
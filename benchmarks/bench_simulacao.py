@@ -0,0 +1,56 @@
+# =======================
+# BENCHMARK: ESCALABILIDADE DA SIMULAÇÃO
+# =======================
+#
+# Uso: python benchmarks/bench_simulacao.py [vetores]
+#
+# Mede compilação e simulação de DAGs aleatórios de tamanho crescente. Com o
+# netlist compilado, o custo por porta deve permanecer constante (escala linear).
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_dag_aleatorio  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import parser  # noqa: E402
+from src.models import circuito  # noqa: E402
+from src.simulator import simular_circuito, obter_compilado  # noqa: E402
+
+
+def carregar(fonte):
+    """Analisa o fonte sem poluir a saída do benchmark"""
+    circuito.limpar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(fonte, lexer=lexer)
+
+
+def main():
+    vetores = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(1)
+
+    print(f"{'portas':>8} {'compilação (ms)':>16} {'simulação/vetor (ms)':>21} {'µs/porta':>9}")
+    for num_portas in (1000, 2000, 4000, 8000, 16000):
+        carregar(gerar_dag_aleatorio(num_portas))
+
+        inicio = time.perf_counter()
+        obter_compilado()
+        t_compilacao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(vetores):
+            for entrada in circuito.entradas.values():
+                entrada.valor = rng.randint(0, 1)
+            simular_circuito(verbose=False)
+        t_vetor = (time.perf_counter() - inicio) / vetores
+
+        print(f"{num_portas:>8} {t_compilacao * 1000:>16.1f} {t_vetor * 1000:>21.2f} {t_vetor / num_portas * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# =======================
+# BENCHMARK: TABELA VERDADE EXAUSTIVA
+# =======================
+#
+# Uso: python benchmarks/bench_tabela_verdade.py [portas]
+#
+# Compara a re-simulação linha a linha com o motor bit-paralelo, que avalia
+# cada porta uma vez por bloco de até 2^16 linhas.
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_dag_aleatorio  # noqa: E402
+from src.lexer import lexer  # noqa: E402
+from src.parser_rules import parser  # noqa: E402
+from src.models import circuito  # noqa: E402
+from src.simulator import simular_circuito, obter_compilado  # noqa: E402
+from src.bitparalelo import tabela_verdade_exaustiva  # noqa: E402
+
+
+def carregar(fonte):
+    """Analisa o fonte sem poluir a saída do benchmark"""
+    circuito.limpar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(fonte, lexer=lexer)
+    return obter_compilado()
+
+
+def por_linha(compilado):
+    """Tabela verdade simulando uma linha por vez"""
+    n = compilado.num_entradas
+    for i in range(2 ** n):
+        for j, nome in enumerate(compilado.nomes_entradas):
+            circuito.entradas[nome].valor = (i >> (n - 1 - j)) & 1
+        simular_circuito(verbose=False)
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"{'entradas':>8} {'linhas':>10} {'por linha (s)':>14} {'bit-paralelo (s)':>17} {'ns/linha/porta':>15}")
+    for num_entradas in (10, 12, 16, 20, 24):
+        compilado = carregar(gerar_dag_aleatorio(num_portas, num_entradas=num_entradas))
+        linhas = 2 ** num_entradas
+
+        t_linha = "-"
+        if num_entradas <= 12:
+            inicio = time.perf_counter()
+            por_linha(compilado)
+            t_linha = f"{time.perf_counter() - inicio:.2f}"
+
+        inicio = time.perf_counter()
+        for _ in tabela_verdade_exaustiva(compilado):
+            pass
+        t_bits = time.perf_counter() - inicio
+
+        print(f"{num_entradas:>8} {linhas:>10} {t_linha:>14} {t_bits:>17.3f} {t_bits / linhas / num_portas * 1e9:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
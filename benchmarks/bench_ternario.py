@@ -0,0 +1,86 @@
+# =======================
+# BENCHMARK: SIMULAÇÃO COM X (TRÊS VALORES)
+# =======================
+#
+# Uso: python benchmarks/bench_ternario.py [vetores]
+#
+# Compara a simulação dual-rail de ternario.py, um passe por bloco de
+# vetores com k entradas em X, com a resposta exata por enumeração: os 2^k
+# vetores concretos de cada vetor com X, avaliados pelo motor bit-paralelo
+# de dois valores. Mostra o tempo das duas e a fração das saídas que o
+# dual-rail deixa em X quando a resposta exata é definida (o pessimismo da
+# reconvergência).
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import gerar_multiplicador  # noqa: E402
+from src.bitparalelo import avaliar_palavras  # noqa: E402
+from src.parser_rules import analisar  # noqa: E402
+from src.simulator import obter_compilado  # noqa: E402
+from src.ternario import avaliar_palavras_ternario  # noqa: E402
+
+ENTRADAS_X = [4, 8, 12]
+
+
+def exato(compilado, vetor, posicoes_x):
+    """(uns, zeros) de cada saída para um vetor com X, enumerando as 2^k atribuições"""
+    k = len(posicoes_x)
+    quantidade = 1 << k
+    mascara = quantidade - 1
+    palavras = [mascara if bit else 0 for bit in vetor]
+    for j, i in enumerate(posicoes_x):
+        # Atribuição r: a entrada j em X vale o bit j de r
+        palavras[i] = sum(1 << r for r in range(quantidade) if r >> j & 1)
+    valores = avaliar_palavras(compilado, palavras, mascara)
+    return [(int(valores[net] == mascara), int(valores[net] == 0)) for net in compilado.drivers_saidas]
+
+
+def main():
+    vetores = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    compilado = obter_compilado(analisar(gerar_multiplicador(8), verbose=False))
+    n = compilado.num_entradas
+    print(f"multiplicador 8x8 ({len(compilado.nomes_portas)} portas), {vetores} vetores por linha")
+    print(f"{'X':>4} {'dual-rail':>11} {'exato (2^k)':>12} {'X exatas':>9} {'X dual-rail':>12} {'pessimismo':>11}")
+    for k in ENTRADAS_X:
+        rng = random.Random(k)
+        casos = []
+        for _ in range(vetores):
+            vetor = [rng.getrandbits(1) for _ in range(n)]
+            casos.append((vetor, sorted(rng.sample(range(n), k))))
+
+        # Dual-rail: todos os vetores em um bloco só
+        mascara = (1 << vetores) - 1
+        uns = [0] * n
+        zeros = [0] * n
+        for r, (vetor, posicoes_x) in enumerate(casos):
+            for i, bit in enumerate(vetor):
+                if i not in posicoes_x:
+                    if bit:
+                        uns[i] |= 1 << r
+                    else:
+                        zeros[i] |= 1 << r
+        inicio = time.perf_counter()
+        uns, zeros = avaliar_palavras_ternario(compilado, uns, zeros, mascara)
+        dual_rail = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        respostas = [exato(compilado, vetor, posicoes_x) for vetor, posicoes_x in casos]
+        enumeracao = time.perf_counter() - inicio
+
+        total = x_exatas = x_dual = 0
+        for r, resposta in enumerate(respostas):
+            for net, (um, zero) in zip(compilado.drivers_saidas, resposta):
+                total += 1
+                x_exatas += not (um or zero)
+                x_dual += not (uns[net] >> r & 1 or zeros[net] >> r & 1)
+        print(f"{k:>4} {dual_rail * 1000:>9.2f}ms {enumeracao * 1000:>10.2f}ms {x_exatas / total:>9.1%} "
+              f"{x_dual / total:>12.1%} {(x_dual - x_exatas) / total:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
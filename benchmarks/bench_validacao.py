@@ -0,0 +1,49 @@
+# =======================
+# BENCHMARK: VALIDAÇÃO ESTRUTURAL
+# =======================
+#
+# Uso: python benchmarks/bench_validacao.py [portas]
+#
+# Monta um DAG aleatório (50 mil portas de 2 entradas por padrão, ou seja,
+# 100 mil conexões) e mede validar_circuito no circuito correto e com
+# defeitos injetados: um ciclo longo, pinos com dois drivers, pinos fora da
+# faixa e pinos sem driver.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.gerador_circuitos import montar_dag_aleatorio  # noqa: E402
+from src.models import Conexao  # noqa: E402
+from src.validacao import validar_circuito  # noqa: E402
+
+
+def medir(circ):
+    inicio = time.perf_counter()
+    erros = validar_circuito(circ)
+    return time.perf_counter() - inicio, erros
+
+
+def main():
+    num_portas = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    circ = montar_dag_aleatorio(num_portas)
+    print(f"{num_portas} portas, {len(circ.conexoes)} conexões")
+
+    duracao, erros = medir(circ)
+    print(f"  correto:   {duracao * 1000:>8.1f} ms, {len(erros)} erros")
+
+    # Fecha um laço da última porta para a primeira, trocando o driver de g0.entrada0
+    circ.conexoes[0] = Conexao(f"g{num_portas - 1}.saida", "g0.entrada0")
+    circ.conexoes.append(Conexao("E0.saida", "g10.entrada1"))    # Segundo driver
+    circ.conexoes.append(Conexao("E0.saida", "g20.entrada7"))    # Fora da faixa
+    circ.conexoes = [c for c in circ.conexoes if c.destino != "g30.entrada1"]  # Sem driver
+    duracao, erros = medir(circ)
+    print(f"  defeitos:  {duracao * 1000:>8.1f} ms, {len(erros)} erros")
+    for erro in erros:
+        print(f"    - {erro[:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# =======================
+# GERADOR DE CIRCUITOS SINTÉTICOS
+# =======================
+
+import random
+from src.models import CircuitoState, Porta, Entrada, Saida, Conexao
+from src.compiler import internar_tabela
+
+TABELAS = {
+    "AND": ["0 0 -> 0", "0 1 -> 0", "1 0 -> 0", "1 1 -> 1"],
+    "OR": ["0 0 -> 0", "0 1 -> 1", "1 0 -> 1", "1 1 -> 1"],
+    "XOR": ["0 0 -> 0", "0 1 -> 1", "1 0 -> 1", "1 1 -> 0"],
+    "NAND": ["0 0 -> 1", "0 1 -> 1", "1 0 -> 1", "1 1 -> 0"],
+}
+
+
+# Funções das portas largas: recebem os bits de uma linha e retornam a saída
+FUNCOES = {
+    "AND": lambda bits: int(all(bits)),
+    "OR": lambda bits: int(any(bits)),
+    "XOR": lambda bits: sum(bits) % 2,
+    "NAND": lambda bits: int(not all(bits)),
+    "NOR": lambda bits: int(not any(bits)),
+    "XNOR": lambda bits: 1 - sum(bits) % 2,
+    "MAJ": lambda bits: int(2 * sum(bits) > len(bits)),
+}
+
+
+def linhas_tabela(tipo, largura):
+    """Linhas "0 1 ... -> s" da tabela verdade de uma porta de FUNCOES com `largura` entradas"""
+    if largura == 2 and tipo in TABELAS:
+        return TABELAS[tipo]
+    linhas = []
+    for k in range(1 << largura):
+        bits = [(k >> (largura - 1 - i)) & 1 for i in range(largura)]
+        linhas.append(f"{' '.join(map(str, bits))} -> {FUNCOES[tipo](bits)}")
+    return linhas
+
+
+def gerar_dag_aleatorio(num_portas, num_entradas=16, num_saidas=8, semente=0, fan_in=2, profundidade=None):
+    """Gera o código fonte de um DAG aleatório de portas de `fan_in` entradas
+
+    Sem profundidade, cada pino é sorteado entre os 64 sinais mais recentes.
+    Com profundidade, as portas são divididas em tantas camadas: o primeiro
+    pino de cada porta vem da camada anterior (o que fixa a profundidade do
+    circuito) e os demais de qualquer sinal das camadas anteriores.
+    """
+    rng = random.Random(semente)
+    if profundidade is not None:
+        profundidade = max(1, min(profundidade, num_portas))
+        camadas = [[f"E{i}" for i in range(num_entradas)]]
+    linhas = [f"circuito DAG{num_portas} {{"]
+
+    for i in range(num_entradas):
+        linhas.append(f"    entrada E{i} {{\n        valor_inicial {rng.randint(0, 1)}\n    }}")
+
+    origens = [f"E{i}" for i in range(num_entradas)]
+    conexoes = []
+    for g in range(num_portas):
+        tipo = rng.choice(list(TABELAS))
+        linhas.append(_porta(tipo, f"g{g}", largura=fan_in))
+        if profundidade is None:
+            # Sorteia os drivers entre os sinais mais recentes para obter profundidade
+            janela = origens[-64:]
+            drivers = [rng.choice(janela) for _ in range(fan_in)]
+        else:
+            camada = g * profundidade // num_portas + 1
+            if camada == len(camadas):
+                camadas.append([])
+                anteriores = len(origens)
+            drivers = [rng.choice(camadas[camada - 1])]
+            drivers += [origens[rng.randrange(anteriores)] for _ in range(fan_in - 1)]
+            camadas[camada].append(f"g{g}")
+        for pino, driver in enumerate(drivers):
+            conexoes.append(f"    conexao conectar {driver}.saida -> g{g}.entrada{pino}")
+        origens.append(f"g{g}")
+
+    for s in range(num_saidas):
+        linhas.append(f"    saida S{s} {{\n    }}")
+        conexoes.append(f"    conexao conectar {origens[-1 - s]}.saida -> S{s}.entrada")
+
+    linhas.extend(conexoes)
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
+
+
+def _porta(tipo, nome, recuo="    ", largura=2):
+    corpo = "\n".join(f"{recuo}        {linha}" for linha in linhas_tabela(tipo, largura))
+    return (f"{recuo}porta_logica {tipo} {nome} {{\n"
+            f"{recuo}    numero_de_entradas {largura}\n"
+            f"{recuo}    numero_de_saidas 1\n"
+            f"{recuo}    tabela_verdade {{\n{corpo}\n{recuo}    }}\n{recuo}}}")
+
+
+def _portas_somador_completo(prefixo, a, b, cin, recuo="    "):
+    """Portas e conexões de um somador completo; retorna (linhas, soma, vai_um)"""
+    linhas = [_porta("XOR", f"{prefixo}x1", recuo), _porta("AND", f"{prefixo}a1", recuo),
+              _porta("XOR", f"{prefixo}x2", recuo), _porta("AND", f"{prefixo}a2", recuo),
+              _porta("OR", f"{prefixo}o", recuo)]
+    for destino, origens in ((f"{prefixo}x1", (a, b)), (f"{prefixo}a1", (a, b)),
+                             (f"{prefixo}x2", (f"{prefixo}x1.saida", cin)),
+                             (f"{prefixo}a2", (f"{prefixo}x1.saida", cin)),
+                             (f"{prefixo}o", (f"{prefixo}a1.saida", f"{prefixo}a2.saida"))):
+        for pino, origem in enumerate(origens):
+            linhas.append(f"{recuo}conexao conectar {origem} -> {destino}.entrada{pino}")
+    return linhas, f"{prefixo}x2.saida", f"{prefixo}o.saida"
+
+
+def gerar_somador(bits, hierarquico=True):
+    """Gera um somador ripple-carry de `bits` bits (potência de 2 se hierárquico)
+
+    A versão hierárquica define SomadorCompleto uma vez e monta Somador2,
+    Somador4, ... com duas instâncias do nível anterior; a plana repete as
+    portas de cada bit.
+    """
+    linhas = []
+    if hierarquico:
+        linhas.append("modulo Somador1 {")
+        linhas.extend(f"    entrada {nome} {{ }}" for nome in ("A0", "B0", "Cin"))
+        corpo, soma, vai_um = _portas_somador_completo("", "A0.saida", "B0.saida", "Cin.saida")
+        linhas.extend(corpo)
+        linhas.extend(["    saida S0 { }", "    saida Cout { }",
+                       f"    conexao conectar {soma} -> S0.entrada",
+                       f"    conexao conectar {vai_um} -> Cout.entrada", "}"])
+
+        largura = 1
+        while largura < bits:
+            metade, largura = largura, largura * 2
+            linhas.append(f"modulo Somador{largura} {{")
+            linhas.extend(f"    entrada {l}{i} {{ }}" for l in "AB" for i in range(largura))
+            linhas.append("    entrada Cin { }")
+            linhas.extend(f"    saida S{i} {{ }}" for i in range(largura))
+            linhas.append("    saida Cout { }")
+            linhas.append(f"    instancia Somador{metade} baixo")
+            linhas.append(f"    instancia Somador{metade} alto")
+            for i in range(largura):
+                parte, j = ("baixo", i) if i < metade else ("alto", i - metade)
+                linhas.append(f"    conexao conectar A{i}.saida -> {parte}.A{j}")
+                linhas.append(f"    conexao conectar B{i}.saida -> {parte}.B{j}")
+                linhas.append(f"    conexao conectar {parte}.S{j} -> S{i}.entrada")
+            linhas.extend(["    conexao conectar Cin.saida -> baixo.Cin",
+                           "    conexao conectar baixo.Cout -> alto.Cin",
+                           "    conexao conectar alto.Cout -> Cout.entrada", "}"])
+
+    linhas.append(f"circuito Somador{bits}Bits {{")
+    linhas.extend(f"    entrada {l}{i} {{ valor_inicial {(i + (l == 'B')) % 2} }}" for l in "AB" for i in range(bits))
+    linhas.append("    entrada Cin { valor_inicial 0 }")
+    linhas.extend(f"    saida S{i} {{ }}" for i in range(bits))
+    linhas.append("    saida Cout { }")
+
+    if hierarquico:
+        linhas.append(f"    instancia Somador{bits} somador")
+        for i in range(bits):
+            linhas.append(f"    conexao conectar A{i}.saida -> somador.A{i}")
+            linhas.append(f"    conexao conectar B{i}.saida -> somador.B{i}")
+            linhas.append(f"    conexao conectar somador.S{i} -> S{i}.entrada")
+        linhas.extend(["    conexao conectar Cin.saida -> somador.Cin",
+                       "    conexao conectar somador.Cout -> Cout.entrada"])
+    else:
+        vai_um = "Cin.saida"
+        for i in range(bits):
+            corpo, soma, vai_um = _portas_somador_completo(f"b{i}_", f"A{i}.saida", f"B{i}.saida", vai_um)
+            linhas.extend(corpo)
+            linhas.append(f"    conexao conectar {soma} -> S{i}.entrada")
+        linhas.append(f"    conexao conectar {vai_um} -> Cout.entrada")
+
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
+
+
+def _portas_meio_somador(prefixo, a, b, recuo="    "):
+    """Portas e conexões de um meio somador; retorna (linhas, soma, vai_um)"""
+    linhas = [_porta("XOR", f"{prefixo}x", recuo), _porta("AND", f"{prefixo}a", recuo)]
+    for destino in (f"{prefixo}x", f"{prefixo}a"):
+        for pino, origem in enumerate((a, b)):
+            linhas.append(f"{recuo}conexao conectar {origem} -> {destino}.entrada{pino}")
+    return linhas, f"{prefixo}x.saida", f"{prefixo}a.saida"
+
+
+def gerar_multiplicador(bits):
+    """Gera um multiplicador em matriz de `bits` x `bits` bits (produto P0..P{2*bits-1})
+
+    Cada produto parcial Ai·Bj é uma porta AND; a linha j é somada ao
+    acumulado das anteriores por uma cadeia ripple-carry de meios somadores
+    e somadores completos.
+    """
+    linhas = [f"circuito Multiplicador{bits}Bits {{"]
+    linhas.extend(f"    entrada {l}{i} {{ valor_inicial {(i + (l == 'B')) % 2} }}" for l in "AB" for i in range(bits))
+    parciais = []
+    for j in range(bits):
+        linha = []
+        for i in range(bits):
+            nome = f"p{j}_{i}"
+            linhas.append(_porta("AND", nome))
+            linhas.append(f"    conexao conectar A{i}.saida -> {nome}.entrada0")
+            linhas.append(f"    conexao conectar B{j}.saida -> {nome}.entrada1")
+            linha.append(f"{nome}.saida")
+        parciais.append(linha)
+
+    produto = []
+    acumulado = parciais[0]
+    for j in range(1, bits):
+        produto.append(acumulado[0])
+        novo, vai_um = [], None
+        for i in range(bits):
+            operandos = [parciais[j][i]] + acumulado[i + 1:i + 2] + ([vai_um] if vai_um else [])
+            prefixo = f"l{j}_{i}_"
+            if len(operandos) == 3:
+                corpo, soma, vai_um = _portas_somador_completo(prefixo, *operandos)
+            else:
+                corpo, soma, vai_um = _portas_meio_somador(prefixo, *operandos)
+            linhas.extend(corpo)
+            novo.append(soma)
+        acumulado = novo + [vai_um]
+    produto.extend(acumulado)
+
+    for k, sinal in enumerate(produto):
+        linhas.append(f"    saida P{k} {{ }}")
+        linhas.append(f"    conexao conectar {sinal} -> P{k}.entrada")
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
+
+
+def gerar_portas_largas(num_portas, largura, num_entradas=None, semente=0, primitivas=False):
+    """Gera portas de `largura` entradas (tabelas de 2^largura linhas) ligadas às entradas
+
+    Cada porta tem uma função de FUNCOES sorteada, pinos sorteados entre as
+    entradas do circuito e a sua própria saída; exercita a análise e a
+    compilação de tabelas grandes. Com primitivas=True as portas são
+    declaradas como primitivas, sem tabela (e MAJ, que não é primitiva, fica
+    de fora do sorteio).
+    """
+    rng = random.Random(semente)
+    if num_entradas is None:
+        num_entradas = largura + 4
+    tipos = [tipo for tipo in FUNCOES if not primitivas or tipo != "MAJ"]
+    linhas = [f"circuito Largas{num_portas}x{largura} {{"]
+    linhas.extend(f"    entrada E{i} {{ valor_inicial {rng.randint(0, 1)} }}" for i in range(num_entradas))
+    for g in range(num_portas):
+        tipo = rng.choice(tipos)
+        if primitivas:
+            linhas.append(f"    porta_logica {tipo} g{g} {{ numero_de_entradas {largura} }}")
+        else:
+            linhas.append(_porta(tipo, f"g{g}", largura=largura))
+        for pino in range(largura):
+            linhas.append(f"    conexao conectar E{rng.randrange(num_entradas)}.saida -> g{g}.entrada{pino}")
+        linhas.append(f"    saida S{g} {{ }}")
+        linhas.append(f"    conexao conectar g{g}.saida -> S{g}.entrada")
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
+
+
+def _linhas_para_tabela(linhas):
+    """Converte linhas "0 1 -> 1" na estrutura de tabela produzida pelo parser"""
+    tabela = []
+    for linha in linhas:
+        entrada, saida = linha.split("->")
+        tabela.append(([int(bit) for bit in entrada.split()], [int(bit) for bit in saida.split()]))
+    return tabela
+
+
+def montar_dag_aleatorio(num_portas, num_entradas=64, num_saidas=8, semente=0, internar=True):
+    """Monta diretamente (sem o parser) um CircuitoState equivalente a gerar_dag_aleatorio
+
+    Útil para netlists grandes demais para passar pela análise sintática em
+    um benchmark. Com internar=False cada porta recebe a sua própria cópia
+    da tabela verdade, como antes do compartilhamento de tabelas.
+    """
+    rng = random.Random(semente)
+    circ = CircuitoState()
+    circ.nome = f"DAG{num_portas}"
+    for i in range(num_entradas):
+        circ.entradas[f"E{i}"] = Entrada(f"E{i}", rng.randint(0, 1))
+
+    origens = [f"E{i}" for i in range(num_entradas)]
+    tipos = list(TABELAS)
+    for g in range(num_portas):
+        tipo = rng.choice(tipos)
+        nome = f"g{g}"
+        tabela, lookup, _, _ = internar_tabela(nome, 2, 1, _linhas_para_tabela(TABELAS[tipo]))
+        if not internar:
+            tabela, lookup = _linhas_para_tabela(TABELAS[tipo]), bytes(lookup)
+        circ.portas[nome] = Porta(tipo, nome, 2, 1, tabela, lookup)
+        janela = origens[-64:]
+        for pino in range(2):
+            circ.conexoes.append(Conexao(f"{rng.choice(janela)}.saida", f"{nome}.entrada{pino}"))
+        origens.append(nome)
+
+    for s in range(num_saidas):
+        circ.saidas[f"S{s}"] = Saida(f"S{s}")
+        circ.conexoes.append(Conexao(f"{origens[-1 - s]}.saida", f"S{s}.entrada"))
+    return circ
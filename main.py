@@ -5,11 +5,12 @@
 
 import os
 import sys
-from src.lexer import lexer
-from src.parser_rules import parser
+import time
 from src.models import circuito
-from src.simulator import simular_circuito
-from src.generators import gerar_html_circuito, gerar_resumo_textual, abrir_html
+from src.estatisticas import estatisticas
+
+# Os demais módulos são importados dentro das funções que os usam, para que a
+# ajuda e os acertos no cache não paguem a carga do PLY, do multiprocessing etc.
 
 
 def criar_exemplo_padrao(arquivo):
@@ -46,8 +47,15 @@ def criar_exemplo_padrao(arquivo):
     print(f"Arquivo de exemplo criado: {arquivo}")
 
 
-def processar_arquivo(arquivo_entrada):
-    """Processa um arquivo de circuito"""
+def processar_arquivo(arquivo_entrada, usar_cache=True, verbose=False):
+    """Processa um arquivo de circuito
+
+    Circuitos já compilados são carregados do cache; verbose mostra os
+    tokens e cada definição durante a análise (sem usar o cache).
+    """
+    from src.cache import carregar_do_cache, salvar_no_cache
+    from src.simulator import obter_compilado
+
     circuito.limpar()
 
     with open(arquivo_entrada, "r", encoding="utf-8") as f:
@@ -55,18 +63,275 @@ def processar_arquivo(arquivo_entrada):
 
     print("=== ANÁLISE LÉXICA E SINTÁTICA ===")
 
-    lexer.input(data)
-    print("Tokens encontrados:")
-    while True:
-        tok = lexer.token()
-        if not tok:
-            break
-        print(f"  {tok.type}: {tok.value}")
+    do_cache = None
+    if usar_cache and not verbose:
+        with estatisticas.fase("leitura_cache"):
+            do_cache = carregar_do_cache(data)
+
+    if do_cache is not None:
+        circuito.copiar_de(do_cache)
+    else:
+        from src.parser_rules import analisar
+        if verbose:
+            print("Tokens encontrados:")
+        analisar(data, circuito, verbose=verbose, mostrar_tokens=verbose)
+
+    if not verbose:
+        for mensagem in circuito.avisos_analise + circuito.erros_analise:
+            print(mensagem)
+
+    if circuito.nome is None:
+        return False
+
+    # Compilação única: conexões indexadas e ordem topológica das portas
+    compilado = obter_compilado()
+    if do_cache is None and usar_cache:
+        with estatisticas.fase("gravacao_cache"):
+            salvar_no_cache(data, circuito)
+
+    origem = " (cache)" if do_cache is not None else ""
+    print(f"Circuito '{circuito.nome}' compilado{origem}: {compilado.num_entradas} entradas, "
+          f"{len(compilado.nomes_portas)} portas, {len(compilado.nomes_saidas)} saídas")
+    return True
+
+
+def extrair_opcao(args, nome):
+    """Remove uma opção com valor (--nome VALOR) da lista de argumentos e retorna o valor"""
+    if nome not in args:
+        return None
+    indice = args.index(nome)
+    if indice + 1 >= len(args):
+        print(f"Erro: a opção {nome} exige um valor")
+        sys.exit(1)
+    valor = args[indice + 1]
+    del args[indice:indice + 2]
+    return valor
+
+
+def compilado_para_lote(otimizar=True):
+    """Netlist usado nos modos em lote: o otimizado, a menos que otimizar seja False"""
+    from src.simulator import obter_compilado
+    compilado = obter_compilado()
+    if not otimizar or compilado.erros:
+        return compilado
+    from src.otimizador import obter_otimizado, resumo_otimizacao
+    otimizado, relatorio = obter_otimizado(compilado)
+    print(resumo_otimizacao(relatorio))
+    return otimizado
+
+
+def simular_lote(arquivo_estimulos, arquivo_saida, jobs=1, otimizar=True):
+    """Simula todos os vetores de um arquivo de estímulos (modo em lote)"""
+    from src.estimulos import simular_arquivo_estimulos
+    arquivo_saida = arquivo_saida or f"saidas_{circuito.nome}.csv"
+    compilado = compilado_para_lote(otimizar)
+    inicio = time.perf_counter()
+    try:
+        with estatisticas.fase("simulacao_lote"):
+            quantidade = simular_arquivo_estimulos(compilado, arquivo_estimulos, arquivo_saida, jobs)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de estímulos '{arquivo_estimulos}' não encontrado")
+        return
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    duracao = time.perf_counter() - inicio
+    print(f"\n{quantidade} vetores simulados em {duracao:.2f}s -> {arquivo_saida}")
+
+
+def graduar_vetores(arquivo_estimulos, quantidade_aleatoria):
+    """Cobertura de falhas stuck-at dos vetores de um arquivo (ou de vetores aleatórios)"""
+    from src.estimulos import ler_estimulos
+    from src.falhas import (simular_falhas, blocos_de_vetores, blocos_aleatorios, resumo_falhas,
+                            escrever_relatorio_falhas)
+    from src.simulator import obter_compilado, simular_circuito
+    compilado = obter_compilado()
+    if compilado.erros:
+        simular_circuito(verbose=False)  # Mostra os erros de validação
+        return
+    inicio = time.perf_counter()
+    try:
+        if arquivo_estimulos:
+            nomes, vetores = ler_estimulos(arquivo_estimulos)
+            blocos = blocos_de_vetores(compilado, nomes, vetores)
+        else:
+            blocos = blocos_aleatorios(compilado, quantidade_aleatoria)
+        with estatisticas.fase("simulacao_falhas"):
+            resultado = simular_falhas(compilado, blocos)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de estímulos '{arquivo_estimulos}' não encontrado")
+        return
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    duracao = time.perf_counter() - inicio
+
+    print("\n=== SIMULAÇÃO DE FALHAS ===")
+    for linha in resumo_falhas(resultado):
+        print(linha)
+    arquivo_relatorio = f"falhas_{circuito.nome}.csv"
+    escrever_relatorio_falhas(resultado, arquivo_relatorio)
+    print(f"\nFalhas simuladas em {duracao:.2f}s -> {arquivo_relatorio}")
 
-    lexer.input(data)
-    parser.parse(data, lexer=lexer, debug=False)
 
-    return circuito.nome is not None
+def estimar_atividade_vetores(arquivo_estimulos, quantidade_aleatoria):
+    """Probabilidade de sinal e atividade de chaveamento de cada net, para os relatórios e um CSV"""
+    from src.estimulos import ler_estimulos
+    from src.falhas import blocos_de_vetores, blocos_aleatorios
+    from src.atividade import estimar_atividade, resumo_atividade, escrever_relatorio_atividade
+    from src.simulator import obter_compilado
+    compilado = obter_compilado()
+    if compilado.erros:
+        return  # Os erros de validação aparecem na simulação
+    inicio = time.perf_counter()
+    try:
+        if arquivo_estimulos:
+            nomes, vetores = ler_estimulos(arquivo_estimulos)
+            blocos = blocos_de_vetores(compilado, nomes, vetores)
+        else:
+            blocos = blocos_aleatorios(compilado, quantidade_aleatoria)
+        with estatisticas.fase("atividade"):
+            resultado = estimar_atividade(compilado, blocos)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de estímulos '{arquivo_estimulos}' não encontrado")
+        return
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    duracao = time.perf_counter() - inicio
+
+    print("\n=== ATIVIDADE DE CHAVEAMENTO ===")
+    for linha in resumo_atividade(resultado):
+        print(linha)
+    arquivo_relatorio = f"atividade_{circuito.nome}.csv"
+    escrever_relatorio_atividade(resultado, arquivo_relatorio)
+    print(f"\nAtividade estimada em {duracao:.2f}s -> {arquivo_relatorio}")
+    circuito.atividade = resultado
+
+
+def gerar_tabela_arquivo(arquivo_tabela, jobs=1, otimizar=True):
+    """Grava a tabela verdade completa (entradas + saídas) em CSV ou binário"""
+    from src.bitparalelo import vetores_tabela_verdade
+    from src.estimulos import escrever_vetores
+    from src.paralelo import tabela_verdade_paralela
+    from src.simulator import simular_circuito
+    compilado = compilado_para_lote(otimizar)
+    if compilado.erros:
+        simular_circuito(verbose=False)  # Mostra os erros de validação
+        return
+    inicio = time.perf_counter()
+    nomes = compilado.nomes_entradas + compilado.nomes_saidas
+    blocos = tabela_verdade_paralela(compilado, jobs)
+    with estatisticas.fase("tabela_verdade"):
+        if arquivo_tabela.lower().endswith(".tvb"):
+            from src.exportadores import escrever_tabela_compactada
+            quantidade = escrever_tabela_compactada(compilado, arquivo_tabela, blocos)
+        else:
+            quantidade = escrever_vetores(arquivo_tabela, nomes, vetores_tabela_verdade(compilado, blocos))
+    duracao = time.perf_counter() - inicio
+    print(f"\nTabela verdade com {quantidade} linhas gerada em {duracao:.2f}s -> {arquivo_tabela}")
+
+
+def exportar_netlist(arquivo_json):
+    """Grava o netlist do circuito em JSON"""
+    from src.exportadores import exportar_json
+    from src.simulator import obter_compilado
+    compilado = obter_compilado()
+    with estatisticas.fase("exportacao_json"):
+        portas = exportar_json(circuito, compilado, arquivo_json)
+    print(f"\nNetlist com {portas} portas exportado -> {arquivo_json}")
+
+
+def gerar_modulo_python(arquivo_python, otimizar=True):
+    """Grava o avaliador do circuito como um módulo Python em linha reta"""
+    from src.codegen import escrever_modulo
+    from src.simulator import simular_circuito
+    compilado = compilado_para_lote(otimizar)
+    if compilado.erros:
+        simular_circuito(verbose=False)  # Mostra os erros de validação
+        return
+    escrever_modulo(compilado, arquivo_python)
+    print(f"\nAvaliador Python gerado -> {arquivo_python}")
+
+
+def compilar_diretorio(diretorio, jobs=1):
+    """Compila e simula todos os circuitos .txt de um diretório (modo lote)"""
+    from src.lote import listar_circuitos, processar_lote, imprimir_resumo_lote
+    if not os.path.isdir(diretorio):
+        print(f"Erro: Diretório '{diretorio}' não encontrado")
+        return 1
+    arquivos = listar_circuitos(diretorio)
+    print(f"=== COMPILANDO {len(arquivos)} CIRCUITOS DE {diretorio} ===")
+    inicio = time.perf_counter()
+    falhas = imprimir_resumo_lote(processar_lote(arquivos, jobs))
+    print(f"  Tempo total: {time.perf_counter() - inicio:.2f}s")
+    return 1 if falhas else 0
+
+
+def carregar_circuito(arquivo, usar_cache=True):
+    """Analisa (ou carrega do cache) um arquivo em um CircuitoState próprio; None se inválido"""
+    from src.cache import carregar_do_cache, salvar_no_cache
+    from src.parser_rules import analisar
+    from src.simulator import obter_compilado
+    with open(arquivo, "r", encoding="utf-8") as f:
+        data = f.read()
+    circ = carregar_do_cache(data) if usar_cache else None
+    if circ is None:
+        circ = analisar(data, verbose=False)
+        if circ.nome is not None:
+            obter_compilado(circ)
+            if usar_cache:
+                salvar_no_cache(data, circ)
+    for mensagem in circ.avisos_analise + circ.erros_analise:
+        print(mensagem)
+    return circ if circ.nome is not None else None
+
+
+def comparar_circuitos(arquivo_a, arquivo_b, usar_cache=True):
+    """Verifica com BDDs se dois circuitos têm as mesmas saídas (modo --equiv)
+
+    Retorna o código de saída: 0 se equivalentes, 1 caso contrário.
+    """
+    from src.bdd import LimiteBDDExcedido
+    from src.equivalencia import verificar_equivalencia
+    from src.simulator import obter_compilado
+    print("=== VERIFICAÇÃO DE EQUIVALÊNCIA (BDD) ===")
+    compilados = []
+    for rotulo, arquivo in (("A", arquivo_a), ("B", arquivo_b)):
+        if not os.path.exists(arquivo):
+            print(f"Erro: Arquivo '{arquivo}' não encontrado")
+            return 1
+        circ = carregar_circuito(arquivo, usar_cache)
+        if circ is None:
+            print(f"Erro: Circuito de '{arquivo}' não foi definido corretamente")
+            return 1
+        compilado = obter_compilado(circ)
+        print(f"  {rotulo}: {arquivo} ('{circ.nome}': {compilado.num_entradas} entradas, "
+              f"{len(compilado.nomes_portas)} portas, {len(compilado.nomes_saidas)} saídas)")
+        compilados.append(compilado)
+
+    inicio = time.perf_counter()
+    try:
+        resultado = verificar_equivalencia(*compilados)
+    except LimiteBDDExcedido as e:
+        print(f"Erro: verificação inconclusiva: {e}")
+        return 1
+    duracao = time.perf_counter() - inicio
+
+    for erro in resultado["erros"]:
+        print(f"Erro: {erro}")
+    for nome, igual in resultado["saidas"].items():
+        print(f"  {nome}: {'equivalente' if igual else 'DIFERENTE'}")
+    if resultado["contraexemplo"] is not None:
+        print("\nContraexemplo:")
+        print("  " + " ".join(f"{nome}={bit}" for nome, bit in resultado["contraexemplo"].items()))
+        for nome, igual in resultado["saidas"].items():
+            if not igual:
+                print(f"  {nome}: A = {resultado['valores_a'][nome]}, B = {resultado['valores_b'][nome]}")
+
+    veredito = "EQUIVALENTES" if resultado["equivalentes"] else "NÃO EQUIVALENTES"
+    print(f"\nResultado: circuitos {veredito} (BDD com {resultado['nos']} nós, {duracao:.2f}s)")
+    return 0 if resultado["equivalentes"] else 1
 
 
 def mostrar_ajuda():
@@ -80,6 +345,24 @@ def mostrar_ajuda():
 ║  Opções:                                                     ║
 ║    --help, -h      Mostra esta ajuda                         ║
 ║    --no-open       Não abre o HTML automaticamente           ║
+║    --verbose, -v   Mostra tokens e definições da análise     ║
+║    --no-cache      Não usa o cache de compilação             ║
+║    --no-opt        Não otimiza o netlist nos modos em lote   ║
+║    --estimulos ARQ      Simula os vetores de ARQ (.csv/.bin) ║
+║    --saida-vetores ARQ  Arquivo de saída do modo em lote     ║
+║    --tabela ARQ         Grava a tabela verdade em ARQ        ║
+║    --python ARQ         Grava o avaliador gerado em ARQ      ║
+║    --json ARQ           Exporta o netlist em JSON            ║
+║    --jobs N             Processos (0 = todos os núcleos)     ║
+║    --lote DIR           Compila todos os .txt de DIR         ║
+║    --equiv A B          Verifica se A e B são equivalentes   ║
+║    --falhas ARQ         Cobertura de falhas stuck-at de ARQ  ║
+║    --falhas-aleatorias N  Idem, com N vetores aleatórios     ║
+║    --atividade ARQ      Atividade de chaveamento dos vetores ║
+║    --atividade-aleatoria N  Idem, com N vetores aleatórios   ║
+║    --servidor END       Servidor JSON (socket Unix ou porta) ║
+║    --stats              Tempo por fase e contadores          ║
+║    --perfil ARQ         Grava um perfil do cProfile em ARQ   ║
 ║                                                              ║
 ║  Exemplos:                                                   ║
 ║    python main.py                                            ║
@@ -88,20 +371,80 @@ def mostrar_ajuda():
 ║    python main.py exemplos/circuito_not.txt                  ║
 ║    python main.py exemplos/circuito_complexo.txt             ║
 ║    python main.py meu_circuito.txt --no-open                 ║
+║    python main.py circ.txt --estimulos vetores.csv           ║
+║    python main.py --lote exemplos --jobs 4                   ║
+║    python main.py circ.txt --no-open --stats                 ║
+║    python main.py --servidor /tmp/circuitos.sock             ║
 ╚══════════════════════════════════════════════════════════════╝
 """)
 
 
 def main():
-    # Verificar argumentos
     args = sys.argv[1:]
-    
+    arquivo_perfil = extrair_opcao(args, "--perfil")
+    if "--stats" in args or arquivo_perfil:
+        estatisticas.ativar(perfil=arquivo_perfil is not None)
+    try:
+        executar(args)
+    finally:
+        if estatisticas.ativa:
+            estatisticas.desativar()
+            print()
+            print(estatisticas.formatar())
+            if arquivo_perfil:
+                estatisticas.salvar_perfil(arquivo_perfil)
+                print(f"\nPerfil gravado em {arquivo_perfil}")
+
+
+def executar(args):
+    """Executa o modo escolhido pelos argumentos da linha de comando"""
     if "--help" in args or "-h" in args:
         mostrar_ajuda()
         return
     
     abrir_navegador = "--no-open" not in args
-    args = [a for a in args if not a.startswith("--")]
+    usar_cache = "--no-cache" not in args
+    if not usar_cache:
+        from src.cache import desativar_cache
+        desativar_cache()
+    otimizar = "--no-opt" not in args
+    verbose = "--verbose" in args or "-v" in args
+    arquivo_estimulos = extrair_opcao(args, "--estimulos")
+    arquivo_saida_vetores = extrair_opcao(args, "--saida-vetores")
+    arquivo_tabela = extrair_opcao(args, "--tabela")
+    arquivo_python = extrair_opcao(args, "--python")
+    arquivo_json = extrair_opcao(args, "--json")
+    arquivo_falhas = extrair_opcao(args, "--falhas")
+    falhas_aleatorias = extrair_opcao(args, "--falhas-aleatorias")
+    if falhas_aleatorias is not None and not falhas_aleatorias.isdigit():
+        print("Erro: --falhas-aleatorias exige um número inteiro")
+        return
+    arquivo_atividade = extrair_opcao(args, "--atividade")
+    atividade_aleatoria = extrair_opcao(args, "--atividade-aleatoria")
+    if atividade_aleatoria is not None and not atividade_aleatoria.isdigit():
+        print("Erro: --atividade-aleatoria exige um número inteiro")
+        return
+    jobs = extrair_opcao(args, "--jobs")
+    if jobs is not None and not jobs.isdigit():
+        print("Erro: --jobs exige um número inteiro")
+        return
+    jobs = int(jobs) if jobs is not None else 1
+
+    endereco_servidor = extrair_opcao(args, "--servidor")
+    if endereco_servidor:
+        from src.servidor import executar_servidor
+        sys.exit(executar_servidor(endereco_servidor))
+    diretorio_lote = extrair_opcao(args, "--lote")
+    if diretorio_lote:
+        sys.exit(compilar_diretorio(diretorio_lote, jobs))
+    if "--equiv" in args:
+        indice = args.index("--equiv")
+        arquivos = args[indice + 1:indice + 3]
+        if len(arquivos) < 2 or any(arquivo.startswith("-") for arquivo in arquivos):
+            print("Erro: a opção --equiv exige dois arquivos de circuito")
+            sys.exit(1)
+        sys.exit(comparar_circuitos(*arquivos, usar_cache))
+    args = [a for a in args if not a.startswith("-")]
     
     arquivo_entrada = args[0] if args else "circuito_exemplo.txt"
 
@@ -109,7 +452,25 @@ def main():
         criar_exemplo_padrao(arquivo_entrada)
 
     try:
-        if processar_arquivo(arquivo_entrada):
+        if processar_arquivo(arquivo_entrada, usar_cache, verbose):
+            if arquivo_atividade or atividade_aleatoria:
+                estimar_atividade_vetores(arquivo_atividade, int(atividade_aleatoria or 0))
+            if arquivo_estimulos or arquivo_tabela or arquivo_python or arquivo_json or arquivo_falhas \
+                    or falhas_aleatorias:
+                if arquivo_estimulos:
+                    simular_lote(arquivo_estimulos, arquivo_saida_vetores, jobs, otimizar)
+                if arquivo_falhas or falhas_aleatorias:
+                    graduar_vetores(arquivo_falhas, int(falhas_aleatorias or 0))
+                if arquivo_tabela:
+                    gerar_tabela_arquivo(arquivo_tabela, jobs, otimizar)
+                if arquivo_python:
+                    gerar_modulo_python(arquivo_python, otimizar)
+                if arquivo_json:
+                    exportar_netlist(arquivo_json)
+                return
+
+            from src.simulator import simular_circuito
+            from src.generators import gerar_html_circuito, gerar_resumo_textual, abrir_html
             simular_circuito()
             gerar_resumo_textual()
             html_file = gerar_html_circuito()
@@ -1,7 +1,50 @@
 # Módulos do compilador de circuitos
-from .lexer import lexer, tokens
-from .parser_rules import parser
-from .models import circuito, Porta, Entrada, Saida, Conexao
-from .simulator import simular_circuito, validar_circuito
-from .generators import gerar_html_circuito, gerar_resumo_textual, abrir_html
+__version__ = "1.1.0"
 
+import importlib
+import sys
+import types
+
+# Os módulos são importados sob demanda (PEP 562): "python main.py --help" ou
+# um acerto no cache não precisam carregar o PLY nem montar o parser. O objeto
+# lexer continua em src.lexer (como quando era importado aqui), embora esse
+# também seja o nome do submódulo: ver _Pacote.
+_EXPORTS = {
+    "tokens": ".lexer",
+    "parser": ".parser_rules", "analisar": ".parser_rules",
+    "circuito": ".models", "CircuitoState": ".models", "Porta": ".models",
+    "Entrada": ".models", "Saida": ".models", "Conexao": ".models", "Modulo": ".models",
+    "compilar_circuito": ".compiler", "CircuitoCompilado": ".compiler",
+    "simular_circuito": ".simulator", "validar_circuito": ".validacao", "obter_compilado": ".simulator",
+    "gerar_html_circuito": ".generators", "gerar_resumo_textual": ".generators", "abrir_html": ".generators",
+}
+
+__all__ = ["__version__", "lexer"] + list(_EXPORTS)
+
+
+class _Pacote(types.ModuleType):
+    """O pacote src, com o atributo lexer sempre resolvido para o objeto lexer do PLY"""
+
+    @property
+    def lexer(self):
+        return importlib.import_module(".lexer", __name__).lexer
+
+    @lexer.setter
+    def lexer(self, valor):
+        pass  # O sistema de importação guarda aqui o submódulo src.lexer; o objeto prevalece
+
+
+sys.modules[__name__].__class__ = _Pacote
+
+
+def __getattr__(nome):
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | {"lexer"})
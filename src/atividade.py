@@ -0,0 +1,104 @@
+# =======================
+# ATIVIDADE DE CHAVEAMENTO E PROBABILIDADE DE SINAL
+# =======================
+#
+# Estimativa de potência dinâmica: para cada net (a saída de cada entrada e
+# de cada porta), a probabilidade de valer 1 e o número de trocas de valor
+# entre vetores consecutivos de uma sequência, aleatória ou lida de um
+# arquivo de estímulos. A atividade de chaveamento é a fração dos pares de
+# vetores consecutivos em que a net troca de valor, e a soma de atividade x
+# fan-out dá uma medida relativa da potência dissipada.
+#
+# Os vetores passam pelo motor bit-paralelo em blocos (bit r de cada
+# palavra = vetor r): os uns de uma net são os bits ligados da sua palavra, e
+# as trocas dentro do bloco são os bits ligados de palavra ^ (palavra >> 1),
+# sem o último, que é comparado com o primeiro vetor do bloco seguinte.
+
+from .bitparalelo import avaliar_palavras
+
+# Nets listadas no resumo (o arquivo CSV tem todas)
+LIMITE_NETS_RESUMO = 10
+
+try:
+    _contar_uns = int.bit_count  # Python 3.10+
+except AttributeError:
+    def _contar_uns(palavra):
+        return bin(palavra).count("1")
+
+
+def estimar_atividade(compilado, blocos):
+    """Conta os uns e as trocas de valor de cada net sobre uma sequência de vetores
+
+    blocos produz (quantidade, palavras das entradas), como
+    falhas.blocos_de_vetores e falhas.blocos_aleatorios, na ordem da
+    sequência. Retorna um dict com os nomes e o fan-out das nets (entradas e
+    depois portas, na ordem de compilado), os uns e as trocas de cada uma e
+    o número de vetores.
+    """
+    if compilado.erros:
+        raise ValueError("Circuito inválido: " + "; ".join(compilado.erros))
+    uns = [0] * compilado.num_nets
+    trocas = [0] * compilado.num_nets
+    ultimos = None  # Valor de cada net no último vetor do bloco anterior
+    vetores = 0
+
+    for quantidade, palavras in blocos:
+        mascara = (1 << quantidade) - 1
+        internas = mascara >> 1  # Pares (r, r + 1) dentro do bloco
+        valores = avaliar_palavras(compilado, palavras, mascara)
+        for net, palavra in enumerate(valores):
+            uns[net] += _contar_uns(palavra)
+            trocas[net] += _contar_uns((palavra ^ (palavra >> 1)) & internas)
+            if ultimos is not None:
+                trocas[net] += (palavra ^ ultimos[net]) & 1
+        ultimos = [palavra >> (quantidade - 1) for palavra in valores]
+        vetores += quantidade
+
+    return {"nets": compilado.nomes_entradas + compilado.nomes_portas,
+            "fanout": [len(destinos) + len(saidas)
+                       for destinos, saidas in zip(compilado.fanout, compilado.fanout_saidas)],
+            "uns": uns, "trocas": trocas, "vetores": vetores}
+
+
+def probabilidades(resultado):
+    """Probabilidade de cada net valer 1"""
+    vetores = resultado["vetores"]
+    return [uns / vetores if vetores else 0.0 for uns in resultado["uns"]]
+
+
+def atividades(resultado):
+    """Fração dos pares de vetores consecutivos em que cada net troca de valor"""
+    pares = resultado["vetores"] - 1
+    return [trocas / pares if pares > 0 else 0.0 for trocas in resultado["trocas"]]
+
+
+def nets_mais_ativas(resultado, limite=LIMITE_NETS_RESUMO):
+    """(nome, probabilidade, atividade, fan-out) das nets de maior atividade x fan-out"""
+    linhas = list(zip(resultado["nets"], probabilidades(resultado), atividades(resultado), resultado["fanout"]))
+    linhas.sort(key=lambda linha: (-linha[2] * max(linha[3], 1), linha[0]))
+    return linhas[:limite]
+
+
+def resumo_atividade(resultado):
+    """Linhas de texto com a atividade média, a carga total e as nets mais ativas"""
+    ativ = atividades(resultado)
+    media = sum(ativ) / len(ativ) if ativ else 0.0
+    carga = sum(a * fanout for a, fanout in zip(ativ, resultado["fanout"]))
+    linhas = [f"Atividade de chaveamento: {len(resultado['nets'])} nets, {resultado['vetores']} vetores simulados",
+              f"  Atividade média: {media:.4f}",
+              f"  Soma de atividade x fan-out: {carga:.4f}",
+              "  Nets mais ativas (atividade x fan-out):"]
+    for nome, probabilidade, atividade, fanout in nets_mais_ativas(resultado):
+        linhas.append(f"    - {nome}: P(1) = {probabilidade:.4f}, atividade = {atividade:.4f}, fan-out {fanout}")
+    return linhas
+
+
+def escrever_relatorio_atividade(resultado, arquivo):
+    """Grava uma linha por net (probabilidade de 1, trocas, atividade, fan-out) em CSV"""
+    with open(arquivo, "w", encoding="utf-8") as f:
+        f.write("net,probabilidade_1,trocas,atividade,fanout\n")
+        for nome, probabilidade, trocas, atividade, fanout in zip(
+                resultado["nets"], probabilidades(resultado), resultado["trocas"],
+                atividades(resultado), resultado["fanout"]):
+            f.write(f"{nome},{probabilidade:.6f},{trocas},{atividade:.6f},{fanout}\n")
+    return len(resultado["nets"])
@@ -0,0 +1,140 @@
+# =======================
+# DIAGRAMAS DE DECISÃO BINÁRIA (ROBDD)
+# =======================
+#
+# Pacote mínimo de BDDs reduzidos e ordenados. Cada nó é um inteiro: 0 e 1
+# são as folhas e os demais indexam as listas variaveis/baixo/alto. A tabela
+# única garante que funções iguais sejam o mesmo nó, então comparar duas
+# funções é comparar dois inteiros; o cache de operações evita refazer o
+# mesmo ITE. A variável de índice menor fica mais perto da raiz.
+
+from .primitivas import TabelaCubos
+
+# Número máximo de nós antes de desistir (cada nó custa algumas centenas de bytes)
+LIMITE_NOS = 2_000_000
+
+
+class LimiteBDDExcedido(Exception):
+    """O BDD cresceu além do limite de nós do gerenciador"""
+
+
+class GerenciadorBDD:
+    """Tabela única e cache de operações compartilhados por todas as funções"""
+
+    def __init__(self, num_variaveis, limite_nos=LIMITE_NOS):
+        self.num_variaveis = num_variaveis
+        self.variaveis = [num_variaveis, num_variaveis]  # As folhas ficam abaixo de todas as variáveis
+        self.baixo = [0, 1]
+        self.alto = [0, 1]
+        self.unica = {}
+        self.cache_ite = {}
+        self.limite_nos = limite_nos
+
+    @property
+    def num_nos(self):
+        return len(self.baixo)
+
+    def no(self, variavel, baixo, alto):
+        """Nó (variavel ? alto : baixo), reduzido e compartilhado pela tabela única"""
+        if baixo == alto:
+            return baixo
+        chave = (variavel, baixo, alto)
+        no = self.unica.get(chave)
+        if no is None:
+            no = len(self.baixo)
+            if no >= self.limite_nos:
+                raise LimiteBDDExcedido(f"BDD com mais de {self.limite_nos} nós")
+            self.variaveis.append(variavel)
+            self.baixo.append(baixo)
+            self.alto.append(alto)
+            self.unica[chave] = no
+        return no
+
+    def variavel(self, i):
+        """Função identidade da variável i"""
+        return self.no(i, 0, 1)
+
+    def _cofatores(self, f, variavel):
+        if self.variaveis[f] != variavel:
+            return f, f
+        return self.baixo[f], self.alto[f]
+
+    def ite(self, f, g, h):
+        """Se-então-senão: (f & g) | (~f & h)"""
+        if f == 1:
+            return g
+        if f == 0:
+            return h
+        if g == h:
+            return g
+        if g == 1 and h == 0:
+            return f
+        chave = (f, g, h)
+        resultado = self.cache_ite.get(chave)
+        if resultado is not None:
+            return resultado
+
+        variavel = min(self.variaveis[f], self.variaveis[g], self.variaveis[h])
+        f0, f1 = self._cofatores(f, variavel)
+        g0, g1 = self._cofatores(g, variavel)
+        h0, h1 = self._cofatores(h, variavel)
+        resultado = self.no(variavel, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self.cache_ite[chave] = resultado
+        return resultado
+
+    def nao(self, f):
+        return self.ite(f, 0, 1)
+
+    def xor(self, f, g):
+        return self.ite(f, self.nao(g), g)
+
+    def aplicar_plano(self, plano, operandos):
+        """Função de uma porta a partir do seu plano de Shannon (ver bitparalelo.py)"""
+        if isinstance(plano, TabelaCubos):
+            return self._aplicar_tabela_cubos(plano, operandos)
+        if plano == 0 or plano == 1:
+            return plano
+        variavel, f0, f1 = plano
+        return self.ite(operandos[variavel],
+                        self.aplicar_plano(f1, operandos),
+                        self.aplicar_plano(f0, operandos))
+
+    def _aplicar_tabela_cubos(self, tabela, operandos):
+        """Função de uma porta larga (primitiva ou soma de cubos, ver primitivas.py)"""
+        n = tabela.entradas
+        if tabela.base is None:
+            resultado = 0
+            for mascara, valor in tabela.cubos:
+                termo = 1
+                for i in range(n):
+                    if mascara >> (n - 1 - i) & 1:
+                        literal = operandos[i] if valor >> (n - 1 - i) & 1 else self.nao(operandos[i])
+                        termo = self.ite(termo, literal, 0)
+                resultado = self.ite(resultado, 1, termo)
+        elif tabela.base == "AND":
+            resultado = 1
+            for f in operandos:
+                resultado = self.ite(resultado, f, 0)
+        elif tabela.base == "OR":
+            resultado = 0
+            for f in operandos:
+                resultado = self.ite(resultado, 1, f)
+        else:
+            resultado = 0
+            for f in operandos:
+                resultado = self.xor(resultado, f)
+        return self.nao(resultado) if tabela.negada else resultado
+
+    def exemplo(self, f):
+        """Atribuição {variável: bit} que leva f a 1 (None se f é a constante 0)"""
+        if f == 0:
+            return None
+        atribuicao = {}
+        while f != 1:
+            if self.alto[f] != 0:
+                atribuicao[self.variaveis[f]] = 1
+                f = self.alto[f]
+            else:
+                atribuicao[self.variaveis[f]] = 0
+                f = self.baixo[f]
+        return atribuicao
@@ -0,0 +1,186 @@
+# =======================
+# SIMULAÇÃO BIT-PARALELA
+# =======================
+#
+# Cada net carrega um inteiro em que o bit r é o valor do sinal no vetor r.
+# Uma única avaliação de porta (operações bit a bit em inteiros grandes do
+# Python) calcula assim a saída para milhares de vetores de uma só vez.
+
+from .estatisticas import estatisticas
+from .primitivas import TabelaCubos
+
+# Limite de memória para os valores das nets de um bloco da tabela verdade
+MEMORIA_BLOCO = 32 * 1024 * 1024
+MIN_BITS_BLOCO = 6
+MAX_BITS_BLOCO = 16
+
+
+def _plano_tabela(lookup, variavel, inicio, tamanho):
+    """Expansão de Shannon de uma tabela densa em uma árvore (var, f0, f1)
+
+    As folhas são as constantes 0 e 1; variáveis que não afetam a
+    sub-tabela são eliminadas.
+    """
+    if tamanho == 1:
+        return lookup[inicio]
+    metade = tamanho // 2
+    f0 = _plano_tabela(lookup, variavel + 1, inicio, metade)
+    f1 = _plano_tabela(lookup, variavel + 1, inicio + metade, metade)
+    if f0 == f1:
+        return f0
+    return (variavel, f0, f1)
+
+
+def planejar_porta(lookup):
+    """Converte a tabela densa de uma porta em um plano de avaliação bit a bit
+
+    Uma TabelaCubos (porta larga, ver primitivas.py) já é o próprio plano.
+    """
+    if isinstance(lookup, TabelaCubos):
+        return lookup
+    return _plano_tabela(lookup, 0, 0, len(lookup))
+
+
+def _avaliar_plano(plano, operandos, mascara):
+    """Avalia um plano de Shannon sobre palavras de bits"""
+    if plano.__class__ is TabelaCubos:
+        return plano.avaliar(operandos, mascara)
+    if plano == 0:
+        return 0
+    if plano == 1:
+        return mascara
+    variavel, f0, f1 = plano
+    x = operandos[variavel]
+    if f0 == 0:
+        return x if f1 == 1 else x & _avaliar_plano(f1, operandos, mascara)
+    if f1 == 0:
+        nao_x = x ^ mascara
+        return nao_x if f0 == 1 else nao_x & _avaliar_plano(f0, operandos, mascara)
+    if f0 == 1:
+        return (x ^ mascara) | _avaliar_plano(f1, operandos, mascara)
+    if f1 == 1:
+        return x | _avaliar_plano(f0, operandos, mascara)
+    return ((x & _avaliar_plano(f1, operandos, mascara))
+            | ((x ^ mascara) & _avaliar_plano(f0, operandos, mascara)))
+
+
+def obter_planos(compilado):
+    """Retorna (e guarda no compilado) os planos bit a bit de todas as portas"""
+    planos = getattr(compilado, 'planos', None)
+    if planos is None:
+        planos = [planejar_porta(lookup) for lookup in compilado.tabelas]
+        compilado.planos = planos
+    return planos
+
+
+def avaliar_palavras(compilado, palavras_entradas, mascara):
+    """Avalia todas as portas uma vez sobre palavras de bits
+
+    palavras_entradas segue a ordem de compilado.nomes_entradas; mascara tem
+    um bit ligado para cada vetor. Retorna a palavra de cada net (None para
+    portas não avaliadas).
+    """
+    planos = obter_planos(compilado)
+    valores = list(palavras_entradas) + [None] * len(compilado.nomes_portas)
+    base = compilado.num_entradas
+    pinos_portas = compilado.pinos_portas
+
+    for g in compilado.ordem:
+        operandos = [valores[net] for net in pinos_portas[g]]
+        valores[base + g] = _avaliar_plano(planos[g], operandos, mascara)
+
+    if estatisticas.ativa:
+        estatisticas.contar("blocos_bitparalelos")
+        estatisticas.contar("vetores_bitparalelos", mascara.bit_length())
+        estatisticas.contar("avaliacoes_portas", len(compilado.ordem))
+    return valores
+
+
+def bits_por_bloco(compilado):
+    """Escolhe quantas entradas variam dentro de um bloco, limitando a memória"""
+    bits = MAX_BITS_BLOCO
+    while bits > MIN_BITS_BLOCO and compilado.num_nets * (1 << bits) // 8 > MEMORIA_BLOCO:
+        bits -= 1
+    return min(bits, compilado.num_entradas)
+
+
+def padrao_entrada(posicao, bits):
+    """Palavra de 2^bits vetores em que o bit r vale (r >> posicao) & 1"""
+    mascara = (1 << (1 << bits)) - 1
+    periodo = 1 << (posicao + 1)
+    unidade = ((1 << (1 << posicao)) - 1) << (1 << posicao)
+    return mascara // ((1 << periodo) - 1) * unidade
+
+
+def tabela_verdade_exaustiva(compilado, bits=None, blocos=None):
+    """Gera a tabela verdade completa em blocos de 2^bits linhas
+
+    A linha i atribui à entrada j o bit (i >> (n - 1 - j)) & 1, a mesma
+    ordem usada no relatório HTML. Para cada bloco produz
+    (primeira_linha, quantidade, palavras_saidas); a palavra de uma saída é
+    None quando ela não pode ser calculada. blocos restringe os índices de
+    bloco gerados (por padrão, todos).
+    """
+    n = compilado.num_entradas
+    if bits is None:
+        bits = bits_por_bloco(compilado)
+    bits = min(bits, n)
+    tamanho = 1 << bits
+    mascara = (1 << tamanho) - 1
+    padroes = [padrao_entrada(n - 1 - j, bits) for j in range(n - bits, n)]
+
+    if blocos is None:
+        blocos = range(1 << (n - bits))
+    if not compilado.erros:
+        from .codegen import obter_avaliador
+        avaliar = obter_avaliador(compilado)
+
+    for bloco in blocos:
+        palavras = []
+        for j in range(n - bits):
+            palavras.append(mascara if (bloco >> (n - 1 - j - bits)) & 1 else 0)
+        palavras.extend(padroes)
+
+        if compilado.erros:
+            saidas = [None] * len(compilado.nomes_saidas)
+        else:
+            saidas = list(avaliar(palavras, mascara))
+            if estatisticas.ativa:
+                estatisticas.contar("blocos_bitparalelos")
+                estatisticas.contar("vetores_bitparalelos", tamanho)
+        yield bloco << bits, tamanho, saidas
+
+
+def linhas_tabela_verdade(compilado, bits=None, blocos=None):
+    """Gera (valores_entradas, valores_saidas) para cada linha da tabela verdade
+
+    blocos permite fornecer os blocos já calculados (por exemplo, pela
+    versão paralela); por padrão usa tabela_verdade_exaustiva.
+    """
+    n = compilado.num_entradas
+    if blocos is None:
+        blocos = tabela_verdade_exaustiva(compilado, bits)
+    for inicio, quantidade, saidas in blocos:
+        colunas = [format(palavra, f'0{quantidade}b')[::-1] if palavra is not None else None
+                   for palavra in saidas]
+        for r in range(quantidade):
+            linha = inicio + r
+            entradas = tuple((linha >> (n - 1 - j)) & 1 for j in range(n))
+            yield entradas, tuple(int(c[r]) if c is not None else None for c in colunas)
+
+
+def vetores_tabela_verdade(compilado, blocos=None):
+    """Gera cada linha da tabela verdade como uma string de entradas + saídas
+
+    Saídas que não podem ser calculadas aparecem como 'X'.
+    """
+    n = compilado.num_entradas
+    formato_linha = f"0{n}b"
+    if blocos is None:
+        blocos = tabela_verdade_exaustiva(compilado)
+    for inicio, quantidade, saidas in blocos:
+        colunas = [format(palavra, f'0{quantidade}b')[::-1] if palavra is not None else "X" * quantidade
+                   for palavra in saidas]
+        linhas_saida = zip(*colunas) if colunas else [()] * quantidade
+        for r, saida in enumerate(linhas_saida):
+            yield (format(inicio + r, formato_linha) if n else "") + "".join(saida)
@@ -0,0 +1,120 @@
+# =======================
+# CACHE DE COMPILAÇÃO
+# =======================
+#
+# Guarda em disco o CircuitoState já analisado e compilado (estrutura,
+# tabelas compiladas e índices do netlist), indexado pelo hash do código
+# fonte e da versão do compilador. Arquivos inalterados são carregados
+# direto do cache, sem análise léxica nem sintática.
+
+import hashlib
+import os
+import pickle
+from . import __version__
+
+# Tamanho máximo do cache; os arquivos menos usados recentemente são removidos
+LIMITE_CACHE = 256 * 1024 * 1024
+EXTENSAO = ".circuito"
+EXTENSAO_AVALIADOR = ".avaliador"  # Bytecode dos avaliadores gerados (ver codegen.py)
+
+_ativo = True  # False com --no-cache: nada é lido nem gravado em disco
+
+
+def desativar_cache():
+    """Desliga todo o cache em disco (circuitos e avaliadores) neste processo"""
+    global _ativo
+    _ativo = False
+
+
+def cache_ativo():
+    return _ativo
+
+
+def diretorio_cache():
+    """Diretório do cache ($COMPILADOR_CIRCUITOS_CACHE ou ~/.cache/compilador_circuitos)"""
+    diretorio = os.environ.get("COMPILADOR_CIRCUITOS_CACHE")
+    if diretorio:
+        return diretorio
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "compilador_circuitos")
+
+
+def _assinatura_compilador():
+    """Versão do compilador mais tamanho e data dos módulos, para invalidar o cache após mudanças"""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    partes = [__version__]
+    for entrada in sorted(os.scandir(pasta), key=lambda e: e.name):
+        if entrada.name.endswith(".py"):
+            info = entrada.stat()
+            partes.append(f"{entrada.name}:{info.st_size}:{info.st_mtime_ns}")
+    return "|".join(partes)
+
+
+def chave_cache(data):
+    """Hash SHA-256 do código fonte e da assinatura do compilador"""
+    h = hashlib.sha256(_assinatura_compilador().encode("utf-8"))
+    h.update(b"\0")
+    h.update(data.encode("utf-8"))
+    return h.hexdigest()
+
+
+def carregar_do_cache(data):
+    """Retorna o CircuitoState compilado para este código fonte, ou None"""
+    if not _ativo:
+        return None
+    caminho = os.path.join(diretorio_cache(), chave_cache(data) + EXTENSAO)
+    try:
+        with open(caminho, "rb") as f:
+            circ = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    try:
+        os.utime(caminho)  # Marca como usado recentemente
+    except OSError:
+        pass
+    return circ
+
+
+def salvar_no_cache(data, circ):
+    """Grava o circuito compilado no cache e remove entradas antigas se necessário"""
+    if not _ativo:
+        return
+    import tempfile  # Só necessário ao gravar; mantém rápida a carga do cache
+    diretorio = diretorio_cache()
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(circ, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, os.path.join(diretorio, chave_cache(data) + EXTENSAO))
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o cache de compilação: {e}")
+        return
+    limitar_cache()
+
+
+def limitar_cache(limite=LIMITE_CACHE):
+    """Remove os arquivos usados há mais tempo até o cache caber no limite"""
+    arquivos = []
+    try:
+        entradas = list(os.scandir(diretorio_cache()))
+    except OSError:
+        return
+    for entrada in entradas:
+        if not entrada.name.endswith((EXTENSAO, EXTENSAO_AVALIADOR)):
+            continue
+        try:
+            info = entrada.stat()
+        except OSError:
+            continue
+        arquivos.append((info.st_mtime, info.st_size, entrada.path))
+
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+        except OSError:
+            continue
+        total -= tamanho
@@ -0,0 +1,283 @@
+# =======================
+# GERAÇÃO DE CÓDIGO PYTHON
+# =======================
+#
+# Traduz um CircuitoCompilado em um módulo Python em linha reta: uma variável
+# local por net, uma atribuição por porta (em ordem topológica) e nenhuma
+# busca em listas ou dicionários durante a avaliação. Cada porta vira a
+# expressão bit a bit do seu plano de Shannon, então a mesma função avalia
+# um vetor (palavras de 1 bit) ou milhares de vetores de uma vez. A
+# expressão de cada tabela é a mais barata entre o plano de Shannon e as
+# somas de produtos mínimas da função e do seu complemento.
+#
+# O código fonte fica guardado no compilado (e portanto no cache de
+# compilação); o bytecode de cada fonte é guardado com marshal no diretório
+# do cache, evitando recompilar funções enormes a cada execução.
+
+import hashlib
+import marshal
+import os
+import sys
+from collections import OrderedDict
+from .bitparalelo import obter_planos
+from .compiler import portas_necessarias
+from .minimizacao import minimizar_lookup
+from .primitivas import TabelaCubos, largura_tabela
+from .estatisticas import cronometrado
+
+# Acima deste número de pinos a porta é traduzida só pelo plano de Shannon
+MAX_PINOS_SOMA_PRODUTOS = 12
+# Operandos por nível de parênteses nas cadeias de portas largas (ver _encadear)
+MAX_TERMOS_CADEIA = 64
+
+_AVALIADORES = OrderedDict()  # hash do fonte -> namespace do módulo gerado (LRU, por processo)
+LIMITE_AVALIADORES = 64
+_MODELOS = {}      # lookup -> expressão com {0}, {1}, ... no lugar dos pinos
+_FUNCOES = {}      # lookup -> função (operandos, m) que avalia a porta
+LIMITE_MODELOS = 65536
+
+
+def _net(net):
+    return f"n{net}"
+
+
+def _tupla(nomes):
+    """Tupla Python literal com os nomes dados"""
+    return ", ".join(nomes) + ("," if len(nomes) == 1 else "")
+
+
+def _expressao(plano, operandos):
+    """Expressão Python de um plano de Shannon; 'm' é a máscara dos vetores"""
+    if plano == 0:
+        return "0"
+    if plano == 1:
+        return "m"
+    variavel, f0, f1 = plano
+    x = operandos[variavel]
+    if f0 == 0:
+        return x if f1 == 1 else f"{x} & {_termo(f1, operandos)}"
+    if f1 == 0:
+        return f"{x} ^ m" if f0 == 1 else f"({x} ^ m) & {_termo(f0, operandos)}"
+    if f0 == 1:
+        return f"({x} ^ m) | {_termo(f1, operandos)}"
+    if f1 == 1:
+        return f"{x} | {_termo(f0, operandos)}"
+    if f0[1:] in ((0, 1), (1, 0)) and f1 == (f0[0], f0[2], f0[1]):
+        # f1 é o complemento de f0, uma única variável: XOR / XNOR
+        y = operandos[f0[0]]
+        return f"{x} ^ {y}" if f0[1] == 0 else f"{x} ^ {y} ^ m"
+    return f"({x} & {_termo(f1, operandos)}) | (({x} ^ m) & {_termo(f0, operandos)})"
+
+
+def _termo(plano, operandos):
+    """Expressão entre parênteses quando não é um único nome ou constante"""
+    expressao = _expressao(plano, operandos)
+    return expressao if " " not in expressao else f"({expressao})"
+
+
+def _encadear(operador, termos):
+    """termos unidos pelo operador, agrupados entre parênteses em blocos de MAX_TERMOS_CADEIA
+
+    Uma cadeia "a & b & c ..." é uma árvore sintática com a profundidade do
+    número de termos, e o compilador do Python desiste de expressões muito
+    profundas; os grupos mantêm a profundidade logarítmica.
+    """
+    while len(termos) > MAX_TERMOS_CADEIA:
+        termos = [f"({operador.join(termos[i:i + MAX_TERMOS_CADEIA])})"
+                  for i in range(0, len(termos), MAX_TERMOS_CADEIA)]
+    return operador.join(termos)
+
+
+def _soma_de_produtos(cubos, operandos):
+    """Expressão bit a bit de uma soma de produtos (cubos de minimizacao.py)"""
+    n = len(operandos)
+    termos = []
+    for mascara, valor in cubos:
+        literais = [x if valor >> (n - 1 - i) & 1 else f"({x} ^ m)"
+                    for i, x in enumerate(operandos) if mascara >> (n - 1 - i) & 1]
+        termos.append(_encadear(" & ", literais) or "m")
+    return _encadear(" | ", termos) or "0"
+
+
+def _expressao_cubos(tabela, operandos):
+    """Expressão bit a bit de uma TabelaCubos: a operação da primitiva ou a soma dos cubos"""
+    if tabela.base is None:
+        return _soma_de_produtos(tabela.cubos, operandos)
+    operador = {"AND": " & ", "OR": " | ", "XOR": " ^ "}[tabela.base]
+    expressao = _encadear(operador, operandos)
+    return f"({expressao}) ^ m" if tabela.negada else expressao
+
+
+def _custo(expressao):
+    """Proporcional ao número de operações: cada operador é cercado por espaços"""
+    return expressao.count(" ")
+
+
+def _modelo(lookup, plano):
+    """Expressão mais barata para a tabela, com os pinos como {0}, {1}, ..."""
+    modelo = _MODELOS.get(lookup)
+    if modelo is None:
+        n = largura_tabela(lookup)
+        operandos = [f"{{{i}}}" for i in range(n)]
+        if isinstance(lookup, TabelaCubos):
+            candidatos = [_expressao_cubos(lookup, operandos)]
+        else:
+            candidatos = [_expressao(plano, operandos)]
+        if n <= MAX_PINOS_SOMA_PRODUTOS and not isinstance(lookup, TabelaCubos):
+            complemento = bytes(1 - bit for bit in lookup)
+            candidatos.append(_soma_de_produtos(minimizar_lookup(lookup), operandos))
+            candidatos.append(f"({_soma_de_produtos(minimizar_lookup(complemento), operandos)}) ^ m")
+        modelo = min(candidatos, key=_custo)
+        if len(_MODELOS) < LIMITE_MODELOS:
+            _MODELOS[lookup] = modelo
+    return modelo
+
+
+def funcao_tabela(lookup, plano):
+    """Função (operandos, m) que avalia uma porta com essa tabela sobre palavras de bits
+
+    Útil para avaliar portas isoladas (fora do avaliador do circuito
+    inteiro); as funções são compartilhadas entre portas de mesma tabela.
+    """
+    funcao = _FUNCOES.get(lookup)
+    if funcao is None:
+        n = largura_tabela(lookup)
+        expressao = _modelo(lookup, plano).format(*[f"o[{i}]" for i in range(n)])
+        funcao = eval(f"lambda o, m: {expressao}")
+        if len(_FUNCOES) < LIMITE_MODELOS:
+            _FUNCOES[lookup] = funcao
+    return funcao
+
+
+def funcoes_portas(compilado):
+    """Lista com a função de avaliação de cada porta do compilado
+
+    Não fica guardada no compilado: funções não podem ser serializadas com
+    pickle (cache em disco e envio para outros processos).
+    """
+    planos = obter_planos(compilado)
+    return [funcao_tabela(lookup, plano) for lookup, plano in zip(compilado.tabelas, planos)]
+
+
+@cronometrado("geracao_codigo")
+def gerar_codigo(compilado):
+    """Retorna o código fonte do módulo avaliador do circuito
+
+    O módulo define ENTRADAS, SAIDAS, avaliar(palavras, m), que recebe uma
+    palavra de bits por entrada (bit r = vetor r) e a máscara dos vetores, e
+    avaliar_vetor(entradas), para uma tupla de 0/1 ou um inteiro com a
+    entrada 0 no bit mais significativo. Saídas que não podem ser calculadas
+    valem None.
+    """
+    planos = obter_planos(compilado)
+    base = compilado.num_entradas
+    avaliadas = set(range(base))
+
+    linhas = [
+        f"# Avaliador gerado para o circuito {compilado.nome!r}",
+        f"ENTRADAS = {tuple(compilado.nomes_entradas)!r}",
+        f"SAIDAS = {tuple(compilado.nomes_saidas)!r}",
+        "",
+        "",
+        "def avaliar(palavras, m):",
+    ]
+    if base:
+        linhas.append(f"    {_tupla([_net(i) for i in range(base)])} = palavras")
+    for g in portas_necessarias(compilado):
+        operandos = [_net(net) for net in compilado.pinos_portas[g]]
+        modelo = _modelo(compilado.tabelas[g], planos[g])
+        linhas.append(f"    {_net(base + g)} = {modelo.format(*operandos)}")
+        avaliadas.add(base + g)
+
+    saidas = [_net(net) if net in avaliadas else "None" for net in compilado.drivers_saidas]
+    linhas.append(f"    return ({_tupla(saidas)})")
+    linhas += [
+        "",
+        "",
+        "def avaliar_vetor(entradas):",
+        "    if isinstance(entradas, int):",
+        f"        entradas = [(entradas >> ({base - 1} - i)) & 1 for i in range({base})]",
+        "    return avaliar(entradas, 1)",
+        "",
+    ]
+    return "\n".join(linhas)
+
+
+def obter_codigo(compilado):
+    """Retorna (e guarda no compilado) o código fonte do avaliador"""
+    codigo = getattr(compilado, 'codigo', None)
+    if codigo is None:
+        codigo = gerar_codigo(compilado)
+        compilado.codigo = codigo
+    return codigo
+
+
+def _carregar_bytecode(caminho):
+    try:
+        with open(caminho, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _salvar_bytecode(caminho, bytecode):
+    import tempfile  # Só necessário ao gravar
+    diretorio = os.path.dirname(caminho)
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(bytecode, f)
+        os.replace(temporario, caminho)
+    except OSError:
+        pass  # Sem cache em disco: o avaliador só é recompilado na próxima execução
+
+
+def carregar_modulo(codigo, usar_cache=True):
+    """Compila (ou carrega do cache) o código gerado; retorna o namespace do módulo"""
+    chave = hashlib.sha256(codigo.encode("utf-8")).hexdigest()
+    modulo = _AVALIADORES.get(chave)
+    if modulo is not None:
+        _AVALIADORES.move_to_end(chave)
+        return modulo
+
+    bytecode = None
+    caminho = None
+    if usar_cache:
+        from .cache import cache_ativo, diretorio_cache, EXTENSAO_AVALIADOR
+        usar_cache = cache_ativo()
+    if usar_cache:
+        versao = "".join(map(str, sys.version_info[:2]))
+        caminho = os.path.join(diretorio_cache(), f"{chave}-py{versao}{EXTENSAO_AVALIADOR}")
+        bytecode = _carregar_bytecode(caminho)
+    if bytecode is None:
+        bytecode = compile(codigo, "<circuito gerado>", "exec")
+        if caminho is not None:
+            _salvar_bytecode(caminho, bytecode)
+
+    modulo = {"__name__": "circuito_gerado"}
+    exec(bytecode, modulo)
+    _AVALIADORES[chave] = modulo
+    if len(_AVALIADORES) > LIMITE_AVALIADORES:
+        _AVALIADORES.popitem(last=False)
+    return modulo
+
+
+def descartar_avaliador(compilado):
+    """Libera os módulos gerados do compilado e do seu netlist otimizado, se carregados"""
+    otimizado = getattr(compilado, 'otimizado', None)
+    for netlist in (compilado, otimizado[0] if otimizado else None):
+        codigo = getattr(netlist, 'codigo', None)
+        if codigo is not None:
+            _AVALIADORES.pop(hashlib.sha256(codigo.encode("utf-8")).hexdigest(), None)
+
+
+def obter_avaliador(compilado, usar_cache=True):
+    """Retorna a função avaliar(palavras, m) gerada para o circuito"""
+    return carregar_modulo(obter_codigo(compilado), usar_cache)["avaliar"]
+
+
+def escrever_modulo(compilado, arquivo):
+    """Grava o avaliador gerado como um módulo Python independente"""
+    with open(arquivo, "w", encoding="utf-8") as f:
+        f.write(obter_codigo(compilado))
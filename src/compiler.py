@@ -0,0 +1,342 @@
+# =======================
+# COMPILAÇÃO DO NETLIST
+# =======================
+
+from collections import deque
+from .models import circuito
+from .primitivas import (TabelaCubos, PRIMITIVAS, PRIMITIVAS_UM_PINO, LARGURA_DENSA,
+                         tabela_primitiva)
+
+# Tabelas verdade já compiladas: (entradas, saídas, linhas) -> (tabela, lookup);
+# primitivas usam a chave (tipo, entradas)
+_TABELAS_INTERNADAS = {}
+_LOOKUPS_INTERNADOS = {}
+LIMITE_TABELAS_INTERNADAS = 65536
+LIMITE_BYTES_INTERNADOS = 64 << 20  # Soma dos lookups densos internados
+_bytes_internados = 0
+
+
+class CircuitoCompilado:
+    """Netlist com pinos resolvidos para índices inteiros e ordem de avaliação
+
+    Cada sinal do circuito é uma net numerada: as entradas ocupam os índices
+    0..E-1 e a saída da porta g ocupa o índice E + g.
+    """
+    def __init__(self, nome):
+        self.nome = nome
+        self.nomes_entradas = []
+        self.nomes_portas = []
+        self.nomes_saidas = []
+        self.indice_nets = {}       # nome do componente -> net da sua saída
+        self.pinos_portas = []      # porta -> (net ligada a cada pino) (-1 = sem driver)
+        self.tabelas = []           # porta -> lookup denso (ver compilar_tabela)
+        self.drivers_saidas = []    # saída do circuito -> net (-1 = desconectada)
+        self.fanout = []            # net -> ((porta, pino), ...)
+        self.fanout_saidas = []     # net -> (saída do circuito, ...)
+        self.niveis = []            # porta -> nível (entradas estão no nível 0)
+        self.ordem = []             # portas ordenadas por nível
+        self.nao_ordenadas = []     # portas em ciclo ou com pinos sem driver
+        self.erros = []             # erros de validação encontrados na compilação
+
+    @property
+    def num_entradas(self):
+        return len(self.nomes_entradas)
+
+    @property
+    def num_nets(self):
+        return len(self.nomes_entradas) + len(self.nomes_portas)
+
+    def __str__(self):
+        return (f"CircuitoCompilado {self.nome} - {self.num_entradas} entradas, "
+                f"{len(self.nomes_portas)} portas, {len(self.nomes_saidas)} saídas")
+
+
+def _linha(bits):
+    """Bits de uma linha da tabela como lista, com None (curinga) escrito como x"""
+    return "[" + ", ".join("x" if bit is None else str(bit) for bit in bits) + "]"
+
+
+def _expandir_curingas(entrada):
+    """Índices de todas as combinações cobertas por uma linha com curingas"""
+    indices = [0]
+    for bit in entrada:
+        if bit is None:
+            indices = [(indice << 1) | b for indice in indices for b in (0, 1)]
+        else:
+            indices = [(indice << 1) | bit for indice in indices]
+    return indices
+
+
+def _cubo(entrada):
+    """Cubo (mascara, valor) de uma linha com curingas (ver primitivas.TabelaCubos)"""
+    mascara = valor = 0
+    for bit in entrada:
+        mascara = (mascara << 1) | (bit is not None)
+        valor = (valor << 1) | (bit or 0)
+    return mascara, valor
+
+
+def _tabela_de_cubos(nome, num_entradas, linhas, erros):
+    """TabelaCubos com as linhas de saída 1; linhas 0 e 1 que se cruzam são erros"""
+    uns = [(_cubo(entrada), entrada) for entrada, saida in linhas if saida[0]]
+    zeros = [(_cubo(entrada), entrada) for entrada, saida in linhas if not saida[0]]
+    for (mascara_um, valor_um), entrada_um in uns:
+        for (mascara_zero, valor_zero), entrada_zero in zeros:
+            comum = mascara_um & mascara_zero
+            if valor_um & comum == valor_zero & comum:
+                erros.append(f"Porta '{nome}': linhas conflitantes {_linha(entrada_um)} -> 1 e "
+                             f"{_linha(entrada_zero)} -> 0")
+    return TabelaCubos(num_entradas, cubos=dict.fromkeys(cubo for cubo, _ in uns))
+
+
+def compilar_tabela(nome, num_entradas, num_saidas, tabela):
+    """Compila uma tabela verdade em um vetor denso indexado pelos bits de entrada
+
+    O índice de uma linha é o número binário formado pelas entradas, com
+    entrada0 como bit mais significativo; o vetor guarda o primeiro bit de
+    saída. Retorna (lookup, erros, avisos): linhas com largura errada, bits
+    inválidos ou saídas conflitantes são erros; linhas repetidas e
+    combinações ausentes (que valem 0) são avisos. Entradas None (x no
+    código fonte) valem para 0 e para 1. Tabelas com mais de LARGURA_DENSA
+    entradas que usam curingas ou não listam todas as combinações viram uma
+    TabelaCubos em vez do vetor denso (sem o aviso de combinações ausentes).
+    """
+    erros = []
+    avisos = []
+    saidas = {}
+    curingas = []
+
+    for entrada, saida in tabela:
+        if len(entrada) != num_entradas or len(saida) != num_saidas:
+            erros.append(f"Porta '{nome}': linha {_linha(entrada)} -> {_linha(saida)} deveria ter "
+                         f"{num_entradas} entradas e {num_saidas} saídas")
+            continue
+        if any(bit not in (0, 1, None) for bit in entrada) or any(bit not in (0, 1) for bit in saida):
+            erros.append(f"Porta '{nome}': linha {_linha(entrada)} -> {_linha(saida)} contém valores "
+                         f"diferentes de 0 e 1 (x só vale nas entradas)")
+            continue
+        if None in entrada:
+            curingas.append((entrada, saida))
+            continue
+
+        indice = 0
+        for bit in entrada:
+            indice = (indice << 1) | bit
+
+        if indice in saidas:
+            if saidas[indice] != saida:
+                erros.append(f"Porta '{nome}': linhas conflitantes para a entrada {entrada}: "
+                             f"{saidas[indice]} e {saida}")
+            else:
+                avisos.append(f"Porta '{nome}': linha repetida para a entrada {entrada}")
+            continue
+        saidas[indice] = saida
+
+    if num_entradas > LARGURA_DENSA and (curingas or len(saidas) < 1 << num_entradas):
+        # Porta larga descrita por poucas linhas: o vetor denso teria 2^n posições
+        linhas = [(list(map(int, format(indice, f"0{num_entradas}b"))), saida)
+                  for indice, saida in saidas.items()]
+        return _tabela_de_cubos(nome, num_entradas, linhas + curingas, erros), erros, avisos
+
+    for entrada, saida in curingas:
+        for indice in _expandir_curingas(entrada):
+            if saidas.setdefault(indice, saida) != saida:
+                erros.append(f"Porta '{nome}': linhas conflitantes para a entrada "
+                             f"{format(indice, f'0{num_entradas}b')}: {saidas[indice]} e {saida} "
+                             f"(linha {_linha(entrada)})")
+                break
+
+    ausentes = 2 ** num_entradas - len(saidas)
+    if ausentes > 0 and not erros:
+        avisos.append(f"Porta '{nome}': {ausentes} combinações de entrada ausentes na tabela (assumidas como 0)")
+
+    lookup = bytes(saidas[i][0] if i in saidas and saidas[i] else 0 for i in range(2 ** num_entradas))
+    return lookup, erros, avisos
+
+
+def compilar_primitiva(nome, tipo, num_entradas, num_saidas):
+    """Compila uma porta primitiva (AND, OR, ..., ver primitivas.py) declarada sem tabela
+
+    num_entradas None (não informado) só é aceito para NOT e BUF. Retorna
+    (lookup, erros), com lookups compartilhados entre portas iguais.
+    """
+    tipo = tipo.upper()
+    if num_entradas is None:
+        if tipo not in PRIMITIVAS_UM_PINO:
+            return None, [f"Porta '{nome}': a primitiva {tipo} precisa de numero_de_entradas"]
+        num_entradas = 1
+    erros = []
+    if tipo in PRIMITIVAS_UM_PINO and num_entradas != 1:
+        erros.append(f"Porta '{nome}': a primitiva {tipo} tem uma entrada, não {num_entradas}")
+    elif num_entradas < 1:
+        erros.append(f"Porta '{nome}': a primitiva {tipo} precisa de ao menos uma entrada")
+    if num_saidas not in (None, 1):
+        erros.append(f"Porta '{nome}': a primitiva {tipo} tem uma saída, não {num_saidas}")
+    if erros:
+        return None, erros
+
+    chave = (tipo, num_entradas)
+    internada = _TABELAS_INTERNADAS.get(chave)
+    if internada is None:
+        return _internar(chave, (), tabela_primitiva(tipo, num_entradas)), []
+    return internada[1], []
+
+
+def _internar(chave, tabela, lookup):
+    """Guarda (tabela, lookup) sob a chave; esvazia as tabelas internadas ao passar dos limites"""
+    global _bytes_internados
+    if len(_TABELAS_INTERNADAS) >= LIMITE_TABELAS_INTERNADAS or _bytes_internados >= LIMITE_BYTES_INTERNADOS:
+        # Num processo de longa duração (o servidor) a memória não cresce sem limite
+        _TABELAS_INTERNADAS.clear()
+        _LOOKUPS_INTERNADOS.clear()
+        _bytes_internados = 0
+    if lookup not in _LOOKUPS_INTERNADOS:
+        _LOOKUPS_INTERNADOS[lookup] = lookup
+        _bytes_internados += len(lookup) if isinstance(lookup, bytes) else len(lookup.cubos)
+    lookup = _LOOKUPS_INTERNADOS[lookup]
+    _TABELAS_INTERNADAS[chave] = (tabela, lookup)
+    return lookup
+
+
+def internar_tabela(nome, num_entradas, num_saidas, tabela):
+    """Compila uma tabela verdade compartilhando o resultado entre portas iguais
+
+    Retorna (tabela, lookup, erros, avisos) como compilar_tabela, mas a
+    tabela devolvida é uma tupla imutável de linhas e, para tabelas válidas,
+    portas com as mesmas linhas recebem os mesmos objetos tabela e lookup,
+    compilados uma única vez.
+    """
+    chave = (num_entradas, num_saidas, tuple((tuple(entrada), tuple(saida)) for entrada, saida in tabela))
+    internada = _TABELAS_INTERNADAS.get(chave)
+    if internada is not None:
+        return internada[0], internada[1], [], []
+
+    lookup, erros, avisos = compilar_tabela(nome, num_entradas, num_saidas, tabela)
+    if erros or avisos:
+        # Mensagens citam a porta: tabelas com problemas não são compartilhadas
+        return chave[2], lookup, erros, avisos
+
+    return chave[2], _internar(chave, chave[2], lookup), erros, avisos
+
+
+def _resolver_conexoes(compilado, circ):
+    """Converte as conexões "componente.pino" em índices de net e de pino"""
+    indice_portas = {nome: g for g, nome in enumerate(compilado.nomes_portas)}
+    indice_saidas = {nome: s for s, nome in enumerate(compilado.nomes_saidas)}
+
+    for conexao in circ.conexoes:
+        origem_componente, origem_pino = conexao.origem.split('.')
+        destino_componente, destino_pino = conexao.destino.split('.')
+
+        net = compilado.indice_nets.get(origem_componente)
+        if origem_pino != 'saida' or net is None:
+            continue
+
+        if destino_componente in indice_portas:
+            indice = destino_pino[len('entrada'):]
+            if destino_pino.startswith('entrada') and indice.isdigit():
+                pinos = compilado.pinos_portas[indice_portas[destino_componente]]
+                if int(indice) < len(pinos):
+                    pinos[int(indice)] = net
+        elif destino_componente in indice_saidas:
+            compilado.drivers_saidas[indice_saidas[destino_componente]] = net
+
+
+def _construir_fanout(compilado):
+    """Monta o índice de fan-out: para cada net, os pinos que ela alimenta"""
+    compilado.fanout = [[] for _ in range(compilado.num_nets)]
+    compilado.fanout_saidas = [[] for _ in range(compilado.num_nets)]
+
+    for g, pinos in enumerate(compilado.pinos_portas):
+        for pino, net in enumerate(pinos):
+            if net >= 0:
+                compilado.fanout[net].append((g, pino))
+
+    for s, net in enumerate(compilado.drivers_saidas):
+        if net >= 0:
+            compilado.fanout_saidas[net].append(s)
+
+
+def _levelizar(compilado):
+    """Ordena as portas por nível usando o algoritmo de Kahn"""
+    num_entradas = compilado.num_entradas
+    num_portas = len(compilado.nomes_portas)
+    niveis = [1] * num_portas
+    pendentes = [0] * num_portas
+
+    for g, pinos in enumerate(compilado.pinos_portas):
+        if -1 in pinos:
+            pendentes[g] = -1  # Nunca fica pronta: há pino sem driver
+        else:
+            pendentes[g] = sum(1 for net in pinos if net >= num_entradas)
+
+    fila = deque(g for g in range(num_portas) if pendentes[g] == 0)
+    ordem = []
+    while fila:
+        g = fila.popleft()
+        ordem.append(g)
+        for destino, _ in compilado.fanout[num_entradas + g]:
+            if niveis[g] + 1 > niveis[destino]:
+                niveis[destino] = niveis[g] + 1
+            if pendentes[destino] > 0:
+                pendentes[destino] -= 1
+                if pendentes[destino] == 0:
+                    fila.append(destino)
+
+    ordenadas = set(ordem)
+    ordem.sort(key=niveis.__getitem__)
+    compilado.niveis = niveis
+    compilado.ordem = ordem
+    compilado.nao_ordenadas = [g for g in range(num_portas) if g not in ordenadas]
+
+
+def _compactar(compilado):
+    """Congela as listas por porta e por net em tuplas (nets sem carga usam a tupla vazia)"""
+    compilado.pinos_portas = [tuple(pinos) for pinos in compilado.pinos_portas]
+    compilado.fanout = [tuple(destinos) for destinos in compilado.fanout]
+    compilado.fanout_saidas = [tuple(saidas) for saidas in compilado.fanout_saidas]
+
+
+def portas_necessarias(compilado):
+    """Portas ordenadas que alcançam alguma saída, na ordem de avaliação"""
+    base = compilado.num_entradas
+    necessarias = [False] * len(compilado.nomes_portas)
+    pilha = [net - base for net in compilado.drivers_saidas if net >= base]
+    while pilha:
+        g = pilha.pop()
+        if not necessarias[g]:
+            necessarias[g] = True
+            pilha.extend(net - base for net in compilado.pinos_portas[g] if net >= base)
+    return [g for g in compilado.ordem if necessarias[g]]
+
+
+def compilar_circuito(circ=None):
+    """Compila o circuito analisado em um netlist indexado e levelizado"""
+    if circ is None:
+        circ = circuito
+    compilado = CircuitoCompilado(circ.nome)
+    compilado.nomes_entradas = list(circ.entradas)
+    compilado.nomes_portas = list(circ.portas)
+    compilado.nomes_saidas = list(circ.saidas)
+
+    for i, nome in enumerate(compilado.nomes_entradas):
+        compilado.indice_nets[nome] = i
+    for g, nome in enumerate(compilado.nomes_portas):
+        compilado.indice_nets[nome] = compilado.num_entradas + g
+
+    for nome in compilado.nomes_portas:
+        porta = circ.portas[nome]
+        if porta.lookup is None:
+            if not porta.tabela and porta.tipo.upper() in PRIMITIVAS:
+                porta.lookup = compilar_primitiva(nome, porta.tipo, porta.entradas, porta.saidas)[0]
+            else:
+                porta.lookup = compilar_tabela(nome, porta.entradas, porta.saidas, porta.tabela)[0]
+        compilado.tabelas.append(porta.lookup)
+        compilado.pinos_portas.append([-1] * porta.entradas)
+    compilado.drivers_saidas = [-1] * len(compilado.nomes_saidas)
+
+    _resolver_conexoes(compilado, circ)
+    _construir_fanout(compilado)
+    _levelizar(compilado)
+    _compactar(compilado)
+    return compilado
@@ -0,0 +1,189 @@
+# =======================
+# VERIFICAÇÃO DE EQUIVALÊNCIA
+# =======================
+#
+# Constrói, em um único GerenciadorBDD, as funções das saídas de dois
+# circuitos compilados sobre as mesmas variáveis (as entradas, casadas pelo
+# nome) e compara nó a nó: com a tabela única, duas saídas são equivalentes
+# exatamente quando resultam no mesmo nó. Nenhuma tabela verdade é gerada,
+# então circuitos com dezenas de entradas são comparados sem enumerar 2^n
+# linhas. Quando uma saída difere, o XOR das duas funções fornece um
+# contraexemplo.
+#
+# Antes dos BDDs, VETORES_ALEATORIOS vetores aleatórios são simulados nos dois
+# circuitos: diferenças comuns aparecem ali, e o contraexemplo continua
+# disponível mesmo se os BDDs ficarem grandes demais.
+
+import random
+import sys
+from .bdd import GerenciadorBDD, LimiteBDDExcedido, LIMITE_NOS
+from .bitparalelo import obter_planos, avaliar_palavras
+from .compiler import portas_necessarias
+from .estatisticas import cronometrado
+from .simulator import avaliar_compilado
+
+VETORES_ALEATORIOS = 1024
+
+
+def ordem_das_variaveis(compilado):
+    """Entradas na ordem em que uma busca em profundidade a partir das saídas as encontra
+
+    As saídas mais profundas são visitadas primeiro. Entradas que alimentam a
+    mesma parte do circuito ficam próximas na ordem do BDD (por exemplo, os
+    bits Ai e Bi de um somador, do mais significativo para o menos), o que
+    mantém os diagramas pequenos.
+    """
+    base = compilado.num_entradas
+
+    def nivel(net):
+        return compilado.niveis[net - base] if net >= base else 0
+
+    vistos = set()
+    ordem = []
+    for net in sorted(compilado.drivers_saidas, key=nivel, reverse=True):
+        pilha = [net] if net >= 0 else []
+        while pilha:
+            net = pilha.pop()
+            if net in vistos:
+                continue
+            vistos.add(net)
+            if net < base:
+                ordem.append(compilado.nomes_entradas[net])
+            else:
+                pilha.extend(reversed(compilado.pinos_portas[net - base]))
+    ordem.extend(nome for net, nome in enumerate(compilado.nomes_entradas) if net not in vistos)
+    return ordem
+
+
+def funcoes_bdd(gerenciador, compilado, variaveis):
+    """BDD de cada saída do compilado (None para saídas que não podem ser calculadas)
+
+    variaveis mapeia o nome de cada entrada para o índice da sua variável.
+    """
+    planos = obter_planos(compilado)
+    base = compilado.num_entradas
+    valores = [gerenciador.variavel(variaveis[nome]) for nome in compilado.nomes_entradas]
+    valores += [None] * len(compilado.nomes_portas)
+    for g in portas_necessarias(compilado):
+        operandos = [valores[net] for net in compilado.pinos_portas[g]]
+        valores[base + g] = gerenciador.aplicar_plano(planos[g], operandos)
+    return [valores[net] if net >= 0 else None for net in compilado.drivers_saidas]
+
+
+def _palavras_saidas(compilado, palavras, mascara):
+    valores = avaliar_palavras(compilado, [palavras[nome] for nome in compilado.nomes_entradas], mascara)
+    return {nome: valores[net] if net >= 0 else None
+            for nome, net in zip(compilado.nomes_saidas, compilado.drivers_saidas)}
+
+
+def simular_diferenca(compilado_a, compilado_b, vetores=VETORES_ALEATORIOS, semente=0):
+    """Procura, com vetores aleatórios, uma entrada em que as saídas dos circuitos diferem
+
+    Retorna (vetor, saídas diferentes) ou None se nenhuma diferença foi encontrada.
+    """
+    rng = random.Random(semente)
+    mascara = (1 << vetores) - 1
+    palavras = {nome: rng.getrandbits(vetores) for nome in compilado_a.nomes_entradas}
+    saidas_a = _palavras_saidas(compilado_a, palavras, mascara)
+    saidas_b = _palavras_saidas(compilado_b, palavras, mascara)
+    diferencas = {nome: saidas_a[nome] ^ saidas_b[nome] for nome in saidas_a
+                  if saidas_a[nome] is not None and saidas_b.get(nome) is not None}
+    diferencas = {nome: x for nome, x in diferencas.items() if x}
+    if not diferencas:
+        return None
+    primeira = min((x & -x).bit_length() - 1 for x in diferencas.values())
+    vetor = {nome: (palavras[nome] >> primeira) & 1 for nome in compilado_a.nomes_entradas}
+    return vetor, [nome for nome, x in diferencas.items() if (x >> primeira) & 1]
+
+
+@cronometrado("equivalencia")
+def verificar_equivalencia(compilado_a, compilado_b, limite_nos=LIMITE_NOS):
+    """Compara as saídas de dois circuitos compilados; retorna um dict com o resultado
+
+    Chaves: equivalentes (bool), erros (lista de mensagens), saidas
+    (nome -> True/False para as saídas presentes nos dois circuitos),
+    contraexemplo (nome da entrada -> bit, ou None), valores_a/valores_b
+    (saídas de cada circuito no contraexemplo) e nos (tamanho do BDD).
+    Pode lançar LimiteBDDExcedido se os diagramas ficarem grandes demais.
+    """
+    resultado = {"equivalentes": False, "erros": [], "saidas": {}, "contraexemplo": None,
+                 "valores_a": None, "valores_b": None, "nos": 0}
+    erros = resultado["erros"]
+    for rotulo, compilado in (("A", compilado_a), ("B", compilado_b)):
+        erros.extend(f"Circuito {rotulo}: {erro}" for erro in compilado.erros)
+    entradas_iguais = sorted(compilado_a.nomes_entradas) == sorted(compilado_b.nomes_entradas)
+    if not entradas_iguais:
+        so_a = sorted(set(compilado_a.nomes_entradas) - set(compilado_b.nomes_entradas))
+        so_b = sorted(set(compilado_b.nomes_entradas) - set(compilado_a.nomes_entradas))
+        erros.append(f"Entradas diferentes: só em A {so_a}, só em B {so_b}")
+    for nome in compilado_a.nomes_saidas:
+        if nome not in compilado_b.nomes_saidas:
+            erros.append(f"Saída '{nome}' só existe no circuito A")
+    for nome in compilado_b.nomes_saidas:
+        if nome not in compilado_a.nomes_saidas:
+            erros.append(f"Saída '{nome}' só existe no circuito B")
+    if compilado_a.erros or compilado_b.erros or not entradas_iguais:
+        return resultado
+
+    aleatoria = simular_diferenca(compilado_a, compilado_b)
+    ordem = ordem_das_variaveis(compilado_a)
+    variaveis = {nome: i for i, nome in enumerate(ordem)}
+    # ite desce uma variável por chamada recursiva; o limite volta ao anterior no final
+    limite_anterior = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limite_anterior, 2 * len(ordem) + 1000))
+    try:
+        return _comparar_bdds(resultado, compilado_a, compilado_b, aleatoria, variaveis, limite_nos)
+    finally:
+        sys.setrecursionlimit(limite_anterior)
+
+
+def _comparar_bdds(resultado, compilado_a, compilado_b, aleatoria, variaveis, limite_nos):
+    """Preenche o resultado comparando os BDDs das saídas dos dois circuitos"""
+    erros = resultado["erros"]
+    if aleatoria is not None:
+        limite_nos //= 10  # O resultado já é conhecido; os BDDs só classificam as demais saídas
+    gerenciador = GerenciadorBDD(len(variaveis), limite_nos)
+    try:
+        funcoes_a = dict(zip(compilado_a.nomes_saidas, funcoes_bdd(gerenciador, compilado_a, variaveis)))
+        funcoes_b = dict(zip(compilado_b.nomes_saidas, funcoes_bdd(gerenciador, compilado_b, variaveis)))
+    except LimiteBDDExcedido:
+        if aleatoria is None:
+            raise
+        # Não é possível comparar todas as saídas, mas a diferença já é conhecida
+        vetor, diferentes = aleatoria
+        resultado["saidas"] = {nome: False for nome in diferentes}
+        _registrar_contraexemplo(resultado, compilado_a, compilado_b, vetor)
+        resultado["nos"] = gerenciador.num_nos
+        return resultado
+
+    diferenca = None
+    for nome, f in funcoes_a.items():
+        if nome not in funcoes_b:
+            continue
+        g = funcoes_b[nome]
+        if f is None or g is None:
+            erros.append(f"Saída '{nome}' não pode ser calculada em "
+                         f"{'A' if f is None else 'B'} (ciclo ou pino sem driver)")
+            resultado["saidas"][nome] = False
+            continue
+        resultado["saidas"][nome] = f == g
+        if f != g and diferenca is None:
+            diferenca = gerenciador.xor(f, g)
+    resultado["nos"] = gerenciador.num_nos
+
+    if diferenca is not None:
+        atribuicao = gerenciador.exemplo(diferenca)
+        vetor = {nome: atribuicao.get(variaveis[nome], 0) for nome in compilado_a.nomes_entradas}
+        _registrar_contraexemplo(resultado, compilado_a, compilado_b, vetor)
+
+    resultado["equivalentes"] = not erros and all(resultado["saidas"].values())
+    return resultado
+
+
+def _registrar_contraexemplo(resultado, compilado_a, compilado_b, vetor):
+    """Guarda o vetor e as saídas de cada circuito para ele"""
+    resultado["contraexemplo"] = vetor
+    for rotulo, compilado in (("valores_a", compilado_a), ("valores_b", compilado_b)):
+        valores = avaliar_compilado(compilado, [vetor[nome] for nome in compilado.nomes_entradas])
+        resultado[rotulo] = {nome: valores[net] if net >= 0 else None
+                             for nome, net in zip(compilado.nomes_saidas, compilado.drivers_saidas)}
@@ -0,0 +1,166 @@
+# =======================
+# INSTRUMENTAÇÃO: TEMPOS POR FASE E CONTADORES
+# =======================
+#
+# O objeto global `estatisticas` acumula o tempo de cada fase (análise
+# léxica, análise sintática, validação, compilação, simulação, relatórios...)
+# e contadores de trabalho da simulação. Desligado (o padrão), cada ponto
+# instrumentado custa apenas um teste de `estatisticas.ativa` por chamada;
+# os laços internos contam em variáveis locais e somam uma vez ao final.
+# Os tempos são exclusivos: uma fase chamada dentro de outra (a compilação
+# dentro da simulação, por exemplo) não é contada também na externa.
+#
+# Uso programático:
+#     with coletar_estatisticas() as estatisticas:
+#         simular_circuito(verbose=False)
+#     estatisticas.como_dict()  # {"tempos_s": {...}, "contadores": {...}}
+
+import contextlib
+import functools
+import time
+
+# Contadores conhecidos, na ordem em que aparecem no relatório
+DESCRICOES = {
+    "simulacoes": "simulações completas (simular_circuito)",
+    "passadas_netlist": "passadas pelo netlist (avaliar_compilado)",
+    "avaliacoes_portas": "avaliações de porta",
+    "consultas_tabela": "consultas à tabela (avaliar_porta)",
+    "propagacoes": "propagações de sinal (propagar_sinal)",
+    "conexoes_percorridas": "conexões de fan-out percorridas",
+    "reavaliacoes_incrementais": "portas re-avaliadas (definir_entrada)",
+    "blocos_bitparalelos": "blocos bit-paralelos avaliados",
+    "vetores_bitparalelos": "vetores avaliados em paralelo",
+    "vetores_ternarios": "vetores simulados com três valores (0/1/X)",
+    "falhas_simuladas": "falhas simuladas (por bloco de vetores)",
+}
+
+
+class Estatisticas:
+    """Tempos acumulados por fase e contadores de uma execução"""
+
+    def __init__(self):
+        self.ativa = False
+        self.tempos = {}      # fase -> segundos acumulados
+        self.chamadas = {}    # fase -> número de vezes que a fase foi executada
+        self.contadores = {}  # nome -> total
+        self.perfil = None    # cProfile.Profile, se ativado com perfil=True
+        self._pilha = []      # fases em execução: [nome, início do trecho atual]
+
+    def ativar(self, perfil=False):
+        """Zera os valores e começa a coletar (perfil=True liga também o cProfile)"""
+        self.tempos = {}
+        self.chamadas = {}
+        self.contadores = {}
+        self.perfil = None
+        self._pilha = []
+        self.ativa = True
+        if perfil:
+            import cProfile
+            self.perfil = cProfile.Profile()
+            self.perfil.enable()
+
+    def desativar(self):
+        """Para de coletar, mantendo os valores já acumulados"""
+        self.ativa = False
+        if self.perfil is not None:
+            self.perfil.disable()
+
+    def fase(self, nome):
+        """Context manager que soma ao tempo da fase o tempo do bloco"""
+        if not self.ativa:
+            return contextlib.nullcontext()
+        return self._cronometrar(nome)
+
+    @contextlib.contextmanager
+    def _cronometrar(self, nome):
+        # Tempo exclusivo: enquanto uma fase aninhada executa, a externa fica pausada
+        agora = time.perf_counter()
+        if self._pilha:
+            externa = self._pilha[-1]
+            self.tempos[externa[0]] = self.tempos.get(externa[0], 0.0) + agora - externa[1]
+        self._pilha.append([nome, agora])
+        try:
+            yield
+        finally:
+            agora = time.perf_counter()
+            _, inicio = self._pilha.pop()
+            self.adicionar_tempo(nome, agora - inicio)
+            if self._pilha:
+                self._pilha[-1][1] = agora
+
+    def adicionar_tempo(self, nome, segundos, chamadas=1):
+        self.tempos[nome] = self.tempos.get(nome, 0.0) + segundos
+        self.chamadas[nome] = self.chamadas.get(nome, 0) + chamadas
+
+    def transferir_tempo(self, origem, destino, segundos):
+        """Move segundos já contados na fase origem para a fase destino"""
+        self.tempos[origem] = self.tempos.get(origem, 0.0) - segundos
+        self.adicionar_tempo(destino, segundos, chamadas=0)
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def como_dict(self):
+        """Valores coletados em estruturas simples (serializáveis em JSON)"""
+        return {"tempos_s": dict(self.tempos), "chamadas": dict(self.chamadas),
+                "contadores": dict(self.contadores)}
+
+    def formatar(self, linhas_perfil=20):
+        """Relatório textual dos tempos, dos contadores e, se houver, do perfil"""
+        linhas = ["=== ESTATÍSTICAS ===", "Tempo por fase:"]
+        total = sum(self.tempos.values())
+        for fase, segundos in self.tempos.items():
+            fracao = segundos / total if total else 0
+            linhas.append(f"  {fase:<22} {segundos * 1000:>10.2f} ms {fracao:>6.1%}  "
+                          f"({self.chamadas[fase]}x)")
+        if not self.tempos:
+            linhas.append("  (nenhuma fase executada)")
+
+        linhas.append("Contadores:")
+        nomes = [nome for nome in DESCRICOES if nome in self.contadores]
+        nomes += sorted(nome for nome in self.contadores if nome not in DESCRICOES)
+        for nome in nomes:
+            linhas.append(f"  {self.contadores[nome]:>12}  {DESCRICOES.get(nome, nome)}")
+        if not nomes:
+            linhas.append("  (nenhum)")
+
+        if self.perfil is not None:
+            import io
+            import pstats
+            saida = io.StringIO()
+            pstats.Stats(self.perfil, stream=saida).sort_stats("cumulative").print_stats(linhas_perfil)
+            linhas.append(f"Perfil (cProfile, {linhas_perfil} funções de maior tempo acumulado):")
+            linhas.append(saida.getvalue().rstrip())
+        return "\n".join(linhas)
+
+    def salvar_perfil(self, arquivo):
+        """Grava o perfil do cProfile (legível com pstats ou snakeviz)"""
+        if self.perfil is not None:
+            self.perfil.dump_stats(arquivo)
+
+
+# Instância global usada pelos pontos instrumentados
+estatisticas = Estatisticas()
+
+
+def cronometrado(nome):
+    """Decorador que soma o tempo de cada chamada da função à fase nome"""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not estatisticas.ativa:
+                return funcao(*args, **kwargs)
+            with estatisticas._cronometrar(nome):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+@contextlib.contextmanager
+def coletar_estatisticas(perfil=False):
+    """Ativa a coleta dentro do bloco e retorna o objeto com os valores"""
+    estatisticas.ativar(perfil)
+    try:
+        yield estatisticas
+    finally:
+        estatisticas.desativar()
@@ -0,0 +1,194 @@
+# =======================
+# SIMULAÇÃO EM LOTE (ESTÍMULOS)
+# =======================
+#
+# Pipeline de geradores: os vetores são lidos, simulados em blocos
+# bit-paralelos e escritos de volta sem nunca ficarem todos em memória.
+# Internamente cada vetor é uma string de '0'/'1'/'X', uma posição por sinal.
+# Blocos com algum X nas entradas são simulados com três valores
+# (ternario.py), e as saídas afetadas pelo X também saem como 'X'.
+#
+# Formatos aceitos (escolhidos pela extensão do arquivo):
+#   .csv        cabeçalho com os nomes dos sinais e uma linha por vetor
+#               ("A,B,C" / "0,1,x"); linhas vazias e iniciadas por '#' são
+#               ignoradas; x ou X é um valor desconhecido
+#   .bin, .vec  binário compacto: MAGIC, uint32 com o tamanho do cabeçalho,
+#               nomes separados por '\n' em UTF-8 e, em seguida, cada vetor
+#               em ceil(n/8) bytes (sinal 0 no bit mais significativo)
+#
+# Como saída também é aceito .vcd (formas de onda, ver exportadores.py).
+
+import itertools
+import struct
+from .codegen import obter_avaliador
+from .estatisticas import estatisticas
+
+MAGIC = b"CVEC"
+EXTENSOES_BINARIAS = (".bin", ".vec")
+TAMANHO_BLOCO = 4096
+
+
+def formato_binario(arquivo):
+    """Indica se o arquivo usa o formato binário compacto"""
+    return str(arquivo).lower().endswith(EXTENSOES_BINARIAS)
+
+
+def _ler_csv(arquivo):
+    nomes = None
+    with open(arquivo, "r", encoding="utf-8") as f:
+        for numero, linha in enumerate(f, start=1):
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+            campos = [campo.strip() for campo in linha.split(',')]
+            if nomes is None:
+                nomes = campos
+                yield nomes
+                continue
+            vetor = "".join(campos).replace('x', 'X')
+            if len(campos) != len(nomes) or vetor.strip('01X'):
+                raise ValueError(f"Linha {numero} do arquivo de estímulos: esperados {len(nomes)} valores 0/1/X")
+            yield vetor
+    if nomes is None:
+        raise ValueError("Arquivo de estímulos sem cabeçalho")
+
+
+def _ler_binario(arquivo):
+    with open(arquivo, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Arquivo de estímulos binário inválido")
+        (tamanho,) = struct.unpack("<I", f.read(4))
+        nomes = f.read(tamanho).decode("utf-8").split("\n")
+        yield nomes
+
+        n = len(nomes)
+        largura = (n + 7) // 8
+        formato = f"0{largura * 8}b"
+        while True:
+            dados = f.read(largura * TAMANHO_BLOCO)
+            if not dados:
+                break
+            if len(dados) % largura:
+                raise ValueError("Arquivo de estímulos binário truncado")
+            for i in range(0, len(dados), largura):
+                yield format(int.from_bytes(dados[i:i + largura], "big"), formato)[:n]
+
+
+def ler_estimulos(arquivo):
+    """Abre um arquivo de estímulos e retorna (nomes, gerador de vetores)"""
+    leitor = _ler_binario(arquivo) if formato_binario(arquivo) else _ler_csv(arquivo)
+    nomes = next(leitor)
+    return nomes, leitor
+
+
+def escrever_vetores(arquivo, nomes, vetores):
+    """Escreve vetores (strings de '0'/'1'/'X') no formato do arquivo; retorna a quantidade"""
+    quantidade = 0
+    if formato_binario(arquivo):
+        n = len(nomes)
+        largura = (n + 7) // 8
+        preenchimento = "0" * (largura * 8 - n)
+        with open(arquivo, "wb") as f:
+            cabecalho = "\n".join(nomes).encode("utf-8")
+            f.write(MAGIC + struct.pack("<I", len(cabecalho)) + cabecalho)
+            for vetor in vetores:
+                bits = vetor.replace("X", "0") + preenchimento
+                f.write(int(bits, 2).to_bytes(largura, "big") if largura else b"")
+                quantidade += 1
+    else:
+        with open(arquivo, "w", encoding="utf-8") as f:
+            f.write(",".join(nomes) + "\n")
+            for vetor in vetores:
+                f.write(",".join(vetor) + "\n")
+                quantidade += 1
+    return quantidade
+
+
+def agrupar_em_blocos(vetores, tamanho):
+    """Agrupa um fluxo de vetores em listas de até `tamanho` vetores"""
+    bloco = []
+    for vetor in vetores:
+        bloco.append(vetor)
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def simular_bloco(compilado, bloco, ordem=None):
+    """Simula um bloco de vetores de entrada de uma só vez; retorna os vetores de saída
+
+    ordem[i] é a coluna do vetor que alimenta a entrada i do compilado.
+    Saídas que não podem ser calculadas aparecem como 'X'.
+    """
+    quantidade = len(bloco)
+    mascara = (1 << quantidade) - 1
+    colunas = ["".join(coluna) for coluna in zip(*bloco)]
+    if ordem is None:
+        ordem = range(compilado.num_entradas)
+    if any("X" in colunas[c] for c in ordem):
+        from .ternario import simular_bloco_ternario
+        return simular_bloco_ternario(compilado, colunas, ordem, quantidade)
+    palavras = [int(colunas[c][::-1], 2) for c in ordem]
+
+    if estatisticas.ativa:
+        estatisticas.contar("blocos_bitparalelos")
+        estatisticas.contar("vetores_bitparalelos", quantidade)
+    formato = f"0{quantidade}b"
+    colunas_saida = []
+    for palavra in obter_avaliador(compilado)(palavras, mascara):
+        if palavra is None:
+            colunas_saida.append("X" * quantidade)
+        else:
+            colunas_saida.append(format(palavra, formato)[::-1])
+
+    if not colunas_saida:
+        return [""] * quantidade
+    return ["".join(vetor) for vetor in zip(*colunas_saida)]
+
+
+def simular_estimulos(compilado, nomes, vetores, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera os vetores de saída para um fluxo de vetores de entrada
+
+    nomes é a ordem dos sinais nos vetores de entrada e deve conter
+    exatamente as entradas do circuito.
+    """
+    ordem = ordem_das_entradas(compilado, nomes)
+    return (saida
+            for bloco in agrupar_em_blocos(vetores, tamanho_bloco)
+            for saida in simular_bloco(compilado, bloco, ordem))
+
+
+def ordem_das_entradas(compilado, nomes):
+    """Mapeia cada entrada do compilado para sua coluna nos vetores de estímulo"""
+    if compilado.erros:
+        raise ValueError("Circuito inválido: " + "; ".join(compilado.erros))
+    if sorted(nomes) != sorted(compilado.nomes_entradas):
+        raise ValueError(f"Os estímulos definem {nomes}, mas o circuito tem as entradas "
+                         f"{compilado.nomes_entradas}")
+
+    coluna = {nome: i for i, nome in enumerate(nomes)}
+    return [coluna[nome] for nome in compilado.nomes_entradas]
+
+
+def simular_arquivo_estimulos(compilado, arquivo_estimulos, arquivo_saida, jobs=1):
+    """Simula todos os vetores de um arquivo e grava as saídas; retorna a quantidade
+
+    Com jobs > 1 (ou None, para usar todos os núcleos) os blocos de vetores
+    são distribuídos entre processos.
+    """
+    nomes, vetores = ler_estimulos(arquivo_estimulos)
+    formas_de_onda = str(arquivo_saida).lower().endswith(".vcd")
+    if formas_de_onda:
+        # As entradas são lidas uma segunda vez, só à frente das saídas já calculadas
+        vetores, entradas = itertools.tee(vetores)
+    if jobs == 1:
+        saidas = simular_estimulos(compilado, nomes, vetores)
+    else:
+        from .paralelo import simular_estimulos_paralelo
+        saidas = simular_estimulos_paralelo(compilado, nomes, vetores, jobs)
+    if formas_de_onda:
+        from .exportadores import escrever_vcd
+        return escrever_vcd(arquivo_saida, compilado.nome, nomes, compilado.nomes_saidas, zip(entradas, saidas))
+    return escrever_vetores(arquivo_saida, compilado.nomes_saidas, saidas)
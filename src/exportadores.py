@@ -0,0 +1,208 @@
+# =======================
+# EXPORTAÇÃO PARA OUTRAS FERRAMENTAS
+# =======================
+#
+# Formatos legíveis por máquina, todos gravados em fluxo (nada do resultado
+# precisa caber em memória):
+#
+#   .json  netlist: entradas, saídas e uma porta por linha, com os pinos como
+#          índices de net e a tabela densa como string de '0'/'1' (portas
+#          largas, sem tabela densa, levam o nome da primitiva ou os cubos
+#          de saída 1 como strings de '0'/'1'/'x', um caractere por pino)
+#   .tvb   tabela verdade compactada por coluna: para cada saída, 2^n bits
+#          seguidos (bit r = linha r, LSB primeiro), legível com mmap
+#   .vcd   formas de onda (Value Change Dump) de uma simulação em lote, um
+#          vetor por unidade de tempo
+#
+# Layout do .tvb (inteiros little-endian):
+#   MAGIC_TVB, uint16 versão, uint32 entradas, uint32 saídas,
+#   uint32 tamanho dos nomes, nomes (entradas e saídas) separados por '\n',
+#   um byte por saída (1 = definida), preenchimento até múltiplo de 8 e, por
+#   fim, as colunas de ceil(2^n / 8) bytes de cada saída.
+
+import json
+import mmap
+import struct
+from .bitparalelo import tabela_verdade_exaustiva
+from .primitivas import TabelaCubos
+
+MAGIC_TVB = b"CTVB"
+VERSAO_TVB = 1
+_CABECALHO_TVB = struct.Struct("<4sHIII")
+
+
+# --- Netlist JSON ---
+
+def _funcao_json(lookup):
+    """Campo do JSON com a função da porta: tabela densa, primitiva ou cubos"""
+    if not isinstance(lookup, TabelaCubos):
+        return "tabela", "".join(map(str, lookup))
+    if lookup.base is not None:
+        return "primitiva", lookup.nome
+    n = lookup.entradas
+    return "cubos", ["".join("x" if not mascara >> (n - 1 - i) & 1 else str(valor >> (n - 1 - i) & 1)
+                             for i in range(n)) for mascara, valor in lookup.cubos]
+
+
+def exportar_json(circ, compilado, arquivo):
+    """Grava o netlist do circuito em JSON, uma porta por linha; retorna o número de portas
+
+    As nets são numeradas como no compilado: as entradas ocupam 0..E-1 e a
+    porta g ocupa E + g; pinos sem driver valem -1.
+    """
+    with open(arquivo, "w", encoding="utf-8") as f:
+        f.write('{"formato": "circuito-netlist", "versao": 1,\n')
+        f.write(f' "nome": {json.dumps(compilado.nome)},\n')
+        f.write(f' "entradas": {json.dumps(compilado.nomes_entradas, ensure_ascii=False)},\n')
+        saidas = [{"nome": nome, "net": net}
+                  for nome, net in zip(compilado.nomes_saidas, compilado.drivers_saidas)]
+        f.write(f' "saidas": {json.dumps(saidas, ensure_ascii=False)},\n')
+        f.write(' "portas": [')
+        for g, nome in enumerate(compilado.nomes_portas):
+            porta = {"nome": nome, "tipo": circ.portas[nome].tipo,
+                     "pinos": list(compilado.pinos_portas[g])}
+            campo, funcao = _funcao_json(compilado.tabelas[g])
+            porta[campo] = funcao
+            f.write(("\n  " if g == 0 else ",\n  ") + json.dumps(porta, ensure_ascii=False))
+        f.write("\n ]}\n")
+    return len(compilado.nomes_portas)
+
+
+# --- Tabela verdade compactada (.tvb) ---
+
+def _cabecalho_tvb(nomes_entradas, nomes_saidas, definidas):
+    nomes = "\n".join(list(nomes_entradas) + list(nomes_saidas)).encode("utf-8")
+    cabecalho = (_CABECALHO_TVB.pack(MAGIC_TVB, VERSAO_TVB, len(nomes_entradas), len(nomes_saidas), len(nomes))
+                 + nomes + bytes(definidas))
+    return cabecalho + b"\0" * (-len(cabecalho) % 8)
+
+
+def escrever_tabela_compactada(compilado, arquivo, blocos=None):
+    """Grava a tabela verdade no formato .tvb; retorna o número de linhas
+
+    blocos segue o formato de tabela_verdade_exaustiva (por padrão, calcula
+    os blocos aqui). Cada bloco é gravado na posição da sua linha em cada
+    coluna, então só um bloco fica em memória.
+    """
+    n = compilado.num_entradas
+    largura = ((1 << n) + 7) // 8
+    if blocos is None:
+        blocos = tabela_verdade_exaustiva(compilado)
+
+    with open(arquivo, "wb") as f:
+        # As saídas indefinidas só são conhecidas no primeiro bloco: o cabeçalho é regravado ao final
+        definidas = [0] * len(compilado.nomes_saidas)
+        inicio_dados = len(_cabecalho_tvb(compilado.nomes_entradas, compilado.nomes_saidas, definidas))
+        f.truncate(inicio_dados + largura * len(compilado.nomes_saidas))
+        for inicio, tamanho, palavras in blocos:
+            for s, palavra in enumerate(palavras):
+                if palavra is None:
+                    continue
+                definidas[s] = 1
+                f.seek(inicio_dados + s * largura + inicio // 8)
+                f.write(palavra.to_bytes((tamanho + 7) // 8, "little"))
+        f.seek(0)
+        f.write(_cabecalho_tvb(compilado.nomes_entradas, compilado.nomes_saidas, definidas))
+    return 1 << n
+
+
+class TabelaCompactada:
+    """Leitura de um arquivo .tvb via mmap, sem carregar as colunas em memória
+
+    Uso: with TabelaCompactada("tabela.tvb") as tabela: tabela.valor("S", 123)
+    """
+
+    def __init__(self, arquivo):
+        self._arquivo = open(arquivo, "rb")
+        try:
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Arquivo vazio
+            self._arquivo.close()
+            raise ValueError(f"Arquivo '{arquivo}' não é uma tabela verdade compactada")
+        magic, versao, num_entradas, num_saidas, tamanho = _CABECALHO_TVB.unpack_from(self._mapa, 0)
+        if magic != MAGIC_TVB or versao != VERSAO_TVB:
+            self.fechar()
+            raise ValueError(f"Arquivo '{arquivo}' não é uma tabela verdade compactada")
+        posicao = _CABECALHO_TVB.size
+        nomes = self._mapa[posicao:posicao + tamanho].decode("utf-8").split("\n") if tamanho else []
+        posicao += tamanho
+        self.num_entradas = num_entradas
+        self.nomes_entradas = nomes[:num_entradas]
+        self.nomes_saidas = nomes[num_entradas:]
+        self.definidas = [bool(b) for b in self._mapa[posicao:posicao + num_saidas]]
+        posicao += num_saidas
+        self._inicio = posicao + (-posicao % 8)
+        self._largura = ((1 << num_entradas) + 7) // 8
+        self._indice = {nome: s for s, nome in enumerate(self.nomes_saidas)}
+
+    @property
+    def num_linhas(self):
+        return 1 << self.num_entradas
+
+    def coluna(self, saida):
+        """memoryview com os bits de uma saída (nome ou índice), sem cópia"""
+        s = self._indice[saida] if isinstance(saida, str) else saida
+        inicio = self._inicio + s * self._largura
+        return memoryview(self._mapa)[inicio:inicio + self._largura]
+
+    def valor(self, saida, linha):
+        """Valor de uma saída (nome ou índice) na linha; None se a saída é indefinida"""
+        s = self._indice[saida] if isinstance(saida, str) else saida
+        if not self.definidas[s]:
+            return None
+        return (self._mapa[self._inicio + s * self._largura + linha // 8] >> (linha % 8)) & 1
+
+    def linha(self, linha):
+        """Tupla com o valor de cada saída na linha"""
+        return tuple(self.valor(s, linha) for s in range(len(self.nomes_saidas)))
+
+    def fechar(self):
+        self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+# --- Formas de onda (.vcd) ---
+
+def _identificador_vcd(indice):
+    """Código curto de um sinal no VCD (caracteres ASCII imprimíveis 33..126)"""
+    codigo = ""
+    while True:
+        codigo += chr(33 + indice % 94)
+        indice //= 94
+        if not indice:
+            return codigo
+
+
+def escrever_vcd(arquivo, nome_circuito, nomes_entradas, nomes_saidas, pares):
+    """Grava as formas de onda de uma simulação em lote; retorna o número de vetores
+
+    pares produz (vetor de entrada, vetor de saída) como strings de
+    '0'/'1'/'X'; o vetor i ocupa o instante #i. Só as mudanças são gravadas.
+    """
+    nomes = list(nomes_entradas) + list(nomes_saidas)
+    codigos = [_identificador_vcd(i) for i in range(len(nomes))]
+    quantidade = 0
+    with open(arquivo, "w", encoding="utf-8") as f:
+        f.write("$timescale 1ns $end\n")
+        f.write(f"$scope module {nome_circuito.replace(' ', '_')} $end\n")
+        for codigo, nome in zip(codigos, nomes):
+            f.write(f"$var wire 1 {codigo} {nome.replace(' ', '_')} $end\n")
+        f.write("$upscope $end\n$enddefinitions $end\n")
+
+        anterior = None
+        for entrada, saida in pares:
+            valores = (entrada + saida).lower()
+            mudancas = [f"{valor}{codigo}" for i, (valor, codigo) in enumerate(zip(valores, codigos))
+                        if anterior is None or anterior[i] != valor]
+            if mudancas:
+                f.write(f"#{quantidade}\n" + "\n".join(mudancas) + "\n")
+            anterior = valores
+            quantidade += 1
+        f.write(f"#{quantidade}\n")
+    return quantidade
@@ -0,0 +1,266 @@
+# =======================
+# SIMULAÇÃO DE FALHAS STUCK-AT
+# =======================
+#
+# Modelo de falhas "preso em 0" e "preso em 1" em cada ponto do netlist:
+# a saída de cada entrada e de cada porta (o tronco da net, visto por todo
+# o fan-out), cada pino de entrada de porta e o pino de cada saída do
+# circuito (os ramos, ou seja, as conexões).
+#
+# A simulação é paralela nos vetores (PPSFP): um bloco de até
+# TAMANHO_BLOCO vetores é empacotado em inteiros, com o bit r de cada net
+# valendo o sinal no vetor r. O circuito sem falha é avaliado uma vez por
+# bloco; para cada falha ainda não detectada, só o cone de fan-out do ponto
+# da falha é re-avaliado, em ordem de nível, e a propagação para nas portas
+# cuja saída não difere do circuito sem falha. Os bits em que uma saída do
+# circuito difere são os vetores que detectam a falha. Uma falha detectada
+# sai da lista e não é mais simulada (descarte de falhas).
+#
+# Antes da simulação, falhas equivalentes são agrupadas (a falha no pino de
+# uma net sem outro fan-out é a mesma falha do tronco) e simuladas uma vez
+# só, e falhas em pontos sem caminho até uma saída, que nenhum vetor pode
+# detectar, nem chegam a ser simuladas.
+
+import heapq
+import itertools
+import random
+from .bitparalelo import avaliar_palavras
+from .codegen import funcoes_portas
+from .estatisticas import estatisticas
+from .estimulos import ordem_das_entradas, TAMANHO_BLOCO
+
+# Falhas não detectadas listadas no resumo (o arquivo de relatório tem todas)
+LIMITE_FALHAS_RESUMO = 20
+
+# Os blocos começam pequenos e crescem 4x até o tamanho máximo: a maioria das
+# falhas cai nos primeiros vetores, e simulá-las em palavras curtas é mais barato
+BLOCO_INICIAL = 64
+
+
+def enumerar_falhas(compilado):
+    """Lista as falhas do circuito como (local, valor, tipo, alvo)
+
+    tipo "net": a saída da entrada ou da porta, alvo = net;
+    tipo "pino": um pino de entrada de porta, alvo = (porta, pino);
+    tipo "saida": o pino de uma saída do circuito, alvo = índice da saída.
+    Cada local aparece com valor 0 e com valor 1.
+    """
+    locais = [(f"{nome}.saida", "net", net) for net, nome in enumerate(compilado.nomes_entradas)]
+    base = compilado.num_entradas
+    for g, nome in enumerate(compilado.nomes_portas):
+        locais.extend((f"{nome}.entrada{pino}", "pino", (g, pino))
+                      for pino in range(len(compilado.pinos_portas[g])))
+        locais.append((f"{nome}.saida", "net", base + g))
+    locais.extend((f"{nome}.entrada", "saida", s) for s, nome in enumerate(compilado.nomes_saidas))
+    return [(local, valor, tipo, alvo) for local, tipo, alvo in locais for valor in (0, 1)]
+
+
+def _tamanhos_blocos(tamanho):
+    """BLOCO_INICIAL, 4x maior, ... até tamanho, que então se repete"""
+    atual = min(BLOCO_INICIAL, tamanho)
+    while True:
+        yield atual
+        atual = min(atual * 4, tamanho)
+
+
+def blocos_de_vetores(compilado, nomes, vetores, tamanho=TAMANHO_BLOCO):
+    """Empacota vetores ('0'/'1', na ordem de nomes) em blocos (quantidade, palavras)"""
+    ordem = ordem_das_entradas(compilado, nomes)
+    vetores = iter(vetores)
+    for maximo in _tamanhos_blocos(tamanho):
+        bloco = list(itertools.islice(vetores, maximo))
+        if not bloco:
+            return
+        colunas = ["".join(coluna) for coluna in zip(*bloco)]
+        if any("X" in colunas[c] for c in ordem):
+            raise ValueError("vetores com X não são aceitos na simulação de falhas nem na atividade")
+        yield len(bloco), [int(colunas[c][::-1], 2) for c in ordem]
+
+
+def blocos_aleatorios(compilado, quantidade, semente=0, tamanho=TAMANHO_BLOCO):
+    """Blocos (quantidade, palavras) de vetores aleatórios uniformes, reproduzíveis pela semente"""
+    rng = random.Random(semente)
+    inicio = 0
+    for maximo in _tamanhos_blocos(tamanho):
+        if inicio >= quantidade:
+            return
+        bits = min(maximo, quantidade - inicio)
+        yield bits, [rng.getrandbits(bits) for _ in range(compilado.num_entradas)]
+        inicio += bits
+
+
+def _nets_observaveis(compilado):
+    """Para cada net, se existe um caminho dela até alguma saída do circuito"""
+    observaveis = [bool(saidas) for saidas in compilado.fanout_saidas]
+    base = compilado.num_entradas
+    for g in reversed(compilado.ordem):
+        if observaveis[base + g]:
+            for net in compilado.pinos_portas[g]:
+                observaveis[net] = True
+    return observaveis
+
+
+def _classe_equivalente(compilado, observaveis, falha):
+    """Falha representante da classe de equivalência da falha, ou None se ela é inobservável"""
+    _, valor, tipo, alvo = falha
+    if tipo == "saida":
+        net = compilado.drivers_saidas[alvo]
+        if net < 0:
+            return None  # Saída desconectada
+        if compilado.fanout[net] or len(compilado.fanout_saidas[net]) > 1:
+            return falha
+    elif tipo == "pino":
+        g, pino = alvo
+        if not observaveis[compilado.num_entradas + g]:
+            return None
+        net = compilado.pinos_portas[g][pino]
+        if len(compilado.fanout[net]) > 1 or compilado.fanout_saidas[net]:
+            return falha
+    else:
+        net = alvo
+        if not observaveis[net]:
+            return None
+    # Net sem ramificação: o pino que ela alimenta e o seu tronco são o mesmo ponto
+    return ("", valor, "net", net)
+
+
+def _deteccao(compilado, funcoes, observaveis, bons, mascara, falha):
+    """Palavra com os vetores do bloco em que alguma saída do circuito revela a falha
+
+    Só as portas com caminho até uma saída são re-avaliadas.
+    """
+    _, valor, tipo, alvo = falha
+    forcado = mascara if valor else 0
+    if tipo == "saida":
+        return bons[compilado.drivers_saidas[alvo]] ^ forcado
+
+    base = compilado.num_entradas
+    pinos_portas = compilado.pinos_portas
+    if tipo == "pino":
+        g, pino = alvo
+        operandos = [bons[net] for net in pinos_portas[g]]
+        if operandos[pino] == forcado:
+            return 0  # A falha não é ativada por nenhum vetor do bloco
+        operandos[pino] = forcado
+        net = base + g
+        palavra = funcoes[g](operandos, mascara)
+    else:
+        net, palavra = alvo, forcado
+    if palavra == bons[net]:
+        return 0
+
+    fanout, fanout_saidas, niveis = compilado.fanout, compilado.fanout_saidas, compilado.niveis
+    faltosos = {net: palavra}
+    deteccao = palavra ^ bons[net] if fanout_saidas[net] else 0
+    agendadas = set()
+    fila = []
+    for g, _ in fanout[net]:
+        if g not in agendadas and observaveis[base + g]:
+            agendadas.add(g)
+            heapq.heappush(fila, (niveis[g], g))
+    while fila:
+        _, g = heapq.heappop(fila)
+        net = base + g
+        operandos = [faltosos.get(origem, bons[origem]) for origem in pinos_portas[g]]
+        palavra = funcoes[g](operandos, mascara)
+        if palavra == bons[net]:
+            continue
+        faltosos[net] = palavra
+        if fanout_saidas[net]:
+            deteccao |= palavra ^ bons[net]
+        for destino, _ in fanout[net]:
+            if destino not in agendadas and observaveis[base + destino]:
+                agendadas.add(destino)
+                heapq.heappush(fila, (niveis[destino], destino))
+    return deteccao
+
+
+def simular_falhas(compilado, blocos, falhas=None):
+    """Simula as falhas sobre os blocos de vetores, descartando as já detectadas
+
+    blocos produz (quantidade, palavras das entradas), como
+    blocos_de_vetores e blocos_aleatorios; falhas é por padrão a lista
+    completa de enumerar_falhas (passar só as não detectadas de uma rodada
+    anterior avalia um conjunto de estímulos adicional). Retorna um dict com
+    as falhas, o primeiro vetor que detecta cada uma (None = não
+    detectada), o número de vetores, de detectadas, de classes de
+    equivalência simuladas e de falhas inobserváveis, e a cobertura.
+    """
+    if compilado.erros:
+        raise ValueError("Circuito inválido: " + "; ".join(compilado.erros))
+    if falhas is None:
+        falhas = enumerar_falhas(compilado)
+    funcoes = funcoes_portas(compilado)
+    deteccoes = [None] * len(falhas)
+    observaveis = _nets_observaveis(compilado)
+    classes = {}  # representante -> índices das falhas equivalentes
+    inobservaveis = 0
+    for i, falha in enumerate(falhas):
+        representante = _classe_equivalente(compilado, observaveis, falha)
+        if representante is None:
+            inobservaveis += 1
+        else:
+            classes.setdefault(representante[1:], (representante, []))[1].append(i)
+    pendentes = list(classes.values())
+    vetores = 0
+    simuladas = 0
+
+    for quantidade, palavras in blocos:
+        if not pendentes:
+            break  # Os vetores restantes não podem aumentar a cobertura
+        mascara = (1 << quantidade) - 1
+        bons = avaliar_palavras(compilado, palavras, mascara)
+        restantes = []
+        for representante, indices in pendentes:
+            deteccao = _deteccao(compilado, funcoes, observaveis, bons, mascara, representante)
+            if deteccao:
+                vetor = vetores + (deteccao & -deteccao).bit_length() - 1
+                for i in indices:
+                    deteccoes[i] = vetor
+            else:
+                restantes.append((representante, indices))
+        simuladas += len(pendentes)
+        pendentes = restantes
+        vetores += quantidade
+
+    if estatisticas.ativa:
+        estatisticas.contar("falhas_simuladas", simuladas)
+    detectadas = len(falhas) - inobservaveis - sum(len(indices) for _, indices in pendentes)
+    return {"falhas": falhas, "deteccoes": deteccoes, "vetores": vetores, "detectadas": detectadas,
+            "classes": len(classes), "inobservaveis": inobservaveis,
+            "cobertura": detectadas / len(falhas) if falhas else 1.0}
+
+
+def falhas_nao_detectadas(resultado):
+    """Falhas (local, valor, tipo, alvo) que nenhum vetor detectou"""
+    return [falha for falha, vetor in zip(resultado["falhas"], resultado["deteccoes"]) if vetor is None]
+
+
+def descrever_falha(falha):
+    return f"{falha[0]} preso em {falha[1]}"
+
+
+def resumo_falhas(resultado):
+    """Linhas de texto com a cobertura e as primeiras falhas não detectadas"""
+    total = len(resultado["falhas"])
+    linhas = [f"Falhas stuck-at: {total} em {resultado['classes']} classes de equivalência "
+              f"({resultado['vetores']} vetores simulados)",
+              f"  Detectadas: {resultado['detectadas']}",
+              f"  Não detectadas: {total - resultado['detectadas']} "
+              f"({resultado['inobservaveis']} sem caminho até uma saída)",
+              f"  Cobertura: {resultado['cobertura']:.2%}"]
+    nao_detectadas = falhas_nao_detectadas(resultado)
+    for falha in nao_detectadas[:LIMITE_FALHAS_RESUMO]:
+        linhas.append(f"    - {descrever_falha(falha)}")
+    if len(nao_detectadas) > LIMITE_FALHAS_RESUMO:
+        linhas.append(f"    ... e mais {len(nao_detectadas) - LIMITE_FALHAS_RESUMO}")
+    return linhas
+
+
+def escrever_relatorio_falhas(resultado, arquivo):
+    """Grava uma linha por falha (local, valor, primeiro vetor que a detecta) em CSV"""
+    with open(arquivo, "w", encoding="utf-8") as f:
+        f.write("falha,preso_em,detectada_no_vetor\n")
+        for falha, vetor in zip(resultado["falhas"], resultado["deteccoes"]):
+            f.write(f"{falha[0]},{falha[1]},{'' if vetor is None else vetor}\n")
+    return len(resultado["falhas"])
@@ -2,174 +2,371 @@
 # GERADORES DE SAÍDA
 # =======================
 
-from .models import circuito
-from .simulator import simular_circuito
-
-
-def gerar_resumo_textual():
+import base64
+import json
+import os
+from .models import circuito, texto_valor, texto_valores
+from .simulator import obter_compilado
+from .bitparalelo import linhas_tabela_verdade, tabela_verdade_exaustiva, bits_por_bloco
+from .minimizacao import forma_minima_porta, expressoes_saidas
+from .atividade import resumo_atividade, probabilidades, atividades
+from .estatisticas import cronometrado
+
+# Número máximo de entradas para incluir a tabela verdade no HTML
+LIMITE_ENTRADAS_TABELA = 20
+# Até este número de entradas a tabela vai inline; acima, em arquivos de blocos
+LIMITE_TABELA_INLINE = 8
+# Linhas por arquivo de bloco (2^BITS_BLOCO_HTML), no máximo
+BITS_BLOCO_HTML = 16
+# Componentes listados por seção; a lista completa fica no resumo textual
+LIMITE_COMPONENTES_HTML = 1000
+
+
+def _forma_minima(porta):
+    """Soma de produtos mínima da tabela da porta, ou None se não disponível"""
+    return forma_minima_porta(porta.lookup) if porta.lookup is not None else None
+
+
+@cronometrado("resumo_textual")
+def gerar_resumo_textual(circ=None):
     """Gera um resumo textual do circuito (ANTES da tabela verdade)"""
-    filename = f"resumo_{circuito.nome or 'circuito'}.txt"
+    if circ is None:
+        circ = circuito
+    filename = f"resumo_{circ.nome or 'circuito'}.txt"
     with open(filename, "w", encoding="utf-8") as f:
-        f.write(f"RELATÓRIO DO CIRCUITO: {circuito.nome or 'Sem Nome'}\n")
+        f.write(f"RELATÓRIO DO CIRCUITO: {circ.nome or 'Sem Nome'}\n")
         f.write("=" * 50 + "\n\n")
 
         f.write("ENTRADAS:\n")
-        for entrada in circuito.entradas.values():
+        for entrada in circ.entradas.values():
             f.write(f"  - {entrada}\n")
 
         f.write(f"\nPORTAS LÓGICAS:\n")
-        for porta in circuito.portas.values():
+        for porta in circ.portas.values():
             f.write(f"  - {porta}\n")
+            forma = _forma_minima(porta)
+            if forma is not None:
+                f.write(f"      forma mínima: {forma}\n")
 
         f.write(f"\nSAÍDAS:\n")
-        for saida in circuito.saidas.values():
+        for saida in circ.saidas.values():
             f.write(f"  - {saida}\n")
 
         f.write(f"\nCONEXÕES:\n")
-        for conexao in circuito.conexoes:
+        for conexao in circ.conexoes:
             f.write(f"  - {conexao}\n")
 
+        expressoes = expressoes_saidas(obter_compilado(circ))
+        if expressoes:
+            f.write(f"\nEXPRESSÕES MÍNIMAS DAS SAÍDAS:\n")
+            for nome, expressao in expressoes:
+                f.write(f"  - {nome} = {expressao}\n")
+
+        if circ.atividade is not None:
+            f.write(f"\nATIVIDADE DE CHAVEAMENTO:\n")
+            for linha in resumo_atividade(circ.atividade):
+                f.write(f"  {linha}\n")
+
+        if circ.modulos:
+            f.write(f"\nMÓDULOS:\n")
+            for modulo in circ.modulos.values():
+                f.write(f"  - {modulo}\n")
+
     print(f"Resumo textual gerado: {filename}")
 
 
-def gerar_html_circuito():
-    """Gera um relatório HTML do circuito"""
-    
-    # Salvar estado original das entradas
-    valores_originais = {nome: entrada.valor for nome, entrada in circuito.entradas.items()}
-    estados_portas = {nome: (porta.valores_entradas.copy(), porta.valor_saida) 
-                      for nome, porta in circuito.portas.items()}
-    estados_saidas = {nome: saida.valor for nome, saida in circuito.saidas.items()}
-    
-    html = f"""<!DOCTYPE html>
+_ESTILO = """    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }
+        .container { background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; }
+        .component { background: #ecf0f1; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #3498db; }
+        .connection { background: #e8f5e8; padding: 10px; margin: 5px 0; border-radius: 3px; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th, td { padding: 10px; text-align: center; border: 1px solid #bdc3c7; }
+        th { background-color: #3498db; color: white; }
+        .resultado { background: #d5f4e6; padding: 15px; border-radius: 5px; font-weight: bold; }
+    </style>
+"""
+
+_ESTILO_BLOCOS = """    <style>
+        .tv-controles { margin: 10px 0; }
+        .tv-controles button, .tv-controles input { padding: 4px 8px; margin-right: 6px; }
+        .tv-caixa { position: relative; height: 600px; overflow-y: auto; border: 1px solid #bdc3c7; }
+        .tv-caixa table, .tv-cabecalho { table-layout: fixed; margin: 0; }
+        .tv-caixa table { position: absolute; left: 0; top: 0; }
+        .tv-caixa td { padding: 0 10px; height: 23px; }
+    </style>
+"""
+
+# Visualizador da tabela verdade em blocos: só as linhas visíveis são
+# desenhadas, e cada arquivo de bloco é carregado (via <script>, o que também
+# funciona com file://) quando uma de suas linhas aparece na tela.
+_SCRIPT_BLOCOS = """    <script>
+    (function () {
+        var meta = %s;
+        var ALTURA = 24, MAX_ALTURA = 8000000;
+        var caixa = document.getElementById('tv-caixa');
+        var corpo = document.getElementById('tv-corpo');
+        var info = document.getElementById('tv-info');
+        var n = meta.entradas.length, porSaida = meta.linhas_por_bloco / 8;
+        var blocos = {}, pedidos = {};
+        var alturaTotal = Math.min(meta.linhas * ALTURA, MAX_ALTURA);
+        document.getElementById('tv-espaco').style.height = alturaTotal + 'px';
+
+        window.registrarBloco = function (k, dados) {
+            var bin = atob(dados), bytes = new Uint8Array(bin.length);
+            for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+            blocos[k] = bytes;
+            desenhar();
+        };
+
+        function pedir(k) {
+            if (pedidos[k]) return;
+            pedidos[k] = true;
+            var script = document.createElement('script');
+            script.src = meta.pasta + '/bloco_' + k + '.js';
+            document.body.appendChild(script);
+        }
+
+        function visiveis() { return Math.max(1, Math.floor(caixa.clientHeight / ALTURA)); }
+        function maxPrimeira() { return Math.max(0, meta.linhas - visiveis()); }
+        function rolavel() { return Math.max(0, alturaTotal - caixa.clientHeight); }
+
+        function primeiraVisivel() {
+            if (!rolavel()) return 0;
+            return Math.min(maxPrimeira(), Math.round(caixa.scrollTop / rolavel() * maxPrimeira()));
+        }
+
+        function irPara(linha) {
+            linha = Math.max(0, Math.min(maxPrimeira(), linha));
+            caixa.scrollTop = maxPrimeira() ? linha / maxPrimeira() * rolavel() : 0;
+            desenhar();
+        }
+
+        function desenhar() {
+            var primeira = primeiraVisivel(), ultima = Math.min(meta.linhas, primeira + visiveis());
+            var html = [];
+            for (var i = primeira; i < ultima; i++) {
+                var k = Math.floor(i / meta.linhas_por_bloco), r = i - k * meta.linhas_por_bloco;
+                var bloco = blocos[k];
+                if (!bloco && meta.definidas) pedir(k);
+                html.push('<tr><td>' + i + '</td>');
+                for (var j = 0; j < n; j++) html.push('<td>' + ((i >> (n - 1 - j)) & 1) + '</td>');
+                for (var o = 0; o < meta.saidas.length; o++) {
+                    var v = meta.indefinidas[o] ? 'X' : bloco ? (bloco[o * porSaida + (r >> 3)] >> (r & 7)) & 1 : '…';
+                    html.push('<td><strong>' + v + '</strong></td>');
+                }
+                html.push('</tr>');
+            }
+            corpo.innerHTML = html.join('');
+            corpo.parentNode.style.top = caixa.scrollTop + 'px';
+            info.textContent = 'Linhas ' + primeira + '–' + (ultima - 1) + ' de ' + meta.linhas;
+        }
+
+        caixa.addEventListener('scroll', desenhar);
+        window.addEventListener('resize', desenhar);
+        document.getElementById('tv-anterior').onclick = function () { irPara(primeiraVisivel() - visiveis()); };
+        document.getElementById('tv-proxima').onclick = function () { irPara(primeiraVisivel() + visiveis()); };
+        document.getElementById('tv-ir').onclick = function () {
+            irPara(parseInt(document.getElementById('tv-linha').value, 10) || 0);
+        };
+        desenhar();
+    })();
+    </script>
+"""
+
+
+def _linha_forma_minima(porta):
+    forma = _forma_minima(porta)
+    return f"<br>\n            Forma mínima: {forma}" if forma is not None else ""
+
+
+def _escrever_lista(f, itens, vazio, rotulo, circ):
+    """Escreve os itens já formatados de uma seção, até LIMITE_COMPONENTES_HTML"""
+    quantidade = 0
+    for item in itens:
+        if quantidade == LIMITE_COMPONENTES_HTML:
+            f.write(f'        <p>... e mais {sum(1 for _ in itens) + 1} {rotulo} '
+                    f'(lista completa em resumo_{circ.nome or "circuito"}.txt)</p>\n')
+            return
+        f.write(item)
+        quantidade += 1
+    if not quantidade:
+        f.write(f'        <p>{vazio}</p>\n')
+
+
+def _escrever_atividade(f, circ):
+    """Probabilidade de 1 e atividade de chaveamento de cada net, até LIMITE_COMPONENTES_HTML"""
+    resultado = circ.atividade
+    f.write('\n        <h2>🔋 Atividade de Chaveamento</h2>\n')
+    f.write(f'        <p>{resultado["vetores"]} vetores simulados; arquivo completo em '
+            f'atividade_{circ.nome}.csv</p>\n')
+    f.write('        <table>\n            <tr><th>Net</th><th>P(1)</th><th>Trocas</th>'
+            '<th>Atividade</th><th>Fan-out</th></tr>\n')
+    linhas = zip(resultado["nets"], probabilidades(resultado), resultado["trocas"],
+                 atividades(resultado), resultado["fanout"])
+    for i, (nome, probabilidade, trocas, atividade, fanout) in enumerate(linhas):
+        if i == LIMITE_COMPONENTES_HTML:
+            f.write(f'        </table>\n        <p>... e mais {len(resultado["nets"]) - i} nets</p>\n')
+            return
+        f.write(f'            <tr><td>{nome}</td><td>{probabilidade:.4f}</td><td>{trocas}</td>'
+                f'<td>{atividade:.4f}</td><td>{fanout}</td></tr>\n')
+    f.write('        </table>\n')
+
+
+def _escrever_tabela_inline(f, circ, compilado):
+    """Tabela verdade como linhas HTML (circuitos com poucas entradas)"""
+    f.write('\n        <h2>📋 Tabela Verdade Completa</h2>\n')
+    f.write('        <table>\n            <tr>\n')
+
+    # Cabeçalhos
+    for nome in circ.entradas.keys():
+        f.write(f'                <th>{nome}</th>\n')
+    for nome in circ.saidas.keys():
+        f.write(f'                <th>{nome}</th>\n')
+    f.write('            </tr>\n')
+
+    # Todas as combinações, avaliadas em blocos bit-paralelos
+    for valores_entrada, valores_saida in linhas_tabela_verdade(compilado):
+        f.write('            <tr>\n')
+        f.write(''.join(f'                <td>{texto_valor(valor)}</td>\n' for valor in valores_entrada))
+        f.write(''.join(f'                <td><strong>{texto_valor(valor)}</strong></td>\n'
+                        for valor in valores_saida))
+        f.write('            </tr>\n')
+    f.write('        </table>\n')
+
+
+def escrever_blocos_tabela(compilado, pasta):
+    """Grava a tabela verdade em arquivos bloco_K.js dentro de pasta
+
+    Cada arquivo chama registrarBloco(K, base64) com, para cada saída, os
+    bits das linhas do bloco (bit r = linha r, byte r // 8). Retorna os
+    metadados usados pelo visualizador.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    for nome in os.listdir(pasta):
+        if nome.startswith("bloco_") and nome.endswith(".js"):
+            os.remove(os.path.join(pasta, nome))
+
+    bits = min(BITS_BLOCO_HTML, bits_por_bloco(compilado))
+    indefinidas = None
+    for inicio, tamanho, saidas in tabela_verdade_exaustiva(compilado, bits):
+        if indefinidas is None:
+            indefinidas = [palavra is None for palavra in saidas]
+            if all(indefinidas):
+                break  # Nenhuma saída calculável: não há blocos a gravar
+        largura = tamanho // 8
+        dados = b"".join((palavra or 0).to_bytes(largura, "little") for palavra in saidas)
+        with open(os.path.join(pasta, f"bloco_{inicio >> bits}.js"), "w", encoding="ascii") as arquivo:
+            arquivo.write(f'registrarBloco({inicio >> bits}, "{base64.b64encode(dados).decode("ascii")}");\n')
+
+    return {
+        "entradas": compilado.nomes_entradas,
+        "saidas": compilado.nomes_saidas,
+        "linhas": 1 << compilado.num_entradas,
+        "linhas_por_bloco": 1 << bits,
+        "indefinidas": indefinidas or [],
+        "definidas": not all(indefinidas or [True]),
+        "pasta": os.path.basename(pasta),
+    }
+
+
+def _escrever_tabela_em_blocos(f, compilado, filename):
+    """Tabela verdade paginada, com os dados em arquivos de blocos ao lado do HTML"""
+    pasta = os.path.splitext(filename)[0] + "_tabela"
+    meta = escrever_blocos_tabela(compilado, pasta)
+
+    colunas = ['#'] + compilado.nomes_entradas + compilado.nomes_saidas
+    f.write('\n        <h2>📋 Tabela Verdade Completa</h2>\n')
+    f.write(f'        <p>{meta["linhas"]} linhas, carregadas sob demanda de {meta["pasta"]}/</p>\n')
+    f.write('        <div class="tv-controles">\n'
+            '            <button id="tv-anterior">◀ Página anterior</button>\n'
+            '            <button id="tv-proxima">Próxima página ▶</button>\n'
+            '            <input id="tv-linha" type="number" min="0" placeholder="linha">\n'
+            '            <button id="tv-ir">Ir</button>\n'
+            '            <span id="tv-info"></span>\n'
+            '        </div>\n')
+    f.write('        <table class="tv-cabecalho"><tr>'
+            + ''.join(f'<th>{nome}</th>' for nome in colunas) + '</tr></table>\n')
+    f.write('        <div class="tv-caixa" id="tv-caixa"><div id="tv-espaco"></div>'
+            '<table><tbody id="tv-corpo"></tbody></table></div>\n')
+    f.write(_SCRIPT_BLOCOS % json.dumps(meta))
+
+
+@cronometrado("relatorio_html")
+def gerar_html_circuito(circ=None):
+    """Gera um relatório HTML do circuito, escrito diretamente no arquivo
+
+    Tabelas verdade com mais de LIMITE_TABELA_INLINE entradas são gravadas
+    em arquivos de blocos e exibidas com rolagem virtual.
+    """
+    if circ is None:
+        circ = circuito
+
+    filename = f"circuito_{circ.nome or 'sem_nome'}.html"
+    num_entradas = len(circ.entradas)
+    em_blocos = LIMITE_TABELA_INLINE < num_entradas <= LIMITE_ENTRADAS_TABELA
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html>
 <html lang="pt-br">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Circuito {circuito.nome or 'Sem Nome'}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }}
-        .container {{ background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        h1 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
-        h2 {{ color: #34495e; margin-top: 30px; }}
-        .component {{ background: #ecf0f1; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #3498db; }}
-        .connection {{ background: #e8f5e8; padding: 10px; margin: 5px 0; border-radius: 3px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-        th, td {{ padding: 10px; text-align: center; border: 1px solid #bdc3c7; }}
-        th {{ background-color: #3498db; color: white; }}
-        .resultado {{ background: #d5f4e6; padding: 15px; border-radius: 5px; font-weight: bold; }}
-    </style>
-</head>
+    <title>Circuito {circ.nome or 'Sem Nome'}</title>
+""")
+        f.write(_ESTILO)
+        if em_blocos:
+            f.write(_ESTILO_BLOCOS)
+        f.write(f"""</head>
 <body>
     <div class="container">
-        <h1>Circuito: {circuito.nome or 'Sem Nome'}</h1>
+        <h1>Circuito: {circ.nome or 'Sem Nome'}</h1>
 
         <h2>📥 Entradas</h2>
-"""
+""")
 
-    if circuito.entradas:
-        for nome, entrada in circuito.entradas.items():
-            # Usar valor original salvo
-            html += f'        <div class="component">🔌 <strong>{entrada.nome}</strong>: {valores_originais[nome]}</div>\n'
-    else:
-        html += '        <p>Nenhuma entrada definida</p>\n'
+        _escrever_lista(f, (f'        <div class="component">🔌 <strong>{entrada.nome}</strong>: {texto_valor(entrada.valor)}</div>\n'
+                            for entrada in circ.entradas.values()),
+                        "Nenhuma entrada definida", "entradas", circ)
 
-    html += '\n        <h2>🔧 Portas Lógicas</h2>\n'
-
-    if circuito.portas:
-        for nome, porta in circuito.portas.items():
-            # Usar estado original salvo
-            vals_entrada, val_saida = estados_portas[nome]
-            html += f'''        <div class="component">
+        f.write('\n        <h2>🔧 Portas Lógicas</h2>\n')
+        _escrever_lista(f, (f'''        <div class="component">
             <strong>{porta.nome}</strong> ({porta.tipo})<br>
             Entradas: {porta.entradas} | Saídas: {porta.saidas}<br>
-            Estado: {vals_entrada} → {val_saida}
-        </div>\n'''
-    else:
-        html += '        <p>Nenhuma porta lógica definida</p>\n'
-
-    html += '\n        <h2>📤 Saídas</h2>\n'
-
-    if circuito.saidas:
-        for nome, saida in circuito.saidas.items():
-            # Usar estado original salvo
-            html += f'        <div class="resultado">📊 <strong>{saida.nome}</strong>: {estados_saidas[nome]}</div>\n'
-    else:
-        html += '        <p>Nenhuma saída definida</p>\n'
-
-    html += '\n        <h2>🔗 Conexões</h2>\n'
-
-    if circuito.conexoes:
-        for conexao in circuito.conexoes:
-            html += f'        <div class="connection">⚡ {conexao.origem} → {conexao.destino}</div>\n'
-    else:
-        html += '        <p>Nenhuma conexão definida</p>\n'
-
-    # Tabela verdade do circuito (se aplicável)
-    if len(circuito.entradas) <= 4:  # Só gerar para até 4 entradas
-        html += '\n        <h2>📋 Tabela Verdade Completa</h2>\n'
-        html += '        <table>\n            <tr>\n'
-
-        # Cabeçalhos
-        for nome in circuito.entradas.keys():
-            html += f'                <th>{nome}</th>\n'
-        for nome in circuito.saidas.keys():
-            html += f'                <th>{nome}</th>\n'
-        html += '            </tr>\n'
-
-        # Gerar todas as combinações
-        num_entradas = len(circuito.entradas)
-        entrada_names = list(circuito.entradas.keys())
-        
-        for i in range(2 ** num_entradas):
-            html += '            <tr>\n'
-
-            # Definir valores das entradas para esta linha
-            valores_entrada = []
-            for j in range(num_entradas):
-                valor = (i >> (num_entradas - 1 - j)) & 1
-                valores_entrada.append(valor)
-                html += f'                <td>{valor}</td>\n'
-
-            # Configurar entradas para simulação
-            for k, nome in enumerate(entrada_names):
-                circuito.entradas[nome].valor = valores_entrada[k]
-
-            # Reset e simular
-            for porta in circuito.portas.values():
-                porta.processada = False
-                porta.valor_saida = None
-                porta.valores_entradas = [None] * porta.entradas
-
-            for saida in circuito.saidas.values():
-                saida.valor = None
-
-            # Simular silenciosamente
-            simular_circuito(verbose=False)
-
-            # Adicionar resultados das saídas
-            for nome in circuito.saidas.keys():
-                html += f'                <td><strong>{circuito.saidas[nome].valor}</strong></td>\n'
-
-            html += '            </tr>\n'
-
-    html += '''        </table>
-    </div>
+            Estado: {texto_valores(porta.valores_entradas)} → {texto_valor(porta.valor_saida)}{_linha_forma_minima(porta)}
+        </div>\n''' for porta in circ.portas.values()),
+                        "Nenhuma porta lógica definida", "portas", circ)
+
+        f.write('\n        <h2>📤 Saídas</h2>\n')
+        _escrever_lista(f, (f'        <div class="resultado">📊 <strong>{saida.nome}</strong>: {texto_valor(saida.valor)}</div>\n'
+                            for saida in circ.saidas.values()),
+                        "Nenhuma saída definida", "saídas", circ)
+
+        f.write('\n        <h2>🔗 Conexões</h2>\n')
+        _escrever_lista(f, (f'        <div class="connection">⚡ {conexao.origem} → {conexao.destino}</div>\n'
+                            for conexao in circ.conexoes),
+                        "Nenhuma conexão definida", "conexões", circ)
+
+        expressoes = expressoes_saidas(obter_compilado(circ))
+        if expressoes:
+            f.write('\n        <h2>🧮 Expressões Mínimas das Saídas</h2>\n')
+            for nome, expressao in expressoes:
+                f.write(f'        <div class="resultado">{nome} = {expressao}</div>\n')
+
+        if circ.atividade is not None:
+            _escrever_atividade(f, circ)
+
+        # Tabela verdade do circuito (se aplicável)
+        if num_entradas <= LIMITE_TABELA_INLINE:
+            _escrever_tabela_inline(f, circ, obter_compilado(circ))
+        elif em_blocos:
+            _escrever_tabela_em_blocos(f, obter_compilado(circ), filename)
+
+        f.write('''    </div>
 </body>
-</html>'''
-
-    # Restaurar estado original
-    for nome, valor in valores_originais.items():
-        circuito.entradas[nome].valor = valor
-    for nome, (vals_entrada, val_saida) in estados_portas.items():
-        circuito.portas[nome].valores_entradas = vals_entrada
-        circuito.portas[nome].valor_saida = val_saida
-    for nome, valor in estados_saidas.items():
-        circuito.saidas[nome].valor = valor
-
-    filename = f"circuito_{circuito.nome or 'sem_nome'}.html"
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(html)
+</html>''')
 
     print(f"\nRelatório HTML gerado: {filename}")
     return filename
@@ -0,0 +1,121 @@
+# =======================
+# SUBCIRCUITOS (MÓDULOS)
+# =======================
+#
+# Cada módulo é achatado uma única vez em um molde: a lista de portas (os
+# objetos Porta da definição, com as tabelas já compiladas) e as conexões,
+# com os nomes relativos ao módulo. Instanciar um módulo apenas copia o molde
+# com o prefixo "instancia/", compartilhando tabela e lookup entre as cópias.
+#
+# Dentro do molde, os pinos do próprio módulo aparecem como "A.saida"
+# (entrada A) e "S.entrada" (saída S); na instância eles viram "inst.A" e
+# "inst.S", a mesma forma usada nas conexões do circuito pai, e são
+# eliminados ligando diretamente o driver de cada pino aos seus destinos.
+
+from .models import Porta, Conexao
+
+
+def _componente(referencia):
+    return referencia.split('.', 1)[0]
+
+
+def _renomear(referencia, instancia, modulo):
+    """Traduz uma referência do molde de um módulo para o circuito pai"""
+    componente, pino = referencia.split('.', 1)
+    if componente in modulo.entradas or componente in modulo.saidas:
+        return f"{instancia}.{componente}"
+    return f"{instancia}/{componente}.{pino}"
+
+
+def _validar_pinos(componente, instancias, erros):
+    """Confere as conexões do componente que usam pinos de instâncias"""
+    for conexao in componente.conexoes:
+        origem, pino_origem = conexao.origem.split('.', 1)
+        destino, pino_destino = conexao.destino.split('.', 1)
+        if origem in instancias and pino_origem not in instancias[origem].saidas:
+            erros.append(f"Erro: conexão {conexao}: '{pino_origem}' não é uma saída do módulo "
+                         f"'{instancias[origem].nome}'")
+        if destino in instancias and pino_destino not in instancias[destino].entradas:
+            erros.append(f"Erro: conexão {conexao}: '{pino_destino}' não é uma entrada do módulo "
+                         f"'{instancias[destino].nome}'")
+
+
+def _ligar_instancias(conexoes, instancias, erros):
+    """Remove os pinos das instâncias, ligando cada driver direto aos destinos"""
+    drivers = {}
+    restantes = []
+    for origem, destino, linha in conexoes:
+        if _componente(destino) in instancias:
+            if destino in drivers:
+                erros.append(f"Erro: pino '{destino}' tem mais de um driver")
+            drivers[destino] = origem
+        else:
+            restantes.append((origem, destino, linha))
+
+    ligadas = []
+    for origem, destino, linha in restantes:
+        visitados = set()
+        while origem is not None and _componente(origem) in instancias:
+            if origem in visitados:
+                erros.append(f"Erro: pinos de instância ligados em laço ({origem})")
+                origem = None
+                break
+            visitados.add(origem)
+            origem = drivers.get(origem)  # Pino sem driver: o destino fica desconectado
+        if origem is not None:
+            ligadas.append((origem, destino, linha))
+    return ligadas
+
+
+def _achatar(componente, modulos, moldes, pilha, erros):
+    """Retorna o molde (portas, conexões) de um módulo ou circuito, sem instâncias
+
+    As conexões do molde são tuplas (origem, destino, linha no código fonte).
+    """
+    portas = list(componente.portas.items())
+    conexoes = [(conexao.origem, conexao.destino, conexao.linha) for conexao in componente.conexoes]
+    instancias = {}
+
+    for nome, (tipo, linha) in componente.instancias.items():
+        modulo = modulos.get(tipo)
+        if modulo is None:
+            erros.append(f"Erro (linha {linha}): instância '{nome}': módulo '{tipo}' não definido")
+            continue
+        if tipo in pilha:
+            erros.append(f"Erro (linha {linha}): instância '{nome}': o módulo '{tipo}' instancia a si mesmo")
+            continue
+        if nome in componente.portas or nome in componente.entradas or nome in componente.saidas:
+            erros.append(f"Erro (linha {linha}): instância '{nome}': nome já usado por outro componente")
+            continue
+
+        if tipo not in moldes:
+            moldes[tipo] = _achatar(modulo, modulos, moldes, pilha + [tipo], erros)
+        portas_modulo, conexoes_modulo = moldes[tipo]
+        instancias[nome] = modulo
+
+        prefixo = nome + "/"
+        portas.extend((prefixo + nome_porta, porta) for nome_porta, porta in portas_modulo)
+        conexoes.extend((_renomear(origem, nome, modulo), _renomear(destino, nome, modulo), linha)
+                        for origem, destino, linha in conexoes_modulo)
+
+    _validar_pinos(componente, instancias, erros)
+    return portas, _ligar_instancias(conexoes, instancias, erros)
+
+
+def expandir_instancias(circ):
+    """Substitui as instâncias do circuito por cópias achatadas dos módulos
+
+    Cada módulo distinto é achatado uma só vez; as portas copiadas recebem
+    nomes "instancia/porta" e compartilham a tabela compilada da definição.
+    Retorna a lista de erros encontrados.
+    """
+    erros = []
+    portas, conexoes = _achatar(circ, circ.modulos, {}, [], erros)
+
+    circ.portas = {
+        nome: porta if circ.portas.get(nome) is porta
+        else Porta(porta.tipo, nome, porta.entradas, porta.saidas, porta.tabela, porta.lookup, porta.linha)
+        for nome, porta in portas
+    }
+    circ.conexoes = [Conexao(origem, destino, linha) for origem, destino, linha in conexoes]
+    return erros
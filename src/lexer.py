@@ -2,13 +2,14 @@
 # ANÁLISE LÉXICA
 # =======================
 
+import os
 import ply.lex as lex
 
 # Lista de tokens
 tokens = (
     "CIRCUITO", "PORTA_LOGICA", "ENTRADA", "SAIDA",
     "CONEXAO", "CONECTAR", "NUMERO_DE_ENTRADAS", "NUMERO_DE_SAIDAS",
-    "TABELA_VERDADE", "VALOR_INICIAL",
+    "TABELA_VERDADE", "VALOR_INICIAL", "MODULO", "INSTANCIA",
     "IDENT", "NUM", "ARROW", "DOT",
     "LCURL", "RCURL"
 )
@@ -24,7 +25,9 @@ reserved = {
     "numero_de_entradas": "NUMERO_DE_ENTRADAS",
     "numero_de_saidas": "NUMERO_DE_SAIDAS",
     "tabela_verdade": "TABELA_VERDADE",
-    "valor_inicial": "VALOR_INICIAL"
+    "valor_inicial": "VALOR_INICIAL",
+    "modulo": "MODULO",
+    "instancia": "INSTANCIA"
 }
 
 # Tokens simples (expressões regulares)
@@ -58,10 +61,26 @@ def t_comment(t):
 
 
 def t_error(t):
-    print(f"Erro léxico na linha {t.lexer.lineno}: caractere inválido '{t.value[0]}'")
+    mensagem = f"Erro léxico na linha {t.lexer.lineno}: caractere inválido '{t.value[0]}'"
+    # Lexers criados por analisar() registram o erro no circuito em análise
+    circ = getattr(t.lexer, 'circuito', None)
+    if circ is not None:
+        circ.erros_analise.append(mensagem)
+    if getattr(t.lexer, 'verbose', True):
+        print(mensagem)
     t.lexer.skip(1)
 
 
-# Cria o lexer
-lexer = lex.lex()
+# Cria o lexer a partir da tabela pré-gerada (src/lextab.py), sem revalidar as regras
+_LEXTAB = f"{__package__}.lextab"
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+lexer = lex.lex(optimize=True, lextab=_LEXTAB, outputdir=_DIR)
+if lexer.lextokens != set(tokens):
+    # Tabela desatualizada: reconstrói validando as regras e grava de novo
+    lexer = lex.lex()
+    try:
+        lexer.writetab(_LEXTAB, _DIR)
+    except OSError:
+        pass  # Instalação somente leitura: segue com o lexer reconstruído em memória
 
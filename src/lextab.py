@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ARROW', 'CIRCUITO', 'CONECTAR', 'CONEXAO', 'DOT', 'ENTRADA', 'IDENT', 'INSTANCIA', 'LCURL', 'MODULO', 'NUM', 'NUMERO_DE_ENTRADAS', 'NUMERO_DE_SAIDAS', 'PORTA_LOGICA', 'RCURL', 'SAIDA', 'TABELA_VERDADE', 'VALOR_INICIAL'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NUM>\\d+)|(?P<t_IDENT>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_newline>\\n+)|(?P<t_comment>//.*)|(?P<t_ARROW>->)|(?P<t_DOT>\\.)|(?P<t_LCURL>\\{)|(?P<t_RCURL>\\})', [None, ('t_NUM', 'NUM'), ('t_IDENT', 'IDENT'), ('t_newline', 'newline'), ('t_comment', 'comment'), (None, 'ARROW'), (None, 'DOT'), (None, 'LCURL'), (None, 'RCURL')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,95 @@
+# =======================
+# COMPILAÇÃO EM LOTE
+# =======================
+#
+# Compila e simula vários arquivos de circuito em paralelo. Cada arquivo é
+# analisado em um CircuitoState próprio (analisar), então os processos não
+# compartilham estado e os resultados podem ser reunidos em um resumo.
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .parser_rules import analisar
+from .simulator import obter_compilado, avaliar_compilado
+from .models import texto_valor
+from .paralelo import numero_de_jobs
+
+
+def listar_circuitos(diretorio):
+    """Lista os arquivos .txt de um diretório, em ordem alfabética"""
+    return sorted(os.path.join(diretorio, nome) for nome in os.listdir(diretorio)
+                  if nome.endswith(".txt"))
+
+
+def processar_circuito(arquivo):
+    """Compila e simula um arquivo com os valores iniciais; retorna um resumo (dict)"""
+    inicio = time.perf_counter()
+    resumo = {"arquivo": arquivo, "nome": None, "ok": False, "erros": [], "avisos": [],
+              "portas": 0, "saidas": {}, "tempo": 0.0}
+
+    try:
+        with open(arquivo, "r", encoding="utf-8") as f:
+            data = f.read()
+    except OSError as e:
+        resumo["erros"].append(f"Erro ao ler o arquivo: {e}")
+        return resumo
+
+    circ = analisar(data, verbose=False)
+    resumo["nome"] = circ.nome
+    resumo["erros"].extend(circ.erros_analise)
+    resumo["avisos"].extend(circ.avisos_analise)
+    if circ.nome is None:
+        if not resumo["erros"]:
+            resumo["erros"].append("Circuito não foi definido corretamente")
+    else:
+        compilado = obter_compilado(circ)
+        resumo["portas"] = len(compilado.nomes_portas)
+        resumo["erros"].extend(compilado.erros)
+        if not resumo["erros"]:
+            valores = avaliar_compilado(compilado, [circ.entradas[nome].valor for nome in compilado.nomes_entradas])
+            resumo["saidas"] = {nome: valores[net] if net >= 0 else None
+                                for nome, net in zip(compilado.nomes_saidas, compilado.drivers_saidas)}
+            if compilado.nao_ordenadas:
+                nomes = [compilado.nomes_portas[g] for g in compilado.nao_ordenadas]
+                resumo["avisos"].append(f"Portas não processadas: {nomes}")
+
+    resumo["ok"] = not resumo["erros"]
+    resumo["tempo"] = time.perf_counter() - inicio
+    return resumo
+
+
+def processar_lote(arquivos, jobs=None):
+    """Processa vários arquivos em paralelo, gerando os resumos na ordem recebida"""
+    jobs = numero_de_jobs(jobs)
+    if jobs == 1 or len(arquivos) <= 1:
+        yield from map(processar_circuito, arquivos)
+        return
+
+    with ProcessPoolExecutor(jobs) as executor:
+        yield from executor.map(processar_circuito, arquivos, chunksize=max(1, len(arquivos) // (jobs * 4)))
+
+
+def imprimir_resumo_lote(resultados):
+    """Imprime cada resultado e o resumo agregado; retorna o número de falhas"""
+    total = falhas = portas = 0
+    tempo = 0.0
+    for resultado in resultados:
+        total += 1
+        portas += resultado["portas"]
+        tempo += resultado["tempo"]
+        if resultado["ok"]:
+            saidas = ", ".join(f"{nome}={texto_valor(valor)}" for nome, valor in resultado["saidas"].items())
+            print(f"  OK    {resultado['arquivo']} ({resultado['nome']}): {saidas}")
+        else:
+            falhas += 1
+            print(f"  FALHA {resultado['arquivo']}")
+            for erro in resultado["erros"]:
+                print(f"          - {erro}")
+        for aviso in resultado["avisos"]:
+            # Avisos da análise já vêm como "Aviso (linha N): ..."
+            print(f"          {aviso}" if aviso.startswith("Aviso") else f"          Aviso: {aviso}")
+
+    print(f"\n=== RESUMO DO LOTE ===")
+    print(f"  Arquivos: {total} | OK: {total - falhas} | Falhas: {falhas}")
+    print(f"  Portas compiladas: {portas} | Tempo somado dos arquivos: {tempo:.2f}s")
+    return falhas
@@ -0,0 +1,236 @@
+# =======================
+# MINIMIZAÇÃO LÓGICA (SOMA DE PRODUTOS)
+# =======================
+#
+# Uma função de n variáveis é um inteiro de 2^n bits (bit k = valor na linha
+# k, com a variável 0 no bit mais significativo de k, como no lookup das
+# portas). Um cubo (mascara, valor) é um produto de literais: a variável i
+# aparece se o bit n-1-i da mascara está ligado, negada se o mesmo bit de
+# valor está desligado.
+#
+# Até LIMITE_EXATO variáveis os implicantes primos são gerados pelo método
+# de Quine–McCluskey; acima disso, cada mintermo ainda não coberto é
+# expandido literal a literal enquanto o cubo couber na função (EXPAND do
+# Espresso), o que escala para portas com 10+ entradas. Nos dois casos a
+# cobertura termina com a remoção dos cubos redundantes (IRREDUNDANT).
+
+from .bitparalelo import padrao_entrada
+from .primitivas import TabelaCubos
+
+LIMITE_EXATO = 8
+# Nos relatórios, só funções com até este número de variáveis são minimizadas
+# (tabelas de portas e funções das saídas sobre as entradas do circuito)
+LIMITE_ENTRADAS_MINIMIZACAO = 12
+# Somas com mais produtos do que isto aparecem resumidas nos relatórios
+LIMITE_TERMOS_EXIBIDOS = 64
+
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+_MINIMIZADAS = {}  # lookup -> cubos (os lookups são internados pelo compilador)
+LIMITE_MINIMIZADAS = 65536
+
+
+def _padroes(n):
+    """Para cada variável, o conjunto das linhas em que ela vale 1"""
+    return [padrao_entrada(n - 1 - i, n) for i in range(n)]
+
+
+def funcao_do_lookup(lookup):
+    """Converte um lookup denso (um byte por linha) na função como inteiro"""
+    return int(bytes(lookup[::-1]).translate(_BITS), 2)
+
+
+def conjunto_do_cubo(cubo, n, padroes=None):
+    """Linhas cobertas por um cubo, como inteiro de 2^n bits"""
+    if padroes is None:
+        padroes = _padroes(n)
+    mascara, valor = cubo
+    total = (1 << (1 << n)) - 1
+    conjunto = total
+    for i in range(n):
+        bit = 1 << (n - 1 - i)
+        if mascara & bit:
+            conjunto &= padroes[i] if valor & bit else total ^ padroes[i]
+    return conjunto
+
+
+def _primos_quine_mccluskey(funcao, n):
+    """Todos os implicantes primos da função, combinando cubos adjacentes"""
+    todos = (1 << n) - 1
+    atuais = {(todos, k) for k in range(1 << n) if (funcao >> k) & 1}
+    primos = set()
+    while atuais:
+        proximos = set()
+        usados = set()
+        por_mascara = {}
+        for cubo in atuais:
+            por_mascara.setdefault(cubo[0], set()).add(cubo[1])
+        for mascara, valores in por_mascara.items():
+            for valor in valores:
+                bits = mascara
+                while bits:
+                    bit = bits & -bits
+                    bits ^= bit
+                    if not valor & bit and (valor | bit) in valores:
+                        proximos.add((mascara ^ bit, valor))
+                        usados.add((mascara, valor))
+                        usados.add((mascara, valor | bit))
+        primos |= atuais - usados
+        atuais = proximos
+    return sorted(primos)
+
+
+def _expandir(linha, permitido, n, padroes, total):
+    """Expande o mintermo linha, removendo literais enquanto o cubo couber em permitido"""
+    mascara = (1 << n) - 1
+    conjunto = 1 << linha
+    for i in range(n):
+        deslocamento = 1 << (n - 1 - i)
+        vizinhos = ((conjunto & padroes[i]) >> deslocamento) | ((conjunto & (total ^ padroes[i])) << deslocamento)
+        if not vizinhos & ~permitido:
+            conjunto |= vizinhos
+            mascara &= ~(1 << (n - 1 - i))
+    return (mascara, linha & mascara), conjunto
+
+
+def _irredundante(cubos, conjuntos, funcao):
+    """Remove, do último para o primeiro, os cubos cobertos pelos demais"""
+    prefixos = [0]
+    for conjunto in conjuntos:
+        prefixos.append(prefixos[-1] | conjunto)
+    mantidos = []
+    sufixo = 0
+    for i in range(len(cubos) - 1, -1, -1):
+        if (conjuntos[i] & funcao) & ~(prefixos[i] | sufixo):
+            mantidos.append(cubos[i])
+            sufixo |= conjuntos[i]
+    mantidos.reverse()
+    return mantidos
+
+
+def _ordenar(cubos):
+    return sorted(cubos, key=lambda cubo: (-cubo[0], cubo[1]))
+
+
+def minimizar_funcao(funcao, n):
+    """Soma de produtos mínima (ou quase) de uma função de n variáveis
+
+    Retorna uma lista de cubos, com os literais das primeiras variáveis
+    primeiro; [] é a constante 0 e [(0, 0)] a constante 1.
+    """
+    total = (1 << (1 << n)) - 1
+    funcao &= total
+    if funcao == 0:
+        return []
+    if funcao == total:
+        return [(0, 0)]
+    padroes = _padroes(n)
+
+    if n <= LIMITE_EXATO:
+        primos = _primos_quine_mccluskey(funcao, n)
+        conjuntos = [conjunto_do_cubo(cubo, n, padroes) for cubo in primos]
+        # Primos essenciais primeiro, depois os que cobrem mais linhas ainda descobertas
+        restante = funcao
+        cubos, escolhidos = [], []
+        for k in range(1 << n):
+            if (restante >> k) & 1:
+                cobrem = [i for i, conjunto in enumerate(conjuntos) if (conjunto >> k) & 1]
+                if len(cobrem) == 1:
+                    cubos.append(primos[cobrem[0]])
+                    escolhidos.append(conjuntos[cobrem[0]])
+                    restante &= ~conjuntos[cobrem[0]]
+        while restante:
+            i = max(range(len(primos)), key=lambda i: bin(conjuntos[i] & restante).count("1"))
+            cubos.append(primos[i])
+            escolhidos.append(conjuntos[i])
+            restante &= ~conjuntos[i]
+        return _ordenar(_irredundante(cubos, escolhidos, funcao))
+
+    cubos, conjuntos = [], []
+    restante = funcao
+    while restante:
+        cubo, conjunto = _expandir(restante.bit_length() - 1, funcao, n, padroes, total)
+        cubos.append(cubo)
+        conjuntos.append(conjunto)
+        restante &= ~conjunto
+    return _ordenar(_irredundante(cubos, conjuntos, funcao))
+
+
+def minimizar_lookup(lookup):
+    """Cubos da forma mínima da tabela de uma porta (memorizado por lookup)"""
+    cubos = _MINIMIZADAS.get(lookup)
+    if cubos is None:
+        n = len(lookup).bit_length() - 1
+        cubos = minimizar_funcao(funcao_do_lookup(lookup), n)
+        if len(_MINIMIZADAS) < LIMITE_MINIMIZADAS:
+            _MINIMIZADAS[lookup] = cubos
+    return cubos
+
+
+def formatar_soma(cubos, nomes):
+    """Escreve os cubos como soma de produtos legível, por exemplo "A·B' + C" """
+    if not cubos:
+        return "0"
+    if len(cubos) > LIMITE_TERMOS_EXIBIDOS:
+        return f"soma de {len(cubos)} produtos (longa demais para exibir)"
+    n = len(nomes)
+    termos = []
+    for mascara, valor in cubos:
+        literais = [nome if valor >> (n - 1 - i) & 1 else f"{nome}'"
+                    for i, nome in enumerate(nomes) if mascara >> (n - 1 - i) & 1]
+        termos.append("·".join(literais) or "1")
+    return " + ".join(termos)
+
+
+def _forma_tabela_cubos(tabela):
+    """Expressão de uma porta larga: a primitiva aplicada aos pinos ou a soma dos seus cubos"""
+    nomes = [f"e{i}" for i in range(tabela.entradas)]
+    if tabela.base is None:
+        return formatar_soma(tabela.cubos, nomes)
+    if tabela.entradas > LIMITE_TERMOS_EXIBIDOS:
+        nomes = nomes[:2] + ["..."] + nomes[-1:]
+    return f"{tabela.nome}({', '.join(nomes)})"
+
+
+def forma_minima_porta(lookup):
+    """Soma de produtos da tabela de uma porta, com os pinos e0, e1, ...
+
+    Retorna None para tabelas densas com mais de LIMITE_ENTRADAS_MINIMIZACAO
+    pinos; portas largas (TabelaCubos) aparecem como a primitiva ou a soma
+    dos cubos da tabela, sem minimizar.
+    """
+    if isinstance(lookup, TabelaCubos):
+        return _forma_tabela_cubos(lookup)
+    n = len(lookup).bit_length() - 1
+    if n > LIMITE_ENTRADAS_MINIMIZACAO:
+        return None
+    return formatar_soma(minimizar_lookup(lookup), [f"e{i}" for i in range(n)])
+
+
+def funcoes_saidas(compilado):
+    """Função de cada saída sobre as entradas do circuito (None se indefinida)
+
+    Só é calculada até LIMITE_ENTRADAS_MINIMIZACAO entradas; acima disso,
+    ou com erros no circuito, retorna None.
+    """
+    if compilado.erros or compilado.num_entradas > LIMITE_ENTRADAS_MINIMIZACAO:
+        return None
+    from .bitparalelo import tabela_verdade_exaustiva
+    funcoes = [0] * len(compilado.nomes_saidas)
+    for inicio, _, palavras in tabela_verdade_exaustiva(compilado):
+        for s, palavra in enumerate(palavras):
+            if palavra is None or funcoes[s] is None:
+                funcoes[s] = None
+            else:
+                funcoes[s] |= palavra << inicio
+    return funcoes
+
+
+def expressoes_saidas(compilado):
+    """Lista de (nome da saída, soma de produtos) ou None se o circuito é grande demais"""
+    funcoes = funcoes_saidas(compilado)
+    if funcoes is None:
+        return None
+    n = compilado.num_entradas
+    return [(nome, "indefinida" if funcao is None
+             else formatar_soma(minimizar_funcao(funcao, n), compilado.nomes_entradas))
+            for nome, funcao in zip(compilado.nomes_saidas, funcoes)]
@@ -1,15 +1,38 @@
 # =======================
 # ESTRUTURAS DE DADOS
 # =======================
+#
+# Os componentes usam __slots__: circuitos grandes têm centenas de milhares
+# de portas e conexões, e um __dict__ por objeto dominaria a memória.
+
+
+def texto_valor(valor):
+    """Valor de um sinal para exibição: 0, 1 ou X (None, desconhecido ou não simulado)"""
+    return "X" if valor is None else str(valor)
+
+
+def texto_valores(valores):
+    """Lista de valores de sinal para exibição, como [1, X, 0]"""
+    return "[" + ", ".join(map(texto_valor, valores)) + "]"
+
 
 class Porta:
-    """Representa uma porta lógica no circuito"""
-    def __init__(self, tipo, nome, entradas, saidas, tabela):
+    """Representa uma porta lógica no circuito
+
+    tabela e lookup são compartilhados entre portas com a mesma tabela
+    verdade (ver compiler.internar_tabela) e não devem ser alterados.
+    """
+    __slots__ = ("tipo", "nome", "entradas", "saidas", "tabela", "lookup",
+                 "valores_entradas", "valor_saida", "processada", "linha")
+
+    def __init__(self, tipo, nome, entradas, saidas, tabela, lookup=None, linha=None):
         self.tipo = tipo
         self.nome = nome
         self.entradas = entradas
         self.saidas = saidas
         self.tabela = tabela
+        self.lookup = lookup  # Tabela compilada: saída indexada pelos bits de entrada
+        self.linha = linha  # Linha da definição no código fonte (None se montada sem o parser)
         self.valores_entradas = [None] * entradas
         self.valor_saida = None
         self.processada = False
@@ -18,17 +41,22 @@ class Porta:
         return all(v is not None for v in self.valores_entradas)
 
     def reset(self):
-        """Reseta o estado da porta para nova simulação"""
-        self.valores_entradas = [None] * self.entradas
+        """Reseta o estado da porta para nova simulação, reaproveitando a lista"""
+        valores = self.valores_entradas
+        for i in range(len(valores)):
+            valores[i] = None
         self.valor_saida = None
         self.processada = False
 
     def __str__(self):
-        return f"Porta {self.nome} ({self.tipo}) - Entradas: {self.valores_entradas}, Saída: {self.valor_saida}"
+        return (f"Porta {self.nome} ({self.tipo}) - Entradas: {texto_valores(self.valores_entradas)}, "
+                f"Saída: {texto_valor(self.valor_saida)}")
 
 
 class Entrada:
     """Representa uma entrada do circuito"""
+    __slots__ = ("nome", "valor", "valor_original")
+
     def __init__(self, nome, valor):
         self.nome = nome
         self.valor = valor
@@ -39,11 +67,13 @@ class Entrada:
         self.valor = self.valor_original
 
     def __str__(self):
-        return f"Entrada {self.nome} = {self.valor}"
+        return f"Entrada {self.nome} = {texto_valor(self.valor)}"
 
 
 class Saida:
     """Representa uma saída do circuito"""
+    __slots__ = ("nome", "valor")
+
     def __init__(self, nome):
         self.nome = nome
         self.valor = None
@@ -53,19 +83,41 @@ class Saida:
         self.valor = None
 
     def __str__(self):
-        return f"Saída {self.nome} = {self.valor}"
+        return f"Saída {self.nome} = {texto_valor(self.valor)}"
 
 
 class Conexao:
     """Representa uma conexão entre componentes"""
-    def __init__(self, origem, destino):
+    __slots__ = ("origem", "destino", "linha")
+
+    def __init__(self, origem, destino, linha=None):
         self.origem = origem
         self.destino = destino
+        self.linha = linha  # Linha no código fonte (None se montada sem o parser)
 
     def __str__(self):
         return f"{self.origem} -> {self.destino}"
 
 
+class Modulo:
+    """Subcircuito reutilizável, definido uma vez e instanciado por nome
+
+    Tem os mesmos blocos de um circuito; suas entradas e saídas são os
+    pinos das instâncias.
+    """
+    def __init__(self, nome):
+        self.nome = nome
+        self.portas = {}
+        self.entradas = {}
+        self.saidas = {}
+        self.conexoes = []
+        self.instancias = {}  # nome da instância -> (nome do módulo, linha)
+
+    def __str__(self):
+        return (f"Módulo {self.nome} - Entradas: {list(self.entradas)}, Saídas: {list(self.saidas)}, "
+                f"{len(self.portas)} portas, {len(self.instancias)} instâncias")
+
+
 class CircuitoState:
     """Gerencia o estado global do circuito"""
     def __init__(self):
@@ -74,6 +126,13 @@ class CircuitoState:
         self.entradas = {}
         self.saidas = {}
         self.conexoes = []
+        self.modulos = {}  # Subcircuitos definidos no arquivo
+        self.instancias = {}  # nome da instância -> (nome do módulo, linha)
+        self.compilado = None  # CircuitoCompilado gerado após a análise
+        self.valores_nets = None  # Valor de cada net na última simulação
+        self.atividade = None  # Última estimativa de atividade de chaveamento (atividade.py)
+        self.erros_analise = []  # Erros léxicos, sintáticos e de tabela
+        self.avisos_analise = []  # Avisos emitidos durante a análise
 
     def limpar(self):
         """Limpa todo o estado do circuito"""
@@ -82,6 +141,17 @@ class CircuitoState:
         self.entradas.clear()
         self.saidas.clear()
         self.conexoes.clear()
+        self.modulos = {}
+        self.instancias = {}
+        self.compilado = None
+        self.valores_nets = None
+        self.atividade = None
+        self.erros_analise = []
+        self.avisos_analise = []
+
+    def copiar_de(self, outro):
+        """Substitui todo o estado por o de outro CircuitoState (ex.: vindo do cache)"""
+        self.__dict__.update(outro.__dict__)
 
     def reset_simulacao(self):
         """Reseta apenas o estado de simulação, mantendo a estrutura"""
@@ -91,6 +161,15 @@ class CircuitoState:
             entrada.reset()
         for saida in self.saidas.values():
             saida.reset()
+        self.valores_nets = None
+
+    def definir_entrada(self, nome, valor):
+        """Altera uma entrada re-simulando apenas o seu cone de fan-out
+
+        Retorna o conjunto de saídas cujo valor mudou.
+        """
+        from .simulator import definir_entrada
+        return definir_entrada(nome, valor, self)
 
 
 # Instância global do estado do circuito
@@ -0,0 +1,213 @@
+# =======================
+# OTIMIZAÇÃO DO NETLIST
+# =======================
+#
+# Gera, a partir de um CircuitoCompilado, um netlist equivalente nas saídas
+# com menos portas, para os motores que só observam as saídas (estímulos,
+# tabela verdade, execução paralela). Em uma passada na ordem topológica:
+#
+#   - pinos ligados a constantes são eliminados (cofator da tabela) e portas
+#     que resultam constantes viram portas de 0 pinos
+#   - pinos repetidos são unidos e pinos que não afetam a saída removidos
+#   - portas que copiam um pino (buffers) são substituídas pelo próprio pino
+#   - portas com a mesma tabela e os mesmos drivers são fundidas (CSE)
+#
+# Por fim, portas que não alcançam nenhuma saída são descartadas.
+
+from .compiler import CircuitoCompilado, _construir_fanout, _levelizar, _compactar
+from .estatisticas import cronometrado
+from .primitivas import TabelaCubos
+
+# Acima deste número de pinos a ordem dos pinos não é normalizada para o CSE
+MAX_PINOS_NORMALIZAR = 8
+
+_IDENTIDADE = b"\x00\x01"
+
+
+def _cofator(lookup, n, i, valor):
+    """Fixa o pino i (0 = mais significativo) em valor; retorna a tabela de n - 1 pinos"""
+    deslocamento = n - 1 - i
+    baixo = (1 << deslocamento) - 1
+    return bytes(lookup[((k & ~baixo) << 1) | (valor << deslocamento) | (k & baixo)]
+                 for k in range(1 << (n - 1)))
+
+
+def _igualar(lookup, n, i, j):
+    """Une o pino j ao pino i (i < j), que passam a ter sempre o mesmo valor"""
+    deslocamento = n - 1 - j
+    baixo = (1 << deslocamento) - 1
+    return bytes(lookup[((k & ~baixo) << 1) | (((k >> (n - 2 - i)) & 1) << deslocamento) | (k & baixo)]
+                 for k in range(1 << (n - 1)))
+
+
+def _ordenar(lookup, pinos):
+    """Reordena os pinos em ordem crescente de net, permutando a tabela"""
+    n = len(pinos)
+    ordem = sorted(range(n), key=pinos.__getitem__)
+    if ordem == list(range(n)):
+        return lookup, pinos
+    novo = bytearray(1 << n)
+    for k in range(1 << n):
+        indice = 0
+        for posicao, antigo in enumerate(ordem):
+            indice |= ((k >> (n - 1 - posicao)) & 1) << (n - 1 - antigo)
+        novo[k] = lookup[indice]
+    return bytes(novo), [pinos[antigo] for antigo in ordem]
+
+
+def simplificar_porta(lookup, pinos, constantes):
+    """Reduz uma porta dados os valores constantes conhecidos de algumas nets
+
+    pinos são as nets de cada pino e constantes mapeia net -> 0/1. Retorna
+    (lookup, pinos) equivalente sem pinos constantes, repetidos ou
+    irrelevantes; com 0 pinos, a porta é a constante lookup[0]. Portas
+    largas (TabelaCubos) só perdem os pinos constantes.
+    """
+    pinos = list(pinos)
+    i = 0
+    while i < len(pinos):
+        if pinos[i] in constantes:
+            if isinstance(lookup, TabelaCubos):
+                lookup = lookup.cofator(i, constantes[pinos[i]])
+            else:
+                lookup = _cofator(lookup, len(pinos), i, constantes[pinos[i]])
+            del pinos[i]
+        else:
+            i += 1
+
+    if isinstance(lookup, TabelaCubos):
+        constante = lookup.constante()
+        if constante is not None:
+            return bytes([constante]), []
+        return lookup, pinos
+
+    if len(pinos) <= MAX_PINOS_NORMALIZAR:
+        lookup, pinos = _ordenar(lookup, pinos)
+
+    i = 0
+    while i < len(pinos):
+        j = pinos.index(pinos[i], i + 1) if pinos.count(pinos[i]) > 1 else -1
+        if j > 0:
+            lookup = _igualar(lookup, len(pinos), i, j)
+            del pinos[j]
+        else:
+            i += 1
+
+    i = 0
+    while i < len(pinos):
+        zero = _cofator(lookup, len(pinos), i, 0)
+        if zero == _cofator(lookup, len(pinos), i, 1):
+            lookup = zero
+            del pinos[i]
+        else:
+            i += 1
+    return lookup, pinos
+
+
+@cronometrado("otimizacao")
+def otimizar_compilado(compilado):
+    """Retorna (netlist otimizado, relatório) com as mesmas entradas e saídas
+
+    Netlists com erros ou portas não ordenáveis são devolvidos sem mudanças.
+    O relatório é um dict com a contagem de portas de cada transformação.
+    """
+    originais = len(compilado.nomes_portas)
+    relatorio = {"originais": originais, "finais": originais, "constantes": 0,
+                 "buffers": 0, "duplicadas": 0, "mortas": 0, "pinos_removidos": 0}
+    if compilado.erros or compilado.nao_ordenadas:
+        return compilado, relatorio
+
+    base = compilado.num_entradas
+    # Netlist intermediário: nets 0..E-1 são as entradas; novas portas a partir de E
+    mapa = list(range(base)) + [None] * originais  # net original -> net nova
+    constantes = {}                                 # net nova -> valor
+    portas = []                                     # (porta original, lookup, pinos)
+    vistas = {}                                     # (lookup, pinos) -> net nova
+    portas_constantes = {}                          # valor -> net nova
+
+    def net_constante(valor):
+        if valor not in portas_constantes:
+            portas_constantes[valor] = base + len(portas)
+            constantes[base + len(portas)] = valor
+            portas.append((None, bytes([valor]), ()))
+        return portas_constantes[valor]
+
+    for g in compilado.ordem:
+        pinos_originais = compilado.pinos_portas[g]
+        pinos = [mapa[net] for net in pinos_originais]
+        lookup, pinos = simplificar_porta(compilado.tabelas[g], pinos, constantes)
+        relatorio["pinos_removidos"] += len(pinos_originais) - len(pinos)
+
+        if not pinos:
+            relatorio["constantes"] += 1
+            mapa[base + g] = net_constante(lookup[0])
+        elif lookup == _IDENTIDADE:
+            relatorio["buffers"] += 1
+            mapa[base + g] = pinos[0]
+        else:
+            chave = (lookup, tuple(pinos))
+            if chave in vistas:
+                relatorio["duplicadas"] += 1
+                mapa[base + g] = vistas[chave]
+            else:
+                vistas[chave] = mapa[base + g] = base + len(portas)
+                portas.append((g, lookup, tuple(pinos)))
+
+    drivers = [mapa[net] if net >= 0 else -1 for net in compilado.drivers_saidas]
+
+    # Eliminação de portas mortas: só o cone de entrada das saídas é mantido
+    vivas = [False] * len(portas)
+    pilha = [net - base for net in drivers if net >= base]
+    while pilha:
+        p = pilha.pop()
+        if not vivas[p]:
+            vivas[p] = True
+            pilha.extend(net - base for net in portas[p][2] if net >= base)
+
+    otimizado = CircuitoCompilado(compilado.nome)
+    otimizado.nomes_entradas = list(compilado.nomes_entradas)
+    otimizado.nomes_saidas = list(compilado.nomes_saidas)
+    renumeracao = list(range(base)) + [-1] * len(portas)
+    for p, (g, lookup, pinos) in enumerate(portas):
+        if not vivas[p]:
+            continue
+        if g is None:
+            nome = f"<constante {lookup[0]}>"
+        else:
+            nome = compilado.nomes_portas[g]
+        renumeracao[base + p] = base + len(otimizado.nomes_portas)
+        otimizado.nomes_portas.append(nome)
+        otimizado.tabelas.append(lookup)
+        otimizado.pinos_portas.append([renumeracao[net] for net in pinos])
+    otimizado.drivers_saidas = [renumeracao[net] if net >= 0 else -1 for net in drivers]
+
+    for i, nome in enumerate(otimizado.nomes_entradas):
+        otimizado.indice_nets[nome] = i
+    for g, nome in enumerate(otimizado.nomes_portas):
+        otimizado.indice_nets[nome] = base + g
+
+    _construir_fanout(otimizado)
+    _levelizar(otimizado)
+    _compactar(otimizado)
+
+    criadas = [vivas[p] for p, (g, _, _) in enumerate(portas) if g is not None]
+    relatorio["mortas"] = criadas.count(False)
+    relatorio["finais"] = len(otimizado.nomes_portas)
+    return otimizado, relatorio
+
+
+def obter_otimizado(compilado):
+    """Retorna (e guarda no compilado) o netlist otimizado e o relatório"""
+    resultado = getattr(compilado, 'otimizado', None)
+    if resultado is None:
+        resultado = otimizar_compilado(compilado)
+        compilado.otimizado = resultado
+    return resultado
+
+
+def resumo_otimizacao(relatorio):
+    """Uma linha descrevendo o que a otimização removeu"""
+    return (f"Otimização: {relatorio['originais']} -> {relatorio['finais']} portas "
+            f"(constantes: {relatorio['constantes']}, buffers: {relatorio['buffers']}, "
+            f"duplicadas: {relatorio['duplicadas']}, sem efeito nas saídas: {relatorio['mortas']}, "
+            f"pinos removidos: {relatorio['pinos_removidos']})")
@@ -0,0 +1,100 @@
+# =======================
+# SIMULAÇÃO PARALELA
+# =======================
+#
+# O circuito compilado (apenas listas, tuplas e bytes) é enviado uma única vez
+# a cada processo de um ProcessPoolExecutor. Cada tarefa recebe uma fatia do
+# espaço de entradas ou um bloco de vetores de estímulo, e os resultados são
+# devolvidos na ordem original. Nenhum processo toca o estado global `circuito`.
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .bitparalelo import tabela_verdade_exaustiva, bits_por_bloco
+from .cache import cache_ativo, desativar_cache
+from .codegen import obter_avaliador
+from .estimulos import agrupar_em_blocos, ordem_das_entradas, simular_bloco, simular_estimulos, TAMANHO_BLOCO
+
+# Vetores de estímulo enviados a um processo por tarefa
+VETORES_POR_TAREFA = 4 * TAMANHO_BLOCO
+
+_compilado = None  # Circuito compilado de cada processo trabalhador
+
+
+def _inicializar_trabalhador(compilado, usar_cache):
+    global _compilado
+    _compilado = compilado
+    if not usar_cache:
+        desativar_cache()  # --no-cache vale também nos trabalhadores
+
+
+def _calcular_fatia_tabela(bits, primeiro, ultimo):
+    return list(tabela_verdade_exaustiva(_compilado, bits, range(primeiro, ultimo)))
+
+
+def _simular_fatia_estimulos(vetores, ordem):
+    resultado = []
+    for bloco in agrupar_em_blocos(vetores, TAMANHO_BLOCO):
+        resultado.extend(simular_bloco(_compilado, bloco, ordem))
+    return resultado
+
+
+def numero_de_jobs(jobs):
+    """Resolve o número de processos (None ou 0 = todos os núcleos)"""
+    return jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+
+
+def _em_ordem(executor, tarefas, max_pendentes):
+    """Submete tarefas (função, *args) com no máximo max_pendentes em andamento
+
+    Os resultados são produzidos na ordem de submissão, o que mantém a
+    memória limitada mesmo para fluxos muito longos.
+    """
+    pendentes = deque()
+    for funcao, *args in tarefas:
+        pendentes.append(executor.submit(funcao, *args))
+        if len(pendentes) >= max_pendentes:
+            yield pendentes.popleft().result()
+    while pendentes:
+        yield pendentes.popleft().result()
+
+
+def _executor(compilado, jobs):
+    # Código gerado uma vez e enviado com o compilado; o bytecode fica no cache em disco
+    obter_avaliador(compilado)
+    return ProcessPoolExecutor(jobs, initializer=_inicializar_trabalhador, initargs=(compilado, cache_ativo()))
+
+
+def tabela_verdade_paralela(compilado, jobs=None, bits=None):
+    """Versão paralela de tabela_verdade_exaustiva, com os blocos na mesma ordem"""
+    jobs = numero_de_jobs(jobs)
+    n = compilado.num_entradas
+    bits = min(bits if bits is not None else bits_por_bloco(compilado), n)
+    total = 1 << (n - bits)
+    if jobs == 1 or total == 1:
+        yield from tabela_verdade_exaustiva(compilado, bits)
+        return
+
+    por_fatia = max(1, total // (jobs * 4))
+    tarefas = ((_calcular_fatia_tabela, bits, primeiro, min(primeiro + por_fatia, total))
+               for primeiro in range(0, total, por_fatia))
+    with _executor(compilado, jobs) as executor:
+        for fatia in _em_ordem(executor, tarefas, jobs * 2):
+            yield from fatia
+
+
+def simular_estimulos_paralelo(compilado, nomes, vetores, jobs=None):
+    """Versão paralela de simular_estimulos, com as saídas na ordem dos vetores"""
+    jobs = numero_de_jobs(jobs)
+    if jobs == 1:
+        return simular_estimulos(compilado, nomes, vetores)
+    ordem = ordem_das_entradas(compilado, nomes)
+    return _simular_estimulos_paralelo(compilado, vetores, ordem, jobs)
+
+
+def _simular_estimulos_paralelo(compilado, vetores, ordem, jobs):
+    tarefas = ((_simular_fatia_estimulos, fatia, ordem)
+               for fatia in agrupar_em_blocos(vetores, VETORES_POR_TAREFA))
+    with _executor(compilado, jobs) as executor:
+        for resultado in _em_ordem(executor, tarefas, jobs * 2):
+            yield from resultado
@@ -2,9 +2,15 @@
 # ANÁLISE SINTÁTICA
 # =======================
 
+import copy
+import time
 import ply.yacc as yacc
-from .lexer import tokens  # noqa: F401 - necessário para o PLY
-from .models import Porta, Entrada, Saida, Conexao, circuito
+from .lexer import lexer, tokens  # noqa: F401 - tokens é necessário para o PLY
+from .models import Porta, Entrada, Saida, Conexao, Modulo, CircuitoState, circuito
+from .compiler import internar_tabela, compilar_primitiva
+from .primitivas import PRIMITIVAS, largura_tabela
+from .hierarquia import expandir_instancias
+from .estatisticas import estatisticas
 
 # Precedência para resolver conflitos
 precedence = (
@@ -12,10 +18,71 @@ precedence = (
 )
 
 
+# Cada análise escreve no CircuitoState associado ao parser (p.parser.circuito).
+# O parser global usa o estado global; analisar() usa uma cópia do parser
+# ligada a um CircuitoState novo, o que permite várias análises independentes.
+# Durante a definição de um módulo, os blocos vão para p.parser.modulo.
+
+def _destino(p):
+    """Módulo em definição ou, fora de um módulo, o próprio circuito"""
+    return p.parser.modulo or p.parser.circuito
+
+
+def _informar(p, mensagem):
+    if p.parser.verbose:
+        print(mensagem)
+
+
+def _aviso(p, mensagem):
+    p.parser.circuito.avisos_analise.append(mensagem)
+    if p.parser.verbose:
+        print(mensagem)
+
+
+def _erro(p, mensagem):
+    p.parser.circuito.erros_analise.append(mensagem)
+    if p.parser.verbose:
+        print(mensagem)
+
+
 def p_circuito(p):
-    'circuito : CIRCUITO IDENT LCURL blocos RCURL'
-    circuito.nome = p[2]
-    print(f"Circuito '{p[2]}' definido com sucesso!")
+    '''circuito : modulos CIRCUITO IDENT LCURL inicio_circuito blocos RCURL
+                | CIRCUITO IDENT LCURL inicio_circuito blocos RCURL'''
+    circ = p.parser.circuito
+    nome = p[len(p) - 5]
+    if circ.instancias:
+        for erro in expandir_instancias(circ):
+            _erro(p, erro)
+    circ.nome = nome
+    _informar(p, f"Circuito '{nome}' definido com sucesso!")
+
+
+def p_inicio_circuito(p):
+    'inicio_circuito :'
+    p.parser.modulo = None
+
+
+def p_modulos(p):
+    '''modulos : modulos modulo_def
+               | modulo_def'''
+    pass
+
+
+def p_modulo_def(p):
+    'modulo_def : MODULO IDENT LCURL inicio_modulo blocos RCURL'
+    modulo = p.parser.modulo
+    p.parser.modulo = None
+    if modulo.nome in p.parser.circuito.modulos:
+        _erro(p, f"Erro (linha {p.lineno(1)}): módulo '{modulo.nome}' definido mais de uma vez")
+        return
+    p.parser.circuito.modulos[modulo.nome] = modulo
+    _informar(p, f"Módulo {modulo.nome} definido: entradas {list(modulo.entradas)}, "
+                 f"saídas {list(modulo.saidas)}")
+
+
+def p_inicio_modulo(p):
+    'inicio_modulo :'
+    p.parser.modulo = Modulo(p[-2])
 
 
 def p_blocos(p):
@@ -28,25 +95,51 @@ def p_bloco(p):
     '''bloco : porta_logica_def
              | entrada_def
              | saida_def
-             | conexao_def'''
+             | conexao_def
+             | instancia_def'''
     pass
 
 
 def p_porta_logica_def(p):
-    'porta_logica_def : PORTA_LOGICA IDENT IDENT LCURL porta_props RCURL'
+    '''porta_logica_def : PORTA_LOGICA IDENT IDENT LCURL porta_props RCURL
+                        | PORTA_LOGICA IDENT IDENT LCURL RCURL'''
     tipo, nome = p[2], p[3]
-    props = p[5]
+    props = p[5] if len(p) == 7 else {}
+
+    if 'tabela_verdade' not in props and tipo.upper() in PRIMITIVAS:
+        # Primitiva sem tabela: avaliada pelas operações bit a bit da própria função
+        entradas_num = props.get('numero_de_entradas')
+        lookup, erros = compilar_primitiva(nome, tipo, entradas_num, props.get('numero_de_saidas'))
+        if erros:
+            for erro in erros:
+                _erro(p, f"Erro (linha {p.lineno(1)}): {erro}")
+            return
+        entradas_num = largura_tabela(lookup)
+        _destino(p).portas[nome] = Porta(tipo, nome, entradas_num, 1, (), lookup, p.lineno(1))
+        _informar(p, f"Porta lógica {nome} ({tipo}, primitiva de {entradas_num} entradas) definida")
+        return
 
     if 'numero_de_entradas' not in props or 'numero_de_saidas' not in props or 'tabela_verdade' not in props:
-        print(f"Erro: Porta {nome} deve ter numero_de_entradas, numero_de_saidas e tabela_verdade")
+        _erro(p, f"Erro: Porta {nome} deve ter numero_de_entradas, numero_de_saidas e tabela_verdade "
+                 f"(ou ser uma primitiva: {', '.join(PRIMITIVAS)})")
         return
 
     entradas_num = props['numero_de_entradas']
     saidas_num = props['numero_de_saidas']
     tabela = props['tabela_verdade']
 
-    circuito.portas[nome] = Porta(tipo, nome, entradas_num, saidas_num, tabela)
-    print(f"Porta lógica {nome} ({tipo}) definida")
+    # Compila a tabela em um vetor denso, acusando problemas já na análise;
+    # tabelas iguais são compiladas uma vez e compartilhadas entre as portas
+    tabela, lookup, erros, avisos = internar_tabela(nome, entradas_num, saidas_num, tabela)
+    for aviso in avisos:
+        _aviso(p, f"Aviso (linha {p.lineno(1)}): {aviso}")
+    if erros:
+        for erro in erros:
+            _erro(p, f"Erro (linha {p.lineno(1)}): {erro}")
+        return
+
+    _destino(p).portas[nome] = Porta(tipo, nome, entradas_num, saidas_num, tabela, lookup, p.lineno(1))
+    _informar(p, f"Porta lógica {nome} ({tipo}) definida")
 
 
 def p_porta_props(p):
@@ -85,40 +178,68 @@ def p_linha_tabela(p):
 
 
 def p_lista_bits(p):
-    '''lista_bits : lista_bits NUM
-                  | NUM'''
+    '''lista_bits : lista_bits bit
+                  | bit'''
     if len(p) == 3:
         p[0] = p[1] + [p[2]]
     else:
         p[0] = [p[1]]
 
 
+def p_bit(p):
+    '''bit : NUM
+           | IDENT'''
+    # x (qualquer valor) vira None; outros nomes são rejeitados por compilar_tabela
+    p[0] = None if p[1] in ('x', 'X') else p[1]
+
+
 def p_entrada_def(p):
-    'entrada_def : ENTRADA IDENT LCURL linha_entrada RCURL'
+    '''entrada_def : ENTRADA IDENT LCURL linha_entrada RCURL
+                   | ENTRADA IDENT LCURL RCURL'''
     nome = p[2]
-    valor = p[4]['valor_inicial']
-    circuito.entradas[nome] = Entrada(nome, valor)
-    print(f"Entrada {nome} = {valor} definida")
+    valor = p[4]['valor_inicial'] if len(p) == 6 else 0
+    _destino(p).entradas[nome] = Entrada(nome, valor)
+    _informar(p, f"Entrada {nome} = {'X' if valor is None else valor} definida")
 
 
 def p_linha_entrada(p):
-    'linha_entrada : VALOR_INICIAL NUM'
-    p[0] = {'valor_inicial': p[2]}
+    '''linha_entrada : VALOR_INICIAL NUM
+                     | VALOR_INICIAL IDENT'''
+    valor = p[2]
+    if isinstance(valor, str):
+        if valor.lower() != 'x':
+            _erro(p, f"Erro (linha {p.lineno(1)}): valor_inicial deve ser 0, 1 ou x, não '{valor}'")
+        valor = None  # X: valor desconhecido
+    elif valor not in (0, 1):
+        _erro(p, f"Erro (linha {p.lineno(1)}): valor_inicial deve ser 0, 1 ou x, não '{valor}'")
+        valor = 0
+    p[0] = {'valor_inicial': valor}
 
 
 def p_saida_def(p):
     'saida_def : SAIDA IDENT LCURL RCURL'
     nome = p[2]
-    circuito.saidas[nome] = Saida(nome)
-    print(f"Saída {nome} definida")
+    _destino(p).saidas[nome] = Saida(nome)
+    _informar(p, f"Saída {nome} definida")
 
 
 def p_conexao_def(p):
     'conexao_def : CONEXAO CONECTAR origem ARROW destino'
     origem = p[3]
     destino = p[5]
-    circuito.conexoes.append(Conexao(origem, destino))
-    print(f"Conexão: {origem} -> {destino}")
+    _destino(p).conexoes.append(Conexao(origem, destino, p.lineno(1)))
+    _informar(p, f"Conexão: {origem} -> {destino}")
+
+
+def p_instancia_def(p):
+    'instancia_def : INSTANCIA IDENT IDENT'
+    tipo, nome = p[2], p[3]
+    destino = _destino(p)
+    if nome in destino.instancias:
+        _erro(p, f"Erro (linha {p.lineno(1)}): instância '{nome}' definida mais de uma vez")
+        return
+    destino.instancias[nome] = (tipo, p.lineno(1))
+    _informar(p, f"Instância {nome} do módulo {tipo}")
 
 
 def p_origem(p):
@@ -135,19 +256,77 @@ def p_destino(p):
     p[0] = f"{p[1]}.{p[3]}"
 
 
-def p_error(p):
+def _erro_sintatico(circ, verbose, p):
     if p:
-        print(f"Erro sintático na linha {p.lineno}: token inesperado '{p.value}'")
+        mensagem = f"Erro sintático na linha {p.lineno}: token inesperado '{p.value}'"
     else:
-        print("Erro sintático: final de arquivo inesperado")
+        mensagem = "Erro sintático: final de arquivo inesperado"
+    circ.erros_analise.append(mensagem)
+    if verbose:
+        print(mensagem)
 
 
-import os
+def p_error(p):
+    _erro_sintatico(circuito, True, p)
 
-# Diretório para arquivos de cache do parser
-_cache_dir = os.path.join(os.path.dirname(__file__), '__pycache__')
-os.makedirs(_cache_dir, exist_ok=True)
 
-# Cria o parser
-parser = yacc.yacc(start='circuito', outputdir=_cache_dir, debuglog=None, errorlog=None)
+import os
+
+# Cria o parser a partir da tabela LALR pré-gerada (src/parsetab.py). O PLY
+# compara a assinatura da gramática e só regenera a tabela se ela mudou.
+parser = yacc.yacc(start='circuito', tabmodule=f"{__package__}.parsetab",
+                   outputdir=os.path.dirname(os.path.abspath(__file__)), debug=False, errorlog=None)
+parser.circuito = circuito
+parser.modulo = None
+parser.verbose = True
+
+
+def analisar(data, circ=None, verbose=True, mostrar_tokens=False):
+    """Analisa o código fonte em uma única passada e retorna o CircuitoState preenchido
+
+    Sem circ, cria um CircuitoState novo e independente do estado global.
+    Erros ficam em circ.erros_analise e avisos em circ.avisos_analise;
+    mostrar_tokens imprime cada token à medida que o parser o consome.
+    """
+    if circ is None:
+        circ = CircuitoState()
+
+    analisador_lexico = lexer.clone()
+    analisador_lexico.lineno = 1
+    analisador_lexico.circuito = circ
+    analisador_lexico.verbose = verbose
+    if mostrar_tokens:
+        proximo_token = analisador_lexico.token
+
+        def token():
+            tok = proximo_token()
+            if tok:
+                print(f"  {tok.type}: {tok.value}")
+            return tok
+        analisador_lexico.token = token
+
+    tempo_lexico = [0.0]
+    if estatisticas.ativa:
+        # O PLY pede os tokens sob demanda: o tempo do lexer é medido token a token
+        estatisticas.adicionar_tempo("analise_lexica", 0.0)
+        token_sem_medida = analisador_lexico.token
+        relogio = time.perf_counter
+
+        def token():
+            inicio = relogio()
+            tok = token_sem_medida()
+            tempo_lexico[0] += relogio() - inicio
+            return tok
+        analisador_lexico.token = token
+
+    analisador = copy.copy(parser)
+    analisador.circuito = circ
+    analisador.modulo = None
+    analisador.verbose = verbose
+    analisador.errorfunc = lambda p: _erro_sintatico(circ, verbose, p)
+    with estatisticas.fase("analise_sintatica"):
+        analisador.parse(data, lexer=analisador_lexico)
+    if estatisticas.ativa:
+        estatisticas.transferir_tempo("analise_sintatica", "analise_lexica", tempo_lexico[0])
+    return circ
 
@@ -0,0 +1,71 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'circuitoleftARROWARROW CIRCUITO CONECTAR CONEXAO DOT ENTRADA IDENT INSTANCIA LCURL MODULO NUM NUMERO_DE_ENTRADAS NUMERO_DE_SAIDAS PORTA_LOGICA RCURL SAIDA TABELA_VERDADE VALOR_INICIALcircuito : modulos CIRCUITO IDENT LCURL inicio_circuito blocos RCURL\n                | CIRCUITO IDENT LCURL inicio_circuito blocos RCURLinicio_circuito :modulos : modulos modulo_def\n               | modulo_defmodulo_def : MODULO IDENT LCURL inicio_modulo blocos RCURLinicio_modulo :blocos : blocos bloco\n              | blocobloco : porta_logica_def\n             | entrada_def\n             | saida_def\n             | conexao_def\n             | instancia_defporta_logica_def : PORTA_LOGICA IDENT IDENT LCURL porta_props RCURL\n                        | PORTA_LOGICA IDENT IDENT LCURL RCURLporta_props : porta_props linha_porta\n                   | linha_portalinha_porta : NUMERO_DE_ENTRADAS NUM\n                   | NUMERO_DE_SAIDAS NUMlinha_porta : TABELA_VERDADE LCURL tabela_entradas RCURLtabela_entradas : tabela_entradas linha_tabela\n                       | linha_tabelalinha_tabela : lista_bits ARROW lista_bitslista_bits : lista_bits bit\n                  | bitbit : NUM\n           | IDENTentrada_def : ENTRADA IDENT LCURL linha_entrada RCURL\n                   | ENTRADA IDENT LCURL RCURLlinha_entrada : VALOR_INICIAL NUM\n                     | VALOR_INICIAL IDENTsaida_def : SAIDA IDENT LCURL RCURLconexao_def : CONEXAO CONECTAR origem ARROW destinoinstancia_def : INSTANCIA IDENT IDENTorigem : IDENT DOT IDENT\n              | IDENT DOT SAIDA\n              | IDENT DOT ENTRADAdestino : IDENT DOT IDENT\n               | IDENT DOT SAIDA\n               | IDENT DOT ENTRADA'
+    
+_lr_action_items = {'CIRCUITO':([0,2,4,7,38,],[3,6,-5,-4,-6,]),'MODULO':([0,2,4,7,38,],[5,5,-5,-4,-6,]),'$end':([1,31,39,],[0,-2,-1,]),'IDENT':([3,5,6,24,25,26,28,33,36,37,49,51,52,71,72,73,74,75,76,77,78,83,84,85,86,],[8,9,10,33,34,35,37,40,44,45,61,63,64,78,79,78,-23,78,-26,-27,-28,-22,78,-25,-24,]),'LCURL':([8,9,10,34,35,40,58,],[11,12,13,41,42,46,71,]),'PORTA_LOGICA':([11,12,13,14,15,16,17,18,19,20,21,22,23,29,30,32,45,48,50,54,59,62,67,79,80,81,],[-3,-7,-3,24,24,24,24,-9,-10,-11,-12,-13,-14,24,24,-8,-35,-30,-33,-16,-29,-34,-15,-39,-40,-41,]),'ENTRADA':([11,12,13,14,15,16,17,18,19,20,21,22,23,29,30,32,45,48,50,52,54,59,62,67,72,79,80,81,],[-3,-7,-3,25,25,25,25,-9,-10,-11,-12,-13,-14,25,25,-8,-35,-30,-33,66,-16,-29,-34,-15,81,-39,-40,-41,]),'SAIDA':([11,12,13,14,15,16,17,18,19,20,21,22,23,29,30,32,45,48,50,52,54,59,62,67,72,79,80,81,],[-3,-7,-3,26,26,26,26,-9,-10,-11,-12,-13,-14,26,26,-8,-35,-30,-33,65,-16,-29,-34,-15,80,-39,-40,-41,]),'CONEXAO':([11,12,13,14,15,16,17,18,19,20,21,22,23,29,30,32,45,48,50,54,59,62,67,79,80,81,],[-3,-7,-3,27,27,27,27,-9,-10,-11,-12,-13,-14,27,27,-8,-35,-30,-33,-16,-29,-34,-15,-39,-40,-41,]),'INSTANCIA':([11,12,13,14,15,16,17,18,19,20,21,22,23,29,30,32,45,48,50,54,59,62,67,79,80,81,],[-3,-7,-3,28,28,28,28,-9,-10,-11,-12,-13,-14,28,28,-8,-35,-30,-33,-16,-29,-34,-15,-39,-40,-41,]),'RCURL':([17,18,19,20,21,22,23,29,30,32,41,42,45,46,47,48,50,53,54,55,59,60,61,62,67,68,69,70,73,74,76,77,78,79,80,81,82,83,85,86,],[31,-9,-10,-11,-12,-13,-14,38,39,-8,48,50,-35,54,59,-30,-33,67,-16,-18,-29,-31,-32,-34,-15,-17,-19,-20,82,-23,-26,-27,-28,-39,-40,-41,-21,-22,-25,-24,]),'CONECTAR':([27,],[36,]),'VALOR_INICIAL':([41,],[49,]),'ARROW':([43,64,65,66,75,76,77,78,85,],[51,-36,-37,-38,84,-26,-27,-28,-25,]),'DOT':([44,63,],[52,72,]),'NUMERO_DE_ENTRADAS':([46,53,55,68,69,70,82,],[56,56,-18,-17,-19,-20,-21,]),'NUMERO_DE_SAIDAS':([46,53,55,68,69,70,82,],[57,57,-18,-17,-19,-20,-21,]),'TABELA_VERDADE':([46,53,55,68,69,70,82,],[58,58,-18,-17,-19,-20,-21,]),'NUM':([49,56,57,71,73,74,75,76,77,78,83,84,85,86,],[60,69,70,77,77,-23,77,-26,-27,-28,-22,77,-25,-24,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'circuito':([0,],[1,]),'modulos':([0,],[2,]),'modulo_def':([0,2,],[4,7,]),'inicio_circuito':([11,13,],[14,16,]),'inicio_modulo':([12,],[15,]),'blocos':([14,15,16,],[17,29,30,]),'bloco':([14,15,16,17,29,30,],[18,18,18,32,32,32,]),'porta_logica_def':([14,15,16,17,29,30,],[19,19,19,19,19,19,]),'entrada_def':([14,15,16,17,29,30,],[20,20,20,20,20,20,]),'saida_def':([14,15,16,17,29,30,],[21,21,21,21,21,21,]),'conexao_def':([14,15,16,17,29,30,],[22,22,22,22,22,22,]),'instancia_def':([14,15,16,17,29,30,],[23,23,23,23,23,23,]),'origem':([36,],[43,]),'linha_entrada':([41,],[47,]),'porta_props':([46,],[53,]),'linha_porta':([46,53,],[55,68,]),'destino':([51,],[62,]),'tabela_entradas':([71,],[73,]),'linha_tabela':([71,73,],[74,83,]),'lista_bits':([71,73,84,],[75,75,86,]),'bit':([71,73,75,84,86,],[76,76,85,76,85,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> circuito","S'",1,None,None,None),
+  ('circuito -> modulos CIRCUITO IDENT LCURL inicio_circuito blocos RCURL','circuito',7,'p_circuito','parser_rules.py',49),
+  ('circuito -> CIRCUITO IDENT LCURL inicio_circuito blocos RCURL','circuito',6,'p_circuito','parser_rules.py',50),
+  ('inicio_circuito -> <empty>','inicio_circuito',0,'p_inicio_circuito','parser_rules.py',61),
+  ('modulos -> modulos modulo_def','modulos',2,'p_modulos','parser_rules.py',66),
+  ('modulos -> modulo_def','modulos',1,'p_modulos','parser_rules.py',67),
+  ('modulo_def -> MODULO IDENT LCURL inicio_modulo blocos RCURL','modulo_def',6,'p_modulo_def','parser_rules.py',72),
+  ('inicio_modulo -> <empty>','inicio_modulo',0,'p_inicio_modulo','parser_rules.py',84),
+  ('blocos -> blocos bloco','blocos',2,'p_blocos','parser_rules.py',89),
+  ('blocos -> bloco','blocos',1,'p_blocos','parser_rules.py',90),
+  ('bloco -> porta_logica_def','bloco',1,'p_bloco','parser_rules.py',95),
+  ('bloco -> entrada_def','bloco',1,'p_bloco','parser_rules.py',96),
+  ('bloco -> saida_def','bloco',1,'p_bloco','parser_rules.py',97),
+  ('bloco -> conexao_def','bloco',1,'p_bloco','parser_rules.py',98),
+  ('bloco -> instancia_def','bloco',1,'p_bloco','parser_rules.py',99),
+  ('porta_logica_def -> PORTA_LOGICA IDENT IDENT LCURL porta_props RCURL','porta_logica_def',6,'p_porta_logica_def','parser_rules.py',104),
+  ('porta_logica_def -> PORTA_LOGICA IDENT IDENT LCURL RCURL','porta_logica_def',5,'p_porta_logica_def','parser_rules.py',105),
+  ('porta_props -> porta_props linha_porta','porta_props',2,'p_porta_props','parser_rules.py',146),
+  ('porta_props -> linha_porta','porta_props',1,'p_porta_props','parser_rules.py',147),
+  ('linha_porta -> NUMERO_DE_ENTRADAS NUM','linha_porta',2,'p_linha_porta_num','parser_rules.py',156),
+  ('linha_porta -> NUMERO_DE_SAIDAS NUM','linha_porta',2,'p_linha_porta_num','parser_rules.py',157),
+  ('linha_porta -> TABELA_VERDADE LCURL tabela_entradas RCURL','linha_porta',4,'p_linha_porta_tabela','parser_rules.py',162),
+  ('tabela_entradas -> tabela_entradas linha_tabela','tabela_entradas',2,'p_tabela_entradas','parser_rules.py',167),
+  ('tabela_entradas -> linha_tabela','tabela_entradas',1,'p_tabela_entradas','parser_rules.py',168),
+  ('linha_tabela -> lista_bits ARROW lista_bits','linha_tabela',3,'p_linha_tabela','parser_rules.py',176),
+  ('lista_bits -> lista_bits bit','lista_bits',2,'p_lista_bits','parser_rules.py',181),
+  ('lista_bits -> bit','lista_bits',1,'p_lista_bits','parser_rules.py',182),
+  ('bit -> NUM','bit',1,'p_bit','parser_rules.py',190),
+  ('bit -> IDENT','bit',1,'p_bit','parser_rules.py',191),
+  ('entrada_def -> ENTRADA IDENT LCURL linha_entrada RCURL','entrada_def',5,'p_entrada_def','parser_rules.py',197),
+  ('entrada_def -> ENTRADA IDENT LCURL RCURL','entrada_def',4,'p_entrada_def','parser_rules.py',198),
+  ('linha_entrada -> VALOR_INICIAL NUM','linha_entrada',2,'p_linha_entrada','parser_rules.py',206),
+  ('linha_entrada -> VALOR_INICIAL IDENT','linha_entrada',2,'p_linha_entrada','parser_rules.py',207),
+  ('saida_def -> SAIDA IDENT LCURL RCURL','saida_def',4,'p_saida_def','parser_rules.py',217),
+  ('conexao_def -> CONEXAO CONECTAR origem ARROW destino','conexao_def',5,'p_conexao_def','parser_rules.py',224),
+  ('instancia_def -> INSTANCIA IDENT IDENT','instancia_def',3,'p_instancia_def','parser_rules.py',232),
+  ('origem -> IDENT DOT IDENT','origem',3,'p_origem','parser_rules.py',243),
+  ('origem -> IDENT DOT SAIDA','origem',3,'p_origem','parser_rules.py',244),
+  ('origem -> IDENT DOT ENTRADA','origem',3,'p_origem','parser_rules.py',245),
+  ('destino -> IDENT DOT IDENT','destino',3,'p_destino','parser_rules.py',250),
+  ('destino -> IDENT DOT SAIDA','destino',3,'p_destino','parser_rules.py',251),
+  ('destino -> IDENT DOT ENTRADA','destino',3,'p_destino','parser_rules.py',252),
+]
@@ -0,0 +1,169 @@
+# =======================
+# PORTAS PRIMITIVAS E TABELAS COM CURINGAS
+# =======================
+#
+# Portas AND, OR, XOR, NAND, NOR, XNOR, NOT e BUF podem ser declaradas sem
+# tabela_verdade, e as linhas de uma tabela podem usar 'x' (qualquer valor)
+# nas entradas. Até LARGURA_DENSA pinos, as duas formas são compiladas no
+# lookup denso de sempre (2^n bytes), e todo o resto do programa as trata
+# como qualquer outra tabela. Acima disso, a função fica em uma TabelaCubos:
+# a primitiva e o número de pinos, ou os cubos das linhas com saída 1, com
+# memória e tempo de avaliação proporcionais à descrição, e não a 2^n.
+#
+# TabelaCubos responde a tabela[indice] como um lookup denso (o simulador
+# escalar não precisa saber a diferença); os motores bit-paralelos, o
+# gerador de código, os BDDs e o otimizador a reconhecem e usam as
+# operações bit a bit da própria primitiva.
+
+# Primitivas aceitas sem tabela_verdade (o nome do tipo, sem distinção de caixa)
+PRIMITIVAS = ("AND", "OR", "XOR", "NAND", "NOR", "XNOR", "NOT", "BUF")
+PRIMITIVAS_UM_PINO = ("NOT", "BUF")
+_BASES = {"AND": ("AND", False), "OR": ("OR", False), "XOR": ("XOR", False),
+          "NAND": ("AND", True), "NOR": ("OR", True), "XNOR": ("XOR", True),
+          "BUF": ("AND", False), "NOT": ("AND", True)}
+
+# Até este número de pinos primitivas e tabelas com curingas viram lookups densos
+LARGURA_DENSA = 10
+
+
+class TabelaCubos:
+    """Função de uma porta larga, sem tabela densa
+
+    base é "AND", "OR" ou "XOR" (com negada, NAND, NOR e XNOR) ou None;
+    com base None a função é a soma dos cubos (mascara, valor): um vetor
+    de entradas k satisfaz o cubo quando k & mascara == valor, com entrada0
+    no bit mais significativo, como nos cubos de minimizacao.py. Imutável e
+    comparável, pode ser chave de dicionário como um lookup denso.
+    """
+    __slots__ = ("entradas", "base", "negada", "cubos")
+    __iter__ = None  # Indexável como um lookup, mas percorrer as 2^n posições não faz sentido
+
+    def __init__(self, entradas, base=None, negada=False, cubos=()):
+        self.entradas = entradas
+        self.base = base
+        self.negada = negada
+        self.cubos = tuple(cubos) if base is None else ()
+
+    def _chave(self):
+        return (self.entradas, self.base, self.negada, self.cubos)
+
+    def __eq__(self, outra):
+        if not isinstance(outra, TabelaCubos):
+            return NotImplemented
+        return self._chave() == outra._chave()
+
+    def __hash__(self):
+        return hash(self._chave())
+
+    def __getstate__(self):
+        return self._chave()
+
+    def __setstate__(self, estado):
+        self.entradas, self.base, self.negada, self.cubos = estado
+
+    def __repr__(self):
+        if self.base is None:
+            return f"TabelaCubos({self.entradas} pinos, {len(self.cubos)} cubos)"
+        return f"TabelaCubos({self.nome}, {self.entradas} pinos)"
+
+    @property
+    def nome(self):
+        """Nome da primitiva (AND, NOR, ...) ou None para tabelas de cubos"""
+        if self.base is None:
+            return None
+        return {"AND": "NAND", "OR": "NOR", "XOR": "XNOR"}[self.base] if self.negada else self.base
+
+    def __getitem__(self, indice):
+        """Saída para o vetor de entradas indice (entrada0 no bit mais significativo)"""
+        if self.base == "AND":
+            bit = int(indice == (1 << self.entradas) - 1)
+        elif self.base == "OR":
+            bit = int(indice != 0)
+        elif self.base == "XOR":
+            bit = bin(indice).count("1") & 1
+        else:
+            return int(any(indice & mascara == valor for mascara, valor in self.cubos))
+        return bit ^ self.negada
+
+    def avaliar(self, operandos, mascara):
+        """Saída sobre palavras de bits (bit r = vetor r), como bitparalelo._avaliar_plano"""
+        if self.base is None:
+            n = self.entradas
+            resultado = 0
+            for mascara_cubo, valor in self.cubos:
+                termo = mascara
+                for i in range(n):
+                    if mascara_cubo >> (n - 1 - i) & 1:
+                        termo &= operandos[i] if valor >> (n - 1 - i) & 1 else operandos[i] ^ mascara
+                        if not termo:
+                            break
+                resultado |= termo
+            return resultado
+        if self.base == "AND":
+            resultado = mascara
+            for x in operandos:
+                resultado &= x
+        elif self.base == "OR":
+            resultado = 0
+            for x in operandos:
+                resultado |= x
+        else:
+            resultado = 0
+            for x in operandos:
+                resultado ^= x
+        return resultado ^ mascara if self.negada else resultado
+
+    def constante(self):
+        """0 ou 1 se a função não depende das entradas, senão None"""
+        if self.base is None:
+            if not self.cubos:
+                return 0
+            if any(mascara == 0 for mascara, _ in self.cubos):
+                return 1
+        elif self.entradas == 0:
+            return int(self.base == "AND") ^ self.negada
+        return None
+
+    def cofator(self, i, valor):
+        """Fixa o pino i em valor; retorna a tabela (densa, se estreita) dos n - 1 pinos restantes"""
+        n = self.entradas
+        if self.base == "AND" and valor == 0 or self.base == "OR" and valor == 1:
+            resultado = TabelaCubos(n - 1, cubos=[(0, 0)] if (self.base == "OR") != self.negada else [])
+        elif self.base is not None:
+            resultado = TabelaCubos(n - 1, self.base, self.negada ^ (self.base == "XOR" and valor == 1))
+        else:
+            bit = 1 << (n - 1 - i)
+            cubos = []
+            for mascara, valor_cubo in self.cubos:
+                if mascara & bit and bool(valor_cubo & bit) != bool(valor):
+                    continue  # O cubo exige o outro valor no pino i
+                cubos.append((_remover_bit(mascara, n, i), _remover_bit(valor_cubo, n, i)))
+            resultado = TabelaCubos(n - 1, cubos=dict.fromkeys(cubos))
+        if n - 1 <= LARGURA_DENSA:
+            return densificar(resultado)
+        return resultado
+
+
+def _remover_bit(x, n, i):
+    """Retira de x (n bits, pino 0 no mais significativo) o bit do pino i"""
+    deslocamento = n - 1 - i
+    return ((x >> (deslocamento + 1)) << deslocamento) | (x & ((1 << deslocamento) - 1))
+
+
+def densificar(tabela):
+    """Lookup denso (bytes) equivalente à TabelaCubos"""
+    return bytes(tabela[k] for k in range(1 << tabela.entradas))
+
+
+def largura_tabela(lookup):
+    """Número de pinos de um lookup denso ou de uma TabelaCubos"""
+    if isinstance(lookup, TabelaCubos):
+        return lookup.entradas
+    return len(lookup).bit_length() - 1
+
+
+def tabela_primitiva(tipo, entradas):
+    """Função da primitiva tipo (já em maiúsculas) com o número de pinos dado"""
+    base, negada = _BASES[tipo]
+    tabela = TabelaCubos(entradas, base, negada)
+    return densificar(tabela) if entradas <= LARGURA_DENSA else tabela
@@ -0,0 +1,390 @@
+# =======================
+# SERVIDOR LOCAL DE SIMULAÇÃO
+# =======================
+#
+# Processo de longa duração (asyncio) para clientes que fazem muitas
+# requisições pequenas, como plugins de editor e scripts de teste. O lexer e
+# o parser do PLY são montados uma vez só, na partida, e os circuitos
+# compilados ficam em um cache LRU indexado pelo sha256 do código fonte:
+# repetir a mesma fonte (ou só a sua chave) não passa de novo pela análise,
+# pela validação nem pela compilação. Um circuito que sai do cache leva
+# junto os avaliadores gerados para ele, e o cache em disco (onde ficam os
+# seus bytecodes) é podado a cada FALTAS_ENTRE_LIMPEZAS circuitos novos.
+#
+# Ouve em um socket Unix (ENDERECO é um caminho) ou em TCP (ENDERECO é
+# PORTA ou HOST:PORTA; sem host, só em 127.0.0.1). O protocolo é uma
+# requisição JSON por linha e uma resposta JSON por linha, na mesma ordem,
+# em uma conexão que pode ficar aberta. Um POST HTTP com o JSON no corpo
+# também é aceito (curl --data), respondido e encerrado.
+#
+# Requisições (o campo "id", se houver, volta na resposta):
+#   {"operacao": "compilar", "fonte": "..."}
+#   {"operacao": "simular", "fonte": "...", "vetores": ["01", "11"], "entradas": ["A", "B"]}
+#   {"operacao": "simular", "chave": "<sha256>", "valores": {"A": 1}}
+#   {"operacao": "tabela", "chave": "<sha256>"}
+#   {"operacao": "estatisticas"}, {"operacao": "ping"}, {"operacao": "encerrar"}
+#
+# Nos vetores, X (ou x) é um valor desconhecido, e em "valores" o mesmo vale
+# para null; as saídas que dependem dele voltam como "X" ou null (ternario.py).
+#
+# As requisições são atendidas uma de cada vez, no próprio laço de eventos:
+# são curtas e limitadas pela CPU, e assim o cache e os circuitos não
+# precisam de travas.
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import stat
+import time
+from collections import OrderedDict
+from .cache import limitar_cache
+from .parser_rules import analisar
+from .simulator import obter_compilado, avaliar_compilado
+
+CAPACIDADE_PADRAO = 128          # Circuitos mantidos no cache LRU
+LIMITE_REQUISICAO = 64 << 20     # Bytes de uma requisição (uma linha ou um corpo HTTP)
+LIMITE_ENTRADAS_TABELA = 16      # A tabela verdade vai inteira na resposta
+FALTAS_ENTRE_LIMPEZAS = 256      # Circuitos novos entre duas podas do cache em disco
+
+
+class CacheCircuitos:
+    """Cache LRU de circuitos analisados e compilados, indexado pelo sha256 da fonte"""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        self.capacidade = capacidade
+        self.acertos = 0
+        self.faltas = 0
+        self._circuitos = OrderedDict()  # chave -> CircuitoState (com o compilado)
+
+    def __len__(self):
+        return len(self._circuitos)
+
+    def obter(self, fonte):
+        """Retorna (chave, circ, veio_do_cache), analisando e compilando a fonte se preciso"""
+        chave = hashlib.sha256(fonte.encode("utf-8")).hexdigest()
+        circ = self.buscar(chave)
+        if circ is not None:
+            return chave, circ, True
+        self.faltas += 1
+        circ = analisar(fonte, verbose=False)
+        if circ.nome is not None:
+            obter_compilado(circ)
+        self._circuitos[chave] = circ
+        if len(self._circuitos) > self.capacidade:
+            _, antigo = self._circuitos.popitem(last=False)
+            if antigo.compilado is not None:
+                from .codegen import descartar_avaliador
+                descartar_avaliador(antigo.compilado)
+        if self.faltas % FALTAS_ENTRE_LIMPEZAS == 0:
+            limitar_cache()  # Os avaliadores gerados gravam bytecode no cache em disco
+        return chave, circ, False
+
+    def buscar(self, chave):
+        """Circuito já compilado com essa chave, ou None"""
+        circ = self._circuitos.get(chave)
+        if circ is not None:
+            self._circuitos.move_to_end(chave)
+            self.acertos += 1
+        return circ
+
+
+class ServidorCircuitos:
+    """Atende as requisições JSON; processar() pode ser usado sem a parte de rede"""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        self.cache = CacheCircuitos(capacidade)
+        self.inicio = time.time()
+        self.requisicoes = {}     # operação -> número de requisições atendidas
+        self.tempo_total = 0.0    # segundos gastos em processar()
+        self.encerrado = None     # asyncio.Event, criado ao servir
+        self._operacoes = {
+            "compilar": self._compilar,
+            "simular": self._simular,
+            "tabela": self._tabela,
+            "estatisticas": self._estatisticas,
+            "ping": lambda requisicao: {},
+            "encerrar": self._encerrar,
+        }
+
+    # --- Operações ---
+
+    def _circuito(self, requisicao):
+        """Circuito da requisição (pela fonte ou pela chave): (chave, circ, veio_do_cache)"""
+        fonte = requisicao.get("fonte")
+        if isinstance(fonte, str):
+            return self.cache.obter(fonte)
+        chave = requisicao.get("chave")
+        if not isinstance(chave, str):
+            raise ValueError("a requisição precisa de \"fonte\" ou \"chave\"")
+        circ = self.cache.buscar(chave)
+        if circ is None:
+            raise ValueError(f"chave '{chave}' não está no cache; envie a fonte")
+        return chave, circ, True
+
+    def _compilado_valido(self, requisicao):
+        """Retorna (resposta parcial, circ, compilado); compilado é None se o circuito tem erros"""
+        chave, circ, do_cache = self._circuito(requisicao)
+        resposta = {"chave": chave, "cache": do_cache, "nome": circ.nome,
+                    "erros": list(circ.erros_analise), "avisos": list(circ.avisos_analise)}
+        if circ.nome is None:
+            if not resposta["erros"]:
+                resposta["erros"].append("Circuito não foi definido corretamente")
+            return resposta, circ, None
+        compilado = obter_compilado(circ)
+        resposta["erros"].extend(compilado.erros)
+        if compilado.nao_ordenadas:
+            nomes = [compilado.nomes_portas[g] for g in compilado.nao_ordenadas]
+            resposta["avisos"].append(f"Portas não processadas: {nomes}")
+        return resposta, circ, (None if resposta["erros"] else compilado)
+
+    def _compilar(self, requisicao):
+        resposta, circ, _ = self._compilado_valido(requisicao)
+        if circ.nome is not None:
+            compilado = obter_compilado(circ)
+            resposta.update(entradas=compilado.nomes_entradas, saidas=compilado.nomes_saidas,
+                            portas=len(compilado.nomes_portas))
+        resposta["ok"] = not resposta["erros"]
+        return resposta
+
+    def _simular(self, requisicao):
+        resposta, circ, compilado = self._compilado_valido(requisicao)
+        if compilado is None:
+            resposta["ok"] = False
+            return resposta
+
+        vetores = requisicao.get("vetores")
+        if vetores is None:
+            # Um vetor só: os valores iniciais, com os valores dados por cima
+            valores = requisicao.get("valores") or {}
+            if not isinstance(valores, dict):
+                raise ValueError("\"valores\" deve ser um objeto {entrada: 0, 1 ou null}")
+            desconhecidas = sorted(set(valores) - set(compilado.nomes_entradas))
+            if desconhecidas:
+                raise ValueError(f"entradas inexistentes: {desconhecidas}")
+            if any(valor not in (0, 1, None) for valor in valores.values()):
+                raise ValueError("os valores das entradas devem ser 0, 1 ou null (X)")
+            nets = avaliar_compilado(compilado, [valores.get(nome, circ.entradas[nome].valor)
+                                                 for nome in compilado.nomes_entradas])
+            resposta["saidas"] = {nome: nets[net] if net >= 0 else None
+                                  for nome, net in zip(compilado.nomes_saidas, compilado.drivers_saidas)}
+        else:
+            from .estimulos import simular_estimulos
+            nomes = requisicao.get("entradas") or compilado.nomes_entradas
+            if not isinstance(vetores, list) or not all(
+                    isinstance(v, str) and len(v) == len(nomes) and not v.strip("01xX") for v in vetores):
+                raise ValueError(f"\"vetores\" deve ser uma lista de strings de {len(nomes)} bits '0'/'1'/'X'")
+            vetores = [v.upper() for v in vetores]
+            if requisicao.get("otimizar", True):
+                from .otimizador import obter_otimizado
+                compilado = obter_otimizado(compilado)[0]
+            resposta["nomes_saidas"] = compilado.nomes_saidas
+            resposta["saidas"] = list(simular_estimulos(compilado, list(nomes), vetores))
+        resposta["ok"] = True
+        return resposta
+
+    def _tabela(self, requisicao):
+        from .bitparalelo import vetores_tabela_verdade
+        resposta, _, compilado = self._compilado_valido(requisicao)
+        if compilado is None:
+            resposta["ok"] = False
+            return resposta
+        if compilado.num_entradas > LIMITE_ENTRADAS_TABELA:
+            raise ValueError(f"o circuito tem {compilado.num_entradas} entradas; a tabela verdade "
+                             f"pelo servidor é limitada a {LIMITE_ENTRADAS_TABELA}")
+        resposta.update(ok=True, entradas=compilado.nomes_entradas, saidas=compilado.nomes_saidas,
+                        linhas=list(vetores_tabela_verdade(compilado)))
+        return resposta
+
+    def _estatisticas(self, requisicao):
+        return {"ok": True, "ativo_s": round(time.time() - self.inicio, 3),
+                "requisicoes": dict(self.requisicoes), "tempo_total_s": round(self.tempo_total, 6),
+                "cache": {"circuitos": len(self.cache), "capacidade": self.cache.capacidade,
+                          "acertos": self.cache.acertos, "faltas": self.cache.faltas}}
+
+    def _encerrar(self, requisicao):
+        if self.encerrado is not None:
+            self.encerrado.set()
+        return {}
+
+    # --- Protocolo ---
+
+    def processar(self, requisicao):
+        """Atende uma requisição (dict) e retorna a resposta (dict serializável em JSON)"""
+        inicio = time.perf_counter()
+        if not isinstance(requisicao, dict):
+            return {"ok": False, "erro": "a requisição deve ser um objeto JSON"}
+        operacao = requisicao.get("operacao")
+        funcao = self._operacoes.get(operacao)
+        if funcao is None:
+            resposta = {"ok": False, "erro": f"operação desconhecida: {operacao!r} "
+                                             f"(use {', '.join(self._operacoes)})"}
+        else:
+            try:
+                resposta = funcao(requisicao)
+                resposta.setdefault("ok", True)
+            except ValueError as e:
+                resposta = {"ok": False, "erro": str(e)}
+            except Exception as e:  # Um circuito problemático não derruba o servidor
+                resposta = {"ok": False, "erro": f"erro interno: {type(e).__name__}: {e}"}
+            self.requisicoes[operacao] = self.requisicoes.get(operacao, 0) + 1
+        if "id" in requisicao:
+            resposta["id"] = requisicao["id"]
+        self.tempo_total += time.perf_counter() - inicio
+        return resposta
+
+    def processar_bytes(self, dados):
+        """Decodifica uma requisição JSON e retorna a resposta já codificada (sem o '\\n')"""
+        try:
+            requisicao = json.loads(dados)
+        except ValueError as e:
+            resposta = {"ok": False, "erro": f"JSON inválido: {e}"}
+        else:
+            resposta = self.processar(requisicao)
+        return json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+
+    async def _atender(self, leitor, escritor):
+        try:
+            linha = await leitor.readline()
+            if linha.startswith((b"POST ", b"GET ")):
+                await self._atender_http(linha, leitor, escritor)
+                return
+            while linha:
+                if linha.strip():
+                    escritor.write(self.processar_bytes(linha) + b"\n")
+                    await escritor.drain()
+                linha = await leitor.readline()
+        except ValueError:  # Linha maior do que LIMITE_REQUISICAO
+            escritor.write(json.dumps({"ok": False, "erro": "requisição grande demais"}).encode() + b"\n")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:  # Conexão ainda aberta quando o servidor é encerrado
+            pass
+        finally:
+            escritor.close()
+
+    async def _atender_http(self, linha, leitor, escritor):
+        metodo = linha.split(b" ", 1)[0]
+        tamanho = 0
+        invalido = False
+        while True:
+            cabecalho = await leitor.readline()
+            if cabecalho in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = cabecalho.partition(b":")
+            if nome.strip().lower() == b"content-length":
+                try:
+                    tamanho = int(valor.strip() or 0)
+                except ValueError:
+                    invalido = True
+                invalido = invalido or tamanho < 0
+        status = b"200 OK"
+        if metodo == b"GET":
+            corpo = self.processar_bytes(b'{"operacao": "estatisticas"}')
+        elif invalido:
+            status = b"400 Bad Request"
+            corpo = json.dumps({"ok": False, "erro": "Content-Length inválido"}, ensure_ascii=False).encode()
+        elif tamanho > LIMITE_REQUISICAO:
+            status = b"413 Payload Too Large"
+            corpo = json.dumps({"ok": False, "erro": "requisição grande demais"}).encode()
+        else:
+            corpo = self.processar_bytes(await leitor.readexactly(tamanho))
+        escritor.write(b"HTTP/1.1 %s\r\nContent-Type: application/json; charset=utf-8\r\n"
+                       b"Content-Length: %d\r\nConnection: close\r\n\r\n" % (status, len(corpo)) + corpo)
+        await escritor.drain()
+
+    async def servir(self, endereco, pronto=None):
+        """Ouve em endereco até receber a operação "encerrar" (ou ser cancelado)
+
+        pronto, se dado, é chamado com o endereço efetivo quando o servidor
+        já aceita conexões (útil com a porta 0).
+        """
+        self.encerrado = asyncio.Event()
+        host, porta = _endereco_tcp(endereco)
+        if porta is None:
+            _remover_socket_antigo(endereco)
+            servidor = await asyncio.start_unix_server(self._atender, endereco, limit=LIMITE_REQUISICAO)
+            efetivo = endereco
+        else:
+            servidor = await asyncio.start_server(self._atender, host, porta, limit=LIMITE_REQUISICAO)
+            efetivo = "%s:%d" % servidor.sockets[0].getsockname()[:2]
+        try:
+            async with servidor:
+                if pronto is not None:
+                    pronto(efetivo)
+                await self.encerrado.wait()
+        finally:
+            if porta is None and os.path.exists(endereco):
+                os.unlink(endereco)
+
+
+def _endereco_tcp(endereco):
+    """(host, porta) para "PORTA" ou "HOST:PORTA"; (None, None) para um caminho de socket Unix"""
+    host, separador, porta = str(endereco).rpartition(":")
+    if porta.isdigit() and "/" not in endereco:
+        return (host if separador else "127.0.0.1"), int(porta)
+    return None, None
+
+
+def _remover_socket_antigo(caminho):
+    """Apaga o socket deixado por um servidor anterior (mas nunca um arquivo comum)"""
+    try:
+        if stat.S_ISSOCK(os.stat(caminho).st_mode):
+            os.unlink(caminho)
+    except FileNotFoundError:
+        pass
+
+
+def executar_servidor(endereco, capacidade=CAPACIDADE_PADRAO):
+    """Inicia o servidor e bloqueia até ele ser encerrado; retorna o código de saída"""
+    servidor = ServidorCircuitos(capacidade)
+
+    def pronto(efetivo):
+        print(f"Servidor de circuitos ouvindo em {efetivo} (Ctrl+C para encerrar)", flush=True)
+
+    try:
+        asyncio.run(servidor.servir(endereco, pronto))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Erro: não foi possível ouvir em '{endereco}': {e}")
+        return 1
+    print(f"Servidor encerrado: {sum(servidor.requisicoes.values())} requisições atendidas")
+    return 0
+
+
+class ClienteServidor:
+    """Cliente síncrono mínimo: uma conexão aberta, uma requisição por vez
+
+    Uso: with ClienteServidor("/tmp/circuitos.sock") as cliente: cliente.requisitar({...})
+    """
+
+    def __init__(self, endereco):
+        host, porta = _endereco_tcp(endereco)
+        if porta is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(endereco)
+        else:
+            self._socket = socket.create_connection((host, porta))
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._arquivo = self._socket.makefile("rwb")
+
+    def requisitar(self, requisicao):
+        """Envia uma requisição (dict) e retorna a resposta (dict)"""
+        self._arquivo.write(json.dumps(requisicao).encode("utf-8") + b"\n")
+        self._arquivo.flush()
+        linha = self._arquivo.readline()
+        if not linha:
+            raise ConnectionError("o servidor fechou a conexão")
+        return json.loads(linha)
+
+    def fechar(self):
+        self._arquivo.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
@@ -2,125 +2,228 @@
 # SIMULADOR DE CIRCUITOS
 # =======================
 
+import heapq
 from .models import circuito
-
-
-def validar_circuito():
-    """Valida a estrutura do circuito"""
-    erros = []
-
-    # Verificar se todas as conexões são válidas
-    for conexao in circuito.conexoes:
-        origem_componente, origem_pino = conexao.origem.split('.')
-        destino_componente, destino_pino = conexao.destino.split('.')
-
-        # Verificar origem
-        if origem_componente not in circuito.entradas and origem_componente not in circuito.portas:
-            erros.append(f"Componente de origem '{origem_componente}' não existe")
-
-        # Verificar destino
-        if destino_componente not in circuito.portas and destino_componente not in circuito.saidas:
-            erros.append(f"Componente de destino '{destino_componente}' não existe")
-
-    # Verificar se todas as entradas das portas estão conectadas
-    for nome, porta in circuito.portas.items():
-        entradas_conectadas = 0
-        for conexao in circuito.conexoes:
-            if conexao.destino.startswith(f"{nome}.entrada"):
-                entradas_conectadas += 1
-
-        if entradas_conectadas < porta.entradas:
-            erros.append(f"Porta '{nome}' tem {porta.entradas} entradas mas apenas {entradas_conectadas} conectadas")
-
-    return erros
+from .compiler import compilar_circuito
+from .estatisticas import estatisticas, cronometrado
+from .validacao import validar_circuito
 
 
 def avaliar_porta(porta):
-    """Avalia uma porta lógica usando sua tabela verdade"""
+    """Avalia uma porta lógica consultando sua tabela compilada"""
     if not porta.todas_entradas_conectadas():
         return None
 
-    for entrada, saida in porta.tabela:
-        if porta.valores_entradas == entrada:
-            return saida[0] if isinstance(saida, list) else saida
-
-    print(f"Aviso: Combinação de entrada {porta.valores_entradas} não encontrada na tabela de {porta.nome}")
-    return 0
-
-
-def propagar_sinal(componente_origem, pino_origem, valor):
-    """Propaga um sinal através das conexões"""
-    origem_completa = f"{componente_origem}.{pino_origem}"
-
-    for conexao in circuito.conexoes:
-        if conexao.origem == origem_completa:
-            destino_componente, destino_pino = conexao.destino.split('.')
-
-            if destino_componente in circuito.portas:
-                # Conectar a uma entrada de porta
-                if destino_pino.startswith('entrada'):
-                    indice = int(destino_pino.replace('entrada', ''))
-                    circuito.portas[destino_componente].valores_entradas[indice] = valor
-            elif destino_componente in circuito.saidas:
-                # Conectar a uma saída
-                circuito.saidas[destino_componente].valor = valor
-
-
-def simular_circuito(verbose=True):
+    if estatisticas.ativa:
+        estatisticas.contar("consultas_tabela")
+    indice = 0
+    for bit in porta.valores_entradas:
+        indice = (indice << 1) | bit
+    return porta.lookup[indice]
+
+
+def obter_compilado(circ=None):
+    """Retorna o netlist compilado, validando e compilando apenas uma vez"""
+    if circ is None:
+        circ = circuito
+    if circ.compilado is None:
+        with estatisticas.fase("validacao"):
+            erros = validar_circuito(circ)
+        with estatisticas.fase("compilacao"):
+            compilado = compilar_circuito(circ)
+        compilado.erros = erros
+        circ.compilado = compilado
+    return circ.compilado
+
+
+def propagar_sinal(componente_origem, pino_origem, valor, circ=None):
+    """Propaga um sinal através do índice de fan-out do circuito compilado"""
+    if circ is None:
+        circ = circuito
+    compilado = obter_compilado(circ)
+    net = compilado.indice_nets.get(componente_origem)
+    if pino_origem != 'saida' or net is None:
+        return
+
+    if estatisticas.ativa:
+        estatisticas.contar("propagacoes")
+        estatisticas.contar("conexoes_percorridas", len(compilado.fanout[net]) + len(compilado.fanout_saidas[net]))
+    for g, pino in compilado.fanout[net]:
+        circ.portas[compilado.nomes_portas[g]].valores_entradas[pino] = valor
+    for s in compilado.fanout_saidas[net]:
+        circ.saidas[compilado.nomes_saidas[s]].valor = valor
+
+
+def avaliar_compilado(compilado, valores_entradas, valores=None):
+    """Avalia cada porta exatamente uma vez, em ordem topológica
+
+    Recebe os valores das entradas na ordem de compilado.nomes_entradas e
+    retorna o valor de todas as nets (None para portas não avaliadas).
+    valores pode ser uma lista de compilado.num_nets posições de uma
+    avaliação anterior, que é reaproveitada em vez de alocar outra. Uma
+    entrada None (X) passa a avaliação para a simulação de três valores
+    de ternario.py, e None nas nets passa a significar também X.
+    """
+    if None in valores_entradas:
+        from .ternario import avaliar_ternario
+        if valores is None or len(valores) != compilado.num_nets:
+            return avaliar_ternario(compilado, valores_entradas)
+        valores[:] = avaliar_ternario(compilado, valores_entradas)
+        return valores
+
+    base = compilado.num_entradas
+    if valores is None or len(valores) != compilado.num_nets:
+        valores = list(valores_entradas) + [None] * len(compilado.nomes_portas)
+    else:
+        valores[:base] = valores_entradas
+        for g in compilado.nao_ordenadas:
+            valores[base + g] = None
+    pinos_portas = compilado.pinos_portas
+    tabelas = compilado.tabelas
+
+    for g in compilado.ordem:
+        indice = 0
+        for net in pinos_portas[g]:
+            indice = (indice << 1) | valores[net]
+        valores[base + g] = tabelas[g][indice]
+
+    if estatisticas.ativa:
+        estatisticas.contar("passadas_netlist")
+        estatisticas.contar("avaliacoes_portas", len(compilado.ordem))
+    return valores
+
+
+@cronometrado("simulacao")
+def simular_circuito(verbose=True, circ=None):
     """Simula o circuito completo"""
+    if circ is None:
+        circ = circuito
+    if estatisticas.ativa:
+        estatisticas.contar("simulacoes")
     if verbose:
         print("\n=== INICIANDO SIMULAÇÃO ===")
 
-    # Validar circuito antes da simulação
-    erros = validar_circuito()
-    if erros:
+    # Validar e compilar o circuito (apenas na primeira simulação)
+    compilado = obter_compilado(circ)
+    if compilado.erros:
         print("Erros encontrados no circuito:")
-        for erro in erros:
+        for erro in compilado.erros:
             print(f"  - {erro}")
         return False
 
-    # Reset do estado das portas
-    for porta in circuito.portas.values():
-        porta.processada = False
-        porta.valor_saida = None
-
     # Propagar valores das entradas
     if verbose:
         print("\nPropagando sinais das entradas:")
-    for nome, entrada in circuito.entradas.items():
-        if verbose:
+        for entrada in circ.entradas.values():
             print(f"  {entrada}")
-        propagar_sinal(nome, "saida", entrada.valor)
-
-    # Simular portas em ordem (múltiplas passadas se necessário)
-    max_iteracoes = len(circuito.portas) + 1
-    for iteracao in range(max_iteracoes):
-        progresso = False
-
-        for nome, porta in circuito.portas.items():
-            if not porta.processada and porta.todas_entradas_conectadas():
-                resultado = avaliar_porta(porta)
-                if resultado is not None:
-                    porta.valor_saida = resultado
-                    porta.processada = True
-                    progresso = True
-                    if verbose:
-                        print(f"  {porta}")
-                    propagar_sinal(nome, "saida", resultado)
-
-        if not progresso:
-            break
+
+    # Avaliar cada porta uma única vez, em ordem de nível
+    valores = avaliar_compilado(compilado, [circ.entradas[nome].valor for nome in compilado.nomes_entradas],
+                                circ.valores_nets)
+
+    # Atualizar o estado dos componentes, reaproveitando as listas de cada porta
+    base = compilado.num_entradas
+    for g, nome in enumerate(compilado.nomes_portas):
+        porta = circ.portas[nome]
+        valores_entradas = porta.valores_entradas
+        for pino, net in enumerate(compilado.pinos_portas[g]):
+            valores_entradas[pino] = valores[net] if net >= 0 else None
+        porta.valor_saida = valores[base + g]
+        porta.processada = porta.valor_saida is not None
+
+    if verbose:
+        for g in compilado.ordem:
+            print(f"  {circ.portas[compilado.nomes_portas[g]]}")
+
+    for s, nome in enumerate(compilado.nomes_saidas):
+        net = compilado.drivers_saidas[s]
+        circ.saidas[nome].valor = valores[net] if net >= 0 else None
+    circ.valores_nets = valores
 
     # Verificar se todas as portas foram processadas
-    portas_nao_processadas = [nome for nome, porta in circuito.portas.items() if not porta.processada]
+    portas_nao_processadas = [compilado.nomes_portas[g] for g in compilado.nao_ordenadas]
     if portas_nao_processadas:
         print(f"Aviso: Portas não processadas: {portas_nao_processadas}")
 
     # Mostrar resultados finais
     if verbose:
         print("\n=== RESULTADOS FINAIS ===")
-        for nome, saida in circuito.saidas.items():
+        for nome, saida in circ.saidas.items():
             print(f"  {saida}")
 
     return True
 
+
+def definir_entrada(nome, valor, circ=None):
+    """Altera uma entrada e re-avalia apenas o cone de fan-out afetado
+
+    As portas são re-avaliadas em ordem de nível e a propagação para assim
+    que a saída de uma porta não muda. valor é 0, 1 ou None (X). Retorna
+    o conjunto de nomes das saídas do circuito cujo valor mudou.
+    """
+    if circ is None:
+        circ = circuito
+    if nome not in circ.entradas:
+        raise ValueError(f"Entrada '{nome}' não existe")
+    if valor is not None and valor not in (0, 1):
+        raise ValueError(f"Valor inválido para a entrada '{nome}': {valor!r} (use 0, 1 ou None)")
+    if valor is not None:
+        valor = int(valor)  # True/False viram 1/0
+
+    if circ.valores_nets is None:
+        # Ainda não há estado simulado: simulação completa
+        anteriores = {s: saida.valor for s, saida in circ.saidas.items()}
+        circ.entradas[nome].valor = valor
+        simular_circuito(verbose=False, circ=circ)
+        return {s for s, saida in circ.saidas.items() if saida.valor != anteriores[s]}
+
+    compilado = obter_compilado(circ)
+    valores = circ.valores_nets
+    if valor is None or None in valores[:compilado.num_entradas]:
+        # Com X (None) nas entradas, o estado vem da simulação de três valores
+        anteriores = {s: saida.valor for s, saida in circ.saidas.items()}
+        circ.entradas[nome].valor = valor
+        simular_circuito(verbose=False, circ=circ)
+        return {s for s, saida in circ.saidas.items() if saida.valor != anteriores[s]}
+
+    circ.entradas[nome].valor = valor
+    alteradas = set()
+    agendadas = set()
+    fila = []
+    percorridas = [0]
+
+    def atualizar_net(net, novo):
+        valores[net] = novo
+        percorridas[0] += len(compilado.fanout[net]) + len(compilado.fanout_saidas[net])
+        for g, pino in compilado.fanout[net]:
+            circ.portas[compilado.nomes_portas[g]].valores_entradas[pino] = novo
+            if g not in agendadas:
+                agendadas.add(g)
+                heapq.heappush(fila, (compilado.niveis[g], g))
+        for s in compilado.fanout_saidas[net]:
+            nome_saida = compilado.nomes_saidas[s]
+            circ.saidas[nome_saida].valor = novo
+            alteradas.add(nome_saida)
+
+    net = compilado.indice_nets[nome]
+    if valores[net] != valor:
+        atualizar_net(net, valor)
+
+    base = compilado.num_entradas
+    while fila:
+        _, g = heapq.heappop(fila)
+        if valores[base + g] is None:
+            continue  # Porta nunca avaliada (ciclo ou pino sem driver)
+
+        indice = 0
+        for net in compilado.pinos_portas[g]:
+            indice = (indice << 1) | valores[net]
+        novo = compilado.tabelas[g][indice]
+        if novo != valores[base + g]:
+            circ.portas[compilado.nomes_portas[g]].valor_saida = novo
+            atualizar_net(base + g, novo)
+
+    if estatisticas.ativa:
+        estatisticas.contar("reavaliacoes_incrementais", len(agendadas))
+        estatisticas.contar("conexoes_percorridas", percorridas[0])
+    return alteradas
@@ -0,0 +1,143 @@
+# =======================
+# SIMULAÇÃO COM TRÊS VALORES (0/1/X)
+# =======================
+#
+# X é um valor desconhecido: uma entrada com valor_inicial x ou uma posição
+# 'X' de um vetor de estímulo. A simulação é bit-paralela como a de
+# bitparalelo.py, com duas palavras por net (codificação dual-rail):
+#
+#   uns    bit r ligado: o sinal vale 1 no vetor r
+#   zeros  bit r ligado: o sinal vale 0 no vetor r
+#
+# e os dois bits desligados representam X. Cada porta produz X só nos
+# vetores em que o resultado depende de fato das entradas desconhecidas:
+# no plano de Shannon da porta, ITE(x, f1, f0) vale 1 quando x é 1 e f1 é
+# 1, quando x é 0 e f0 é 1, ou quando f1 e f0 são 1 (o consenso, que
+# resolve x = X), o que torna a avaliação exata porta a porta. Primitivas
+# largas também são exatas; nas tabelas largas de cubos uma saída 1 coberta
+# só pela união de vários cubos aparece como X.
+#
+# Como em todo simulador de três valores, a exatidão é por porta: um X que
+# reconverge por dois caminhos (A & ~A) pode produzir X onde o circuito
+# inteiro teria valor definido. O resultado nunca é errado, só pessimista.
+# Combinações ausentes da tabela verdade continuam valendo 0 (com o aviso
+# da compilação), como na simulação de dois valores, para que os dois
+# motores concordem sempre que não há X nas entradas.
+
+from .bitparalelo import obter_planos
+from .estatisticas import estatisticas
+from .primitivas import TabelaCubos
+
+
+def _avaliar_cubos(tabela, uns, zeros, mascara):
+    """(uns, zeros) de uma porta larga (primitiva ou soma de cubos, ver primitivas.py)"""
+    if tabela.base == "AND":
+        um, zero = mascara, 0
+        for u, z in zip(uns, zeros):
+            um &= u
+            zero |= z
+    elif tabela.base == "OR":
+        um, zero = 0, mascara
+        for u, z in zip(uns, zeros):
+            um |= u
+            zero &= z
+    elif tabela.base == "XOR":
+        conhecidos, paridade = mascara, 0
+        for u, z in zip(uns, zeros):
+            conhecidos &= u | z
+            paridade ^= u
+        um, zero = conhecidos & paridade, conhecidos & ~paridade
+    else:
+        # 1 se algum cubo é certamente satisfeito; 0 se todos têm um literal certamente falso
+        n = tabela.entradas
+        um, zero = 0, mascara
+        for mascara_cubo, valor in tabela.cubos:
+            verdadeiro, falso = mascara, 0
+            for i in range(n):
+                if mascara_cubo >> (n - 1 - i) & 1:
+                    if valor >> (n - 1 - i) & 1:
+                        verdadeiro &= uns[i]
+                        falso |= zeros[i]
+                    else:
+                        verdadeiro &= zeros[i]
+                        falso |= uns[i]
+            um |= verdadeiro
+            zero &= falso
+    return (zero, um) if tabela.negada else (um, zero)
+
+
+def _avaliar_plano(plano, uns, zeros, mascara):
+    """(uns, zeros) de um plano de Shannon sobre palavras dual-rail"""
+    if plano == 0:
+        return 0, mascara
+    if plano == 1:
+        return mascara, 0
+    if plano.__class__ is TabelaCubos:
+        return _avaliar_cubos(plano, uns, zeros, mascara)
+    variavel, f0, f1 = plano
+    xu, xz = uns[variavel], zeros[variavel]
+    u1, z1 = _avaliar_plano(f1, uns, zeros, mascara)
+    u0, z0 = _avaliar_plano(f0, uns, zeros, mascara)
+    return (xu & u1) | (xz & u0) | (u1 & u0), (xu & z1) | (xz & z0) | (z1 & z0)
+
+
+def avaliar_palavras_ternario(compilado, uns_entradas, zeros_entradas, mascara):
+    """Avalia todas as portas uma vez sobre palavras dual-rail
+
+    uns_entradas e zeros_entradas seguem a ordem de compilado.nomes_entradas
+    (um vetor r com a entrada em X tem o bit r desligado nas duas). Retorna
+    as listas (uns, zeros) de todas as nets; portas não avaliadas valem X.
+    """
+    planos = obter_planos(compilado)
+    base = compilado.num_entradas
+    uns = list(uns_entradas) + [0] * len(compilado.nomes_portas)
+    zeros = list(zeros_entradas) + [0] * len(compilado.nomes_portas)
+    pinos_portas = compilado.pinos_portas
+
+    for g in compilado.ordem:
+        pinos = pinos_portas[g]
+        uns[base + g], zeros[base + g] = _avaliar_plano(planos[g], [uns[net] for net in pinos],
+                                                        [zeros[net] for net in pinos], mascara)
+
+    if estatisticas.ativa:
+        estatisticas.contar("vetores_ternarios", mascara.bit_length())
+        estatisticas.contar("avaliacoes_portas", len(compilado.ordem))
+    return uns, zeros
+
+
+def avaliar_ternario(compilado, valores_entradas):
+    """Valor (0, 1 ou None = X) de cada net para um vetor de entradas com X (None)"""
+    uns = [1 if valor == 1 else 0 for valor in valores_entradas]
+    zeros = [1 if valor == 0 else 0 for valor in valores_entradas]
+    uns, zeros = avaliar_palavras_ternario(compilado, uns, zeros, 1)
+    return [1 if u else 0 if z else None for u, z in zip(uns, zeros)]
+
+
+def simular_bloco_ternario(compilado, colunas, ordem, quantidade):
+    """Vetores de saída ('0'/'1'/'X') de um bloco cujas colunas de entrada podem ter X
+
+    colunas[c] é a string com o valor da coluna c em cada vetor do bloco e
+    ordem[i] a coluna que alimenta a entrada i, como em
+    estimulos.simular_bloco.
+    """
+    mascara = (1 << quantidade) - 1
+    uns = []
+    zeros = []
+    for c in ordem:
+        coluna = colunas[c][::-1]
+        uns.append(int(coluna.replace("X", "0"), 2))
+        zeros.append(int(coluna.replace("1", "X").replace("0", "1").replace("X", "0"), 2))
+    uns, zeros = avaliar_palavras_ternario(compilado, uns, zeros, mascara)
+
+    formato = f"0{quantidade}b"
+    colunas_saida = []
+    for net in compilado.drivers_saidas:
+        if net < 0:
+            colunas_saida.append("X" * quantidade)
+            continue
+        um = format(uns[net], formato)[::-1]
+        zero = format(zeros[net], formato)[::-1]
+        colunas_saida.append("".join("1" if u == "1" else "0" if z == "1" else "X" for u, z in zip(um, zero)))
+    if not colunas_saida:
+        return [""] * quantidade
+    return ["".join(vetor) for vetor in zip(*colunas_saida)]
@@ -0,0 +1,272 @@
+# =======================
+# VALIDAÇÃO ESTRUTURAL
+# =======================
+#
+# Uma única passada pelas conexões monta o índice de drivers: para cada pino
+# de entrada de porta e para cada saída do circuito, a conexão que o
+# alimenta. Com ele são encontrados, em tempo linear, componentes
+# inexistentes, pinos inválidos ou fora da faixa da porta, pinos com mais de
+# um driver e pinos sem driver. Os ciclos combinacionais são procurados só
+# entre as portas que o algoritmo de Kahn não consegue ordenar, com as
+# componentes fortemente conexas de Tarjan (versão iterativa, sem recursão).
+#
+# O grafo das portas usa índices inteiros (a posição da porta em
+# circ.portas) em listas, bem mais baratas do que dicionários de nomes. As
+# mensagens citam a linha do código fonte quando o componente ou a conexão
+# veio do parser.
+
+from .models import circuito
+from .primitivas import largura_tabela
+
+# Portas listadas por ciclo nas mensagens de erro
+LIMITE_PORTAS_CICLO = 10
+
+
+def _onde(linha):
+    return f" (linha {linha})" if linha is not None else ""
+
+
+def _indexar_conexoes(circ, erros):
+    """Passada única pelas conexões; retorna (drivers dos pinos, grau, sucessores)
+
+    As portas são identificadas pela sua posição em circ.portas: drivers dos
+    pinos tem, para cada porta, a conexão ligada a cada pino (None = sem
+    driver); grau é o número de pinos alimentados por outras portas e
+    sucessores lista as portas que cada porta alimenta.
+    """
+    portas, entradas, saidas = circ.portas, circ.entradas, circ.saidas
+    ids = {nome: g for g, nome in enumerate(portas)}
+    drivers_pinos = [[None] * porta.entradas for porta in portas.values()]
+    grau = [0] * len(ids)
+    sucessores = [[] for _ in ids]
+    drivers_saidas = {}
+    indices_pinos = {}  # "entradaK" -> K (None para nomes que não são pinos de porta)
+
+    for conexao in circ.conexoes:
+        origem, _, pino_origem = conexao.origem.partition('.')
+        destino, _, pino_destino = conexao.destino.partition('.')
+        g_origem = ids.get(origem)
+
+        origem_valida = pino_origem == 'saida' and (g_origem is not None or origem in entradas)
+        if not origem_valida:
+            if g_origem is None and origem not in entradas:
+                erros.append(f"Componente de origem '{origem}' não existe{_onde(conexao.linha)}")
+            else:
+                erros.append(f"Conexão {conexao}: '{pino_origem}' não é um pino de saída{_onde(conexao.linha)}")
+
+        g = ids.get(destino)
+        if g is not None:
+            pinos = drivers_pinos[g]
+            indice = indices_pinos.get(pino_destino, -1)
+            if indice == -1:
+                numero = pino_destino[len('entrada'):]
+                indice = int(numero) if pino_destino.startswith('entrada') and numero.isdigit() else None
+                indices_pinos[pino_destino] = indice
+            if indice is None:
+                erros.append(f"Conexão {conexao}: '{pino_destino}' não é um pino de entrada "
+                             f"da porta '{destino}'{_onde(conexao.linha)}")
+                continue
+            if indice >= len(pinos):
+                erros.append(f"Conexão {conexao}: a porta '{destino}' tem {len(pinos)} entradas "
+                             f"(entrada0 a entrada{len(pinos) - 1}){_onde(conexao.linha)}")
+                continue
+            anterior = pinos[indice]
+            if anterior is not None:
+                erros.append(f"Pino '{conexao.destino}' tem mais de um driver: '{anterior.origem}'"
+                             f"{_onde(anterior.linha)} e '{conexao.origem}'{_onde(conexao.linha)}")
+                continue
+            pinos[indice] = conexao
+            if origem_valida and g_origem is not None:
+                sucessores[g_origem].append(g)
+                grau[g] += 1
+        elif destino in saidas:
+            linha = conexao.linha
+            if pino_destino != 'entrada':
+                erros.append(f"Conexão {conexao}: '{pino_destino}' não é um pino da saída "
+                             f"'{destino}' (use {destino}.entrada){_onde(linha)}")
+                continue
+            anterior = drivers_saidas.get(destino)
+            if anterior is not None:
+                erros.append(f"Saída '{destino}' tem mais de um driver: '{anterior.origem}'"
+                             f"{_onde(anterior.linha)} e '{conexao.origem}'{_onde(linha)}")
+                continue
+            drivers_saidas[destino] = conexao
+        elif destino in entradas:
+            erros.append(f"Conexão {conexao}: a entrada '{destino}' não pode ser destino de uma conexão"
+                         f"{_onde(conexao.linha)}")
+        else:
+            erros.append(f"Componente de destino '{destino}' não existe{_onde(conexao.linha)}")
+
+    return drivers_pinos, grau, sucessores
+
+
+def _componentes_fortes(nos, pertence, sucessores):
+    """Componentes fortemente conexas do subgrafo induzido por nos (Tarjan iterativo)
+
+    pertence[g] indica se a porta g está em nos.
+    """
+    indice = [-1] * len(sucessores)
+    baixo = [0] * len(sucessores)
+    na_pilha = [False] * len(sucessores)
+    pilha = []
+    componentes = []
+    proximo = 0
+
+    for raiz in nos:
+        if indice[raiz] >= 0:
+            continue
+        indice[raiz] = baixo[raiz] = proximo
+        proximo += 1
+        pilha.append(raiz)
+        na_pilha[raiz] = True
+        trabalho = [(raiz, iter(sucessores[raiz]))]
+        while trabalho:
+            no, filhos = trabalho[-1]
+            for filho in filhos:
+                if not pertence[filho]:
+                    continue
+                if indice[filho] < 0:
+                    indice[filho] = baixo[filho] = proximo
+                    proximo += 1
+                    pilha.append(filho)
+                    na_pilha[filho] = True
+                    trabalho.append((filho, iter(sucessores[filho])))
+                    break
+                if na_pilha[filho] and indice[filho] < baixo[no]:
+                    baixo[no] = indice[filho]
+            else:
+                trabalho.pop()
+                if trabalho:
+                    pai = trabalho[-1][0]
+                    if baixo[no] < baixo[pai]:
+                        baixo[pai] = baixo[no]
+                if baixo[no] == indice[no]:
+                    componente = []
+                    while True:
+                        membro = pilha.pop()
+                        na_pilha[membro] = False
+                        componente.append(membro)
+                        if membro == no:
+                            break
+                    componentes.append(componente)
+    return componentes
+
+
+def _caminho_do_ciclo(componente, sucessores):
+    """Um ciclo mínimo (lista de portas) dentro da componente, ou None se ela não tem laço"""
+    inicio = componente[-1]  # A raiz da componente na busca de Tarjan
+    membros = set(componente)
+    anteriores = {inicio: None}
+    fronteira = [inicio]
+    while fronteira:
+        proxima = []
+        for no in fronteira:
+            for filho in sucessores[no]:
+                if filho == inicio:
+                    caminho = [no]
+                    while anteriores[caminho[-1]] is not None:
+                        caminho.append(anteriores[caminho[-1]])
+                    return caminho[::-1]
+                if filho in membros and filho not in anteriores:
+                    anteriores[filho] = no
+                    proxima.append(filho)
+        fronteira = proxima
+    return None
+
+
+def encontrar_ciclos(grau, sucessores):
+    """Ciclos combinacionais, cada um como a lista dos índices das portas na ordem do laço
+
+    grau[g] é o número de pinos da porta g alimentados por portas; o valor é
+    consumido pela ordenação.
+    """
+    # Kahn: o que não puder ser ordenado está em um ciclo ou depende de um
+    prontas = [g for g, pendentes in enumerate(grau) if pendentes == 0]
+    while prontas:
+        for destino in sucessores[prontas.pop()]:
+            grau[destino] -= 1
+            if grau[destino] == 0:
+                prontas.append(destino)
+    pertence = [pendentes > 0 for pendentes in grau]
+    restantes = [g for g, resta in enumerate(pertence) if resta]
+    if not restantes:
+        return []
+
+    # Kahn ao contrário: descarta as portas que só alimentam portas fora de ciclos
+    antecessores = {g: [] for g in restantes}
+    saida = dict.fromkeys(restantes, 0)
+    for g in restantes:
+        for destino in sucessores[g]:
+            if pertence[destino]:
+                antecessores[destino].append(g)
+                saida[g] += 1
+    sumidouros = [g for g, pendentes in saida.items() if pendentes == 0]
+    while sumidouros:
+        g = sumidouros.pop()
+        pertence[g] = False
+        for origem in antecessores[g]:
+            saida[origem] -= 1
+            if saida[origem] == 0:
+                sumidouros.append(origem)
+
+    ciclos = []
+    for componente in _componentes_fortes([g for g in restantes if pertence[g]], pertence, sucessores):
+        caminho = _caminho_do_ciclo(componente, sucessores)
+        if caminho is not None:
+            ciclos.append(caminho)
+    return ciclos
+
+
+def _descrever_ciclo(ciclo, nomes, drivers_pinos):
+    """Texto "g1 -> g2 -> g1" com as linhas das conexões que fecham o laço"""
+    exibidas = ciclo[:LIMITE_PORTAS_CICLO]
+    texto = " -> ".join(nomes[g] for g in exibidas)
+    texto += f" -> {nomes[ciclo[0]]}" if len(ciclo) <= LIMITE_PORTAS_CICLO else f" -> ... ({len(ciclo)} portas)"
+
+    linhas = []
+    for i, origem in enumerate(exibidas):
+        destino = ciclo[(i + 1) % len(ciclo)]
+        for conexao in drivers_pinos[destino]:
+            if conexao is not None and conexao.origem.partition('.')[0] == nomes[origem]:
+                if conexao.linha is not None:
+                    linhas.append(str(conexao.linha))
+                break
+    if linhas:
+        texto += f" (conexões nas linhas {', '.join(linhas)})"
+    return texto
+
+
+def validar_circuito(circ=None):
+    """Valida a estrutura do circuito e retorna a lista de erros encontrados
+
+    Verifica componentes e pinos das conexões, pinos fora da faixa da porta,
+    pinos e saídas com mais de um driver, entradas de porta sem driver,
+    tabelas com largura diferente de numero_de_entradas e ciclos
+    combinacionais. O custo é linear no número de portas e conexões.
+    """
+    if circ is None:
+        circ = circuito
+    erros = []
+    drivers_pinos, grau, sucessores = _indexar_conexoes(circ, erros)
+
+    for pinos, (nome, porta) in zip(drivers_pinos, circ.portas.items()):
+        if None in pinos:
+            livres = [f"entrada{i}" for i, conexao in enumerate(pinos) if conexao is None]
+            erros.append(f"Porta '{nome}' tem {porta.entradas} entradas mas apenas "
+                         f"{porta.entradas - len(livres)} conectadas (sem driver: {', '.join(livres)})"
+                         f"{_onde(porta.linha)}")
+        if porta.lookup is not None:
+            largura = largura_tabela(porta.lookup)
+            if largura != porta.entradas:
+                erros.append(f"Porta '{nome}': a tabela verdade tem {largura} entradas, mas "
+                             f"numero_de_entradas é {porta.entradas}{_onde(porta.linha)}")
+        elif any(len(entrada) != porta.entradas for entrada, _ in porta.tabela):
+            erros.append(f"Porta '{nome}': linhas da tabela verdade com largura diferente de "
+                         f"numero_de_entradas ({porta.entradas}){_onde(porta.linha)}")
+
+    ciclos = encontrar_ciclos(grau, sucessores)
+    if ciclos:
+        nomes = list(circ.portas)
+        for ciclo in ciclos:
+            erros.append(f"Ciclo combinacional: {_descrever_ciclo(ciclo, nomes, drivers_pinos)}")
+    return erros